@@ -1,8 +1,12 @@
 from __future__ import annotations
+import asyncio
 from dataclasses import dataclass
-from typing import Optional
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+from ..core.metrics import timed
 from ..core.models import Bid, Task
 from ..llm.base import LLM
+from ..llm.batch import BatchNoteGenerator
+from ..llm.guard import NoteGuard
 
 @dataclass
 class FreelancerProfile:
@@ -12,25 +16,30 @@ class FreelancerProfile:
     base_price: float
     risk_flags: list[str]
 
-async def propose_bid(task: Task, p: FreelancerProfile, llm: Optional[LLM] = None) -> Bid:
+# The demo pool; also seeds an empty freelancer registry.
+DEFAULT_FREELANCERS: List[FreelancerProfile] = [
+    FreelancerProfile("cheap_risky", 0.35, base_speed=2, base_price=80,  risk_flags=["low_test_coverage", "copy_paste_history"]),
+    FreelancerProfile("steady_mid",  0.70, base_speed=3, base_price=140, risk_flags=[]),
+    FreelancerProfile("fast_good",   0.78, base_speed=2, base_price=165, risk_flags=["tight_schedule"]),
+    FreelancerProfile("slow_safe",   0.82, base_speed=5, base_price=150, risk_flags=[]),
+    FreelancerProfile("premium",     0.92, base_speed=3, base_price=210, risk_flags=[]),
+]
+
+def template_note(task: Task, price: float, eta: int, confidence: float) -> str:
+    # Deterministic stand-in when the LLM is skipped or misses its deadline.
+    return f"Can deliver \"{task.title}\" in {eta} days for ${price:.0f} (confidence {confidence:.0%})."
+
+NOTE_SYSTEM = "Write a concise 1–2 sentence freelancer bid note. Output only the note."
+
+def bid_terms(task: Task, p: FreelancerProfile) -> Tuple[float, int, float]:
     # Deterministic bid math
     price = min(task.budget_usd, p.base_price + (len(task.acceptance_criteria) * 15))
     eta = max(1, p.base_speed + (len(task.acceptance_criteria) // 2))
     confidence = max(0.35, min(0.95, 0.6 + 0.4 * p.portfolio_score - 0.08 * len(p.risk_flags)))
+    return price, eta, confidence
 
-    notes = None
-    if llm:
-        notes = await llm.generate(
-    prompt=(
-        "Return ONLY the bid note text. No preamble, no quotes.\n"
-        f"Task: {task.title}\n"
-        f"Criteria: {task.acceptance_criteria}\n"
-        f"Price: {price}, ETA days: {eta}, confidence: {confidence:.2f}"
-    ),
-    system="Write a concise 1–2 sentence freelancer bid note. Output only the note."
-    )
-
-
+def quote_bid(task: Task, p: FreelancerProfile) -> Bid:
+    price, eta, confidence = bid_terms(task, p)
     return Bid(
         freelancer_id=p.freelancer_id,
         price_usd=float(price),
@@ -38,5 +47,75 @@ async def propose_bid(task: Task, p: FreelancerProfile, llm: Optional[LLM] = Non
         confidence=float(confidence),
         portfolio_score=float(p.portfolio_score),
         risk_flags=list(p.risk_flags),
-        notes=notes,
     )
+
+async def write_note(task: Task, p: FreelancerProfile, llm: LLM, guard: Optional[NoteGuard] = None) -> Optional[str]:
+    price, eta, confidence = bid_terms(task, p)
+    prompt = (
+        "Return ONLY the bid note text. No preamble, no quotes.\n"
+        f"Task: {task.title}\n"
+        f"Criteria: {task.acceptance_criteria}\n"
+        f"Price: {price}, ETA days: {eta}, confidence: {confidence:.2f}"
+    )
+    if guard is not None:
+        return await guard.note(
+            p.freelancer_id, llm, prompt, system=NOTE_SYSTEM,
+            fallback=lambda: template_note(task, price, eta, confidence),
+        )
+    return await llm.generate(prompt=prompt, system=NOTE_SYSTEM)
+
+@timed("bid.propose")
+async def propose_bid(
+    task: Task,
+    p: FreelancerProfile,
+    llm: Optional[LLM] = None,
+    guard: Optional[NoteGuard] = None,
+) -> Bid:
+    bid = quote_bid(task, p)
+    if llm:
+        bid.notes = await write_note(task, p, llm, guard)
+    return bid
+
+@timed("bids.collect")
+async def collect_bids(
+    task: Task,
+    freelancers: Sequence[FreelancerProfile],
+    llm: Optional[LLM] = None,
+    *,
+    concurrency: int = 8,
+    on_bid: Optional[Callable[[Bid], Awaitable[None]]] = None,
+    guard: Optional[NoteGuard] = None,
+    batcher: Optional[BatchNoteGenerator] = None,
+) -> List[Bid]:
+    # Fan out bid proposals with at most `concurrency` in flight; output keeps freelancer order.
+    # `on_bid` sees each bid as soon as it is ready (completion order).
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    if llm and batcher is not None:
+        # One batched note call for the whole auction; only bids it misses go per-bid.
+        bids = [quote_bid(task, p) for p in freelancers]
+        got = await batcher.notes(
+            task.title, task.acceptance_criteria,
+            [(b.freelancer_id, b.price_usd, b.eta_days, b.confidence) for b in bids],
+            guard=guard,
+        )
+
+        async def finish(p: FreelancerProfile, b: Bid) -> Bid:
+            b.notes = got.get(b.freelancer_id)
+            if b.notes is None:
+                async with sem:
+                    b.notes = await write_note(task, p, llm, guard)
+            if on_bid is not None:
+                await on_bid(b)
+            return b
+
+        return list(await asyncio.gather(*(finish(p, b) for p, b in zip(freelancers, bids))))
+
+    async def one(p: FreelancerProfile) -> Bid:
+        async with sem:
+            b = await propose_bid(task, p, llm=llm, guard=guard)
+        if on_bid is not None:
+            await on_bid(b)
+        return b
+
+    return list(await asyncio.gather(*(one(p) for p in freelancers)))
@@ -0,0 +1,442 @@
+from __future__ import annotations
+# Quality referee: runs a deliverable's unit tests and style checks in separate `python -I`
+# subprocesses (scrubbed env, temp dir, CPU/memory/file-size rlimits, wall-clock kill),
+# at most `workers` at a time, and scores acceptance-criteria coverage in-process.
+# Tests are found here by parsing the files, and each one runs in its own process whose
+# exit status is its outcome: nothing the deliverable's code prints or writes is read
+# as a result, so it can at most make its own tests pass, never add or hide others.
+# Results are cached by a content hash of (files, criteria) and the limits they ran under,
+# so re-evaluating an unchanged submission is free. This is process isolation with resource limits, not a security
+# boundary: untrusted code still runs as the server's user with network access. The API
+# only exposes it with REFEREE_ENABLED=1; before doing that anywhere public, run jobs
+# under real isolation (unprivileged uid, no network namespace, read-only filesystem,
+# or a container / nsjail).
+import ast
+import asyncio
+import hashlib
+import json
+import os
+import re
+import signal
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import resource  # POSIX only; elsewhere jobs get the wall-clock limit alone
+except ImportError:  # pragma: no cover
+    resource = None
+
+from ..core.metrics import timed
+from ..core.models import Bid, DecisionReport, Deliverable
+from ..core.similarity import SimilarityIndex, risk_level
+from ..llm.cache import _DiskTier, _consume_exception
+
+HARNESS_VERSION = 2  # part of the cache key; bump when scoring or the runner changes
+RUNNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "referee_runner.py")
+MARKER = b"@@referee "
+EXIT_OUTCOMES = {0: "pass", 1: "fail", 2: "error", 3: "skip"}  # referee_runner.EXIT_CODES
+TESTCASE_BASES = {"TestCase", "IsolatedAsyncioTestCase"}
+_ENV = {"PATH": os.environ.get("PATH", "/usr/bin:/bin"), "PYTHONHASHSEED": "0", "PYTHONDONTWRITEBYTECODE": "1"}
+_STOPWORDS = {"with", "that", "this", "from", "should", "must", "have", "into", "when", "each", "will", "used", "using"}
+
+class Limits(NamedTuple):
+    cpu_s: int = 10         # RLIMIT_CPU per job
+    wall_s: float = 30.0    # killed (whole process group) after this; shared by all tests
+    memory_mb: int = 512    # RLIMIT_AS
+    fsize_mb: int = 16      # largest file a job may write
+    output_kb: int = 256    # stdout kept per job (tail)
+    max_tests: int = 200    # test methods per deliverable, one process each
+
+def deliverable_key(files: Dict[str, str], criteria: Sequence[str]) -> str:
+    raw = json.dumps([HARNESS_VERSION, sorted(files.items()), list(criteria)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def verdict_key(deliverable_hash: str, limits: Limits) -> str:
+    # Cache key for a verdict: a CPU, memory or file-size limit can decide the outcome,
+    # so a cached verdict only stands for the limits it ran under.
+    return hashlib.sha256(json.dumps([deliverable_hash, list(limits)]).encode("utf-8")).hexdigest()
+
+def content_hash(files: Dict[str, str]) -> str:
+    return hashlib.sha256(json.dumps(sorted(files.items()), ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def _materialize(files: Dict[str, str], root: str) -> None:
+    for rel, text in files.items():
+        norm = os.path.normpath(rel)
+        if os.path.isabs(rel) or norm.startswith("..") or norm in (".", ""):
+            raise ValueError(f"Deliverable path must be relative and inside the submission: {rel!r}")
+        path = os.path.join(root, norm)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+def _limiter(limits: Limits):
+    if resource is None:
+        return None
+
+    def apply() -> None:
+        resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_s, limits.cpu_s + 1))
+        resource.setrlimit(resource.RLIMIT_AS, (limits.memory_mb << 20, limits.memory_mb << 20))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (limits.fsize_mb << 20, limits.fsize_mb << 20))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    return apply
+
+async def _read_tail(stream: asyncio.StreamReader, cap: int) -> bytes:
+    # Drains the pipe so the child never blocks on it, keeping only the last `cap` bytes.
+    buf = b""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return buf
+        buf = (buf + chunk)[-cap:]
+
+def _kill(proc) -> None:
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:  # pragma: no cover
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+async def _spawn(args: Sequence[str], root: str, limits: Limits, wall_s: float, *, capture: bool):
+    # (exit status, stdout tail); status None when killed on wall time.
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-I", RUNNER, *args,
+        cwd=root, env=_ENV,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE if capture else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+        start_new_session=True, preexec_fn=_limiter(limits),
+    )
+
+    async def finish() -> bytes:
+        tail = await _read_tail(proc.stdout, limits.output_kb * 1024) if capture else b""
+        await proc.wait()
+        return tail
+
+    try:
+        out = await asyncio.wait_for(finish(), wall_s)
+    except asyncio.TimeoutError:
+        _kill(proc)
+        await proc.wait()
+        return None, b""
+    except BaseException:
+        _kill(proc)
+        raise
+    return proc.returncode, out
+
+def _cpu_killed(returncode: int) -> bool:
+    return returncode in (-getattr(signal, "SIGXCPU", -1), -signal.SIGKILL)
+
+async def run_job(kind: str, root: str, limits: Limits) -> Dict[str, Any]:
+    # The style job (it parses the files and executes none of them); returns the runner's
+    # JSON plus "status": ok | error (runner reported a failure) | cpu_limit | timeout | crashed.
+    returncode, out = await _spawn([kind, root], root, limits, limits.wall_s, capture=True)
+    if returncode is None:
+        return {"status": "timeout", "ok": False, "error": f"killed after {limits.wall_s:g}s wall time"}
+    line = out.rsplit(MARKER, 1)[1].split(b"\n", 1)[0] if MARKER in out else None
+    if line is None:
+        return {
+            "status": "cpu_limit" if _cpu_killed(returncode) else "crashed",
+            "ok": False,
+            "error": f"exited with {returncode} before reporting",
+        }
+    res = json.loads(line)
+    return {"status": "ok" if res.get("ok") else "error", **res}
+
+def _base_name(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    return node.attr if isinstance(node, ast.Attribute) else None
+
+def discover_tests(files: Dict[str, str]) -> List[Tuple[str, Optional[str]]]:
+    # (relpath, "Class.method") for each test method of each TestCase subclass in a
+    # test*.py file, including methods inherited from classes elsewhere in the submission
+    # (resolved by name), in unittest's order; (relpath, None) for a test file that
+    # doesn't parse. Static, so the deliverable decides nothing about which tests exist.
+    trees: Dict[str, Optional[ast.Module]] = {}
+    for rel, src in files.items():
+        if rel.endswith(".py") and not any(part.startswith(".") for part in os.path.normpath(rel).split(os.sep)):
+            try:
+                trees[os.path.normpath(rel)] = ast.parse(src)
+            except (SyntaxError, ValueError):
+                trees[os.path.normpath(rel)] = None
+    classes: Dict[str, ast.ClassDef] = {}
+    for tree in trees.values():
+        for node in tree.body if tree is not None else ():
+            if isinstance(node, ast.ClassDef):
+                classes.setdefault(node.name, node)
+
+    def is_case(node: ast.ClassDef, seen: frozenset) -> bool:
+        for base in map(_base_name, node.bases):
+            if base in TESTCASE_BASES:
+                return True
+            if base in classes and base not in seen and is_case(classes[base], seen | {base}):
+                return True
+        return False
+
+    def methods(node: ast.ClassDef, seen: frozenset) -> set:
+        names = {n.name for n in node.body
+                 if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)) and n.name.startswith("test")}
+        for base in map(_base_name, node.bases):
+            if base in classes and base not in seen:
+                names |= methods(classes[base], seen | {base})
+        return names
+
+    out: List[Tuple[str, Optional[str]]] = []
+    for rel in sorted(trees):
+        if not os.path.basename(rel).startswith("test"):
+            continue
+        tree = trees[rel]
+        if tree is None:
+            out.append((rel, None))
+            continue
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and is_case(node, frozenset({node.name})):
+                out.extend((rel, f"{node.name}.{m}") for m in sorted(methods(node, frozenset({node.name}))))
+    return out
+
+async def run_test(root: str, relpath: str, name: str, limits: Limits, wall_s: float) -> str:
+    # pass | fail | error | skip, from the exit status alone; or timeout | cpu_limit | crashed.
+    returncode, _ = await _spawn(["test", root, relpath, name], root, limits, wall_s, capture=False)
+    if returncode is None:
+        return "timeout"
+    if returncode in EXIT_OUTCOMES:
+        return EXIT_OUTCOMES[returncode]
+    return "cpu_limit" if _cpu_killed(returncode) else "crashed"
+
+def tally(tests: Sequence[Tuple[str, Optional[str]]], outcomes: Sequence[str], seconds: float, limits: Limits) -> Dict[str, Any]:
+    failures = sum(o == "fail" for o in outcomes)
+    skipped = sum(o == "skip" for o in outcomes)
+    out: Dict[str, Any] = {
+        "status": "timeout" if "timeout" in outcomes else "ok",
+        "run": len(outcomes),
+        "failures": failures,
+        "errors": len(outcomes) - failures - skipped - sum(o == "pass" for o in outcomes),
+        "skipped": skipped,
+        "seconds": round(seconds, 3),
+        "failing": [f"{rel}::{name or '<module>'}: {o}" for (rel, name), o in zip(tests, outcomes)
+                    if o not in ("pass", "skip")][:20],
+    }
+    if out["status"] == "timeout":
+        out["error"] = f"tests still running after {limits.wall_s:g}s wall time"
+    return out
+
+def _words(text: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+def criteria_coverage(files: Dict[str, str], criteria: Sequence[str]) -> Dict[str, bool]:
+    # A criterion counts as addressed when at least half of its keywords (4+ letters)
+    # appear in the submission's identifiers, comments or test names.
+    have = _words(" ".join(list(files) + list(files.values())))
+    out: Dict[str, bool] = {}
+    for c in criteria:
+        keys = [w for w in _words(c) if len(w) >= 4 and w not in _STOPWORDS]
+        out[c] = not keys or sum(w in have for w in keys) * 2 >= len(keys)
+    return out
+
+def _summary(key: str, tests: Dict[str, Any], style: Dict[str, Any], coverage: Dict[str, bool]) -> Dict[str, Any]:
+    run = tests.get("run", 0)
+    bad = tests.get("failures", 0) + tests.get("errors", 0)
+    pass_rate = (run - bad) / run if run else 0.0
+    cov = sum(coverage.values()) / len(coverage) if coverage else 1.0
+    if style["status"] != "ok" or style.get("syntax_errors"):
+        style_score = 0.0
+    else:
+        per_100 = 100 * style["issues"] / max(style["lines"], 1)
+        style_score = max(0.0, 10.0 - per_100)
+    return {
+        "tests_passing": tests["status"] == "ok" and run > 0 and bad == 0,
+        "rubric_score": round(10 * (0.6 * cov + 0.4 * pass_rate), 1),
+        "style_score": round(style_score, 1),
+        "plagiarism_risk": "unchecked",
+        "tests": {k: tests[k] for k in ("status", "run", "failures", "errors", "skipped", "seconds", "failing", "error")
+                  if k in tests},
+        "style": {k: style[k] for k in ("status", "lines", "issues", "sample", "error") if k in style},
+        "criteria_coverage": coverage,
+        "deliverable_hash": key,
+        "note": "Unit tests (unittest, every test*.py, one process per test) and style checks ran in isolated, "
+                "resource-limited subprocesses.",
+    }
+
+class Referee:
+    def __init__(
+        self,
+        *,
+        workers: Optional[int] = None,
+        limits: Limits = Limits(),
+        max_entries: int = 1024,
+        path: Optional[str] = None,
+        index: Optional[SimilarityIndex] = None,
+    ):
+        self.index = index  # near-duplicate lookup against every earlier submission
+        self.workers = workers or os.cpu_count() or 2
+        self.limits = limits
+        self.max_entries = max_entries
+        self._sem: Optional[asyncio.Semaphore] = None  # created on first use, inside the loop
+        self._mem: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._disk = _DiskTier(path, table="referee_results") if path else None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.jobs = 0
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    async def evaluate(self, deliverable: Deliverable, criteria: Sequence[str]) -> Dict[str, Any]:
+        return await self._with_similarity(deliverable, await self._verdict(deliverable, criteria))
+
+    async def evaluate_many(self, deliverables: Sequence[Deliverable], criteria: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        # e.g. the top-k bidders' submissions; all of them share the worker pool. Similarity
+        # checks run afterwards in the given order, so which of two copies counts as the
+        # earlier one doesn't depend on job timing.
+        verdicts = await asyncio.gather(*(self._verdict(d, criteria) for d in deliverables))
+        return {d.freelancer_id: await self._with_similarity(d, v) for d, v in zip(deliverables, verdicts)}
+
+    async def _verdict(self, deliverable: Deliverable, criteria: Sequence[str]) -> Dict[str, Any]:
+        key = verdict_key(deliverable_key(deliverable.files, criteria), self.limits)
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            self.hits += 1
+            return self._mem[key]
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+        else:
+            pending = self._inflight[key] = asyncio.ensure_future(self._load(key, deliverable, criteria))
+            pending.add_done_callback(_consume_exception)
+        return await asyncio.shield(pending)
+
+    async def _with_similarity(self, deliverable: Deliverable, verdict: Dict[str, Any]) -> Dict[str, Any]:
+        if self.index is None:
+            return verdict
+        # Not part of the cached verdict: it depends on who submitted what, and when.
+        match = await asyncio.to_thread(
+            self.index.check_and_add, content_hash(deliverable.files), deliverable.freelancer_id, deliverable.files
+        )
+        sim = match.similarity if match else None
+        return {
+            **verdict,
+            "plagiarism_risk": risk_level(sim),
+            "similarity": {
+                "score": round(sim, 3) if match else 0.0,
+                "match_freelancer_id": match.freelancer_id if match else None,
+                "match_hash": match.doc_key.rsplit(":", 1)[1] if match else None,
+            },
+        }
+
+    async def _load(self, key: str, deliverable: Deliverable, criteria: Sequence[str]) -> Dict[str, Any]:
+        try:
+            raw = await asyncio.to_thread(self._disk.get, key) if self._disk else None
+            if raw is not None:
+                self.disk_hits += 1
+                value = json.loads(raw)
+            else:
+                self.misses += 1
+                value = await self._run(deliverable_key(deliverable.files, criteria), deliverable.files, criteria)
+                if not settled(value):  # a wall-clock kill can be load-dependent
+                    return value
+                if self._disk:
+                    await asyncio.to_thread(self._disk.put, key, json.dumps(value))
+            self._remember(key, value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    @timed("referee.evaluate")
+    async def _run(self, key: str, files: Dict[str, str], criteria: Sequence[str]) -> Dict[str, Any]:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.workers)
+        with tempfile.TemporaryDirectory(prefix="referee-") as root:
+            await asyncio.to_thread(_materialize, files, root)
+
+            async def job(kind: str) -> Dict[str, Any]:
+                async with self._sem:
+                    self.jobs += 1
+                    return await run_job(kind, root, self.limits)
+
+            tests, style = await asyncio.gather(self._tests(root, files), job("style"))
+        return _summary(key, tests, style, criteria_coverage(files, criteria))
+
+    async def _tests(self, root: str, files: Dict[str, str]) -> Dict[str, Any]:
+        found = discover_tests(files)
+        if len(found) > self.limits.max_tests:
+            return {"status": "error", "run": 0, "error": f"{len(found)} tests; at most {self.limits.max_tests} are run"}
+        t0 = time.monotonic()
+        deadline = t0 + self.limits.wall_s
+
+        async def one(rel: str, name: Optional[str]) -> str:
+            if name is None:
+                return "error"  # the test file doesn't parse
+            async with self._sem:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return "timeout"
+                self.jobs += 1
+                return await run_test(root, rel, name, self.limits, remaining)
+
+        outcomes = await asyncio.gather(*(one(rel, name) for rel, name in found))
+        return tally(found, outcomes, time.monotonic() - t0, self.limits)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "shared_inflight": self.shared,
+            "jobs": self.jobs,
+            "entries": len(self._mem),
+            "workers": self.workers,
+        }
+
+    def close(self) -> None:
+        if self._disk:
+            self._disk.close()
+            self._disk = None
+
+def top_deliverables(
+    scores: Dict[str, Any], deliverables: Sequence[Deliverable], k: int,
+) -> List[Deliverable]:
+    # The k best-scored bidders that actually submitted something, best first.
+    by_id = {d.freelancer_id: d for d in deliverables}
+    ranked = sorted((fid for fid in scores if fid in by_id), key=lambda fid: -scores[fid].total)
+    return [by_id[fid] for fid in ranked[:k]]
+
+def settled(summary: Dict[str, Any]) -> bool:
+    # False when a job was killed on wall time; such verdicts are neither cached nor final.
+    return summary["tests"]["status"] != "timeout" and summary["style"]["status"] != "timeout"
+
+def attach(report: DecisionReport, results: Dict[str, Dict[str, Any]]) -> None:
+    # The winner's verdict becomes referee_summary (the stub stays if it submitted nothing);
+    # every evaluated bidder is listed under "candidates" for comparison and disputes.
+    if report.winner_id in results:
+        report.referee_summary = dict(results[report.winner_id])
+    report.referee_summary["candidates"] = {
+        fid: {
+            **{k: r[k] for k in ("tests_passing", "rubric_score", "style_score", "plagiarism_risk", "deliverable_hash")},
+            "settled": settled(r),
+        }
+        for fid, r in results.items()
+    }
+
+COPY_FLAG = "copy_paste_history"
+
+def flag_copies(bids: Sequence[Bid], results: Dict[str, Dict[str, Any]]) -> List[str]:
+    # Bidders whose submission is a medium/high near-duplicate of someone else's get the
+    # copy_paste_history risk flag, which the risk term already penalizes. Returns who was newly flagged.
+    flagged = []
+    for b in bids:
+        r = results.get(b.freelancer_id)
+        if r is not None and r["plagiarism_risk"] in ("medium", "high") and COPY_FLAG not in b.risk_flags:
+            b.risk_flags.append(COPY_FLAG)
+            flagged.append(b.freelancer_id)
+    return flagged
@@ -0,0 +1,105 @@
+# Runs inside the referee sandbox. Stdlib only and never imports the app.
+#   python -I referee_runner.py style <workdir>
+#       Parses every .py file without executing any of it; the result is the last stdout
+#       line starting with MARKER.
+#   python -I referee_runner.py test <workdir> <relpath> <Class.method>
+#       Runs that one test. Its outcome is the exit status alone (EXIT_CODES); nothing it
+#       prints is read, since the deliverable's code shares this process and could forge
+#       any report it wrote.
+import ast
+import importlib.util
+import io
+import json
+import os
+import sys
+import unittest
+
+MARKER = "@@referee "
+MAX_LINE = 99
+EXIT_CODES = {"pass": 0, "fail": 1, "error": 2, "skip": 3}
+
+def _py_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                yield os.path.join(dirpath, name)
+
+def run_test(root, relpath, name):
+    # Imports one test module the way unittest discovery would and runs one test in it.
+    path = os.path.join(root, relpath)
+    sys.path.insert(0, root)
+    sys.path.insert(1, os.path.dirname(path))
+    spec = importlib.util.spec_from_file_location("_referee_test_" + os.path.basename(path)[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    cls_name, method = name.split(".", 1)
+    cls = getattr(module, cls_name)
+    if not (isinstance(cls, type) and issubclass(cls, unittest.TestCase)):
+        raise TypeError("%s is not a TestCase" % cls_name)
+    result = unittest.TextTestRunner(stream=io.StringIO(), verbosity=0).run(cls(method))
+    if result.errors or result.testsRun != 1:
+        return "error"
+    if result.failures or result.unexpectedSuccesses:
+        return "fail"
+    return "skip" if result.skipped else "pass"
+
+def run_style(root):
+    # pycodestyle-like basics plus a couple of AST checks; issues are (path, line, code).
+    issues = []
+    lines_total = 0
+    for path in _py_files(root):
+        rel = os.path.relpath(path, root)
+        with open(path, encoding="utf-8", errors="replace") as f:
+            src = f.read()
+        lines = src.splitlines()
+        lines_total += len(lines)
+        try:
+            tree = ast.parse(src, filename=rel)
+        except SyntaxError as e:
+            issues.append((rel, e.lineno or 0, "E999 syntax error"))
+            continue
+        for i, line in enumerate(lines, 1):
+            if len(line) > MAX_LINE:
+                issues.append((rel, i, "E501 line too long"))
+            if line != line.rstrip():
+                issues.append((rel, i, "W291 trailing whitespace"))
+            if line[: len(line) - len(line.lstrip())].count("\t"):
+                issues.append((rel, i, "W191 tab indentation"))
+        if src and not src.endswith("\n"):
+            issues.append((rel, len(lines), "W292 no newline at end of file"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ExceptHandler) and node.type is None:
+                issues.append((rel, node.lineno, "E722 bare except"))
+            elif isinstance(node, ast.ImportFrom) and any(a.name == "*" for a in node.names):
+                issues.append((rel, node.lineno, "F403 star import"))
+    return {
+        "lines": lines_total,
+        "issues": len(issues),
+        "syntax_errors": sum(1 for _, _, code in issues if code.startswith("E999")),
+        "sample": ["%s:%d %s" % it for it in issues[:20]],
+    }
+
+def main():
+    kind, root = sys.argv[1], os.path.abspath(sys.argv[2])
+    os.chdir(root)
+    if kind == "test":
+        try:
+            outcome = run_test(root, sys.argv[3], sys.argv[4])
+        except BaseException:  # import-time failure, SystemExit, missing test...
+            outcome = "error"
+        # os._exit: no atexit handlers, finalizers or threads of the deliverable's get a
+        # chance to change the status after the outcome is known.
+        os._exit(EXIT_CODES[outcome])
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        out = {"ok": True, **run_style(root)}
+    except Exception as e:
+        out = {"ok": False, "error": "%s: %s" % (type(e).__name__, e)}
+    real_stdout.write(MARKER + json.dumps(out) + "\n")
+    real_stdout.flush()
+
+if __name__ == "__main__":
+    main()
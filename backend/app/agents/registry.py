@@ -0,0 +1,246 @@
+from __future__ import annotations
+# Persistent freelancer pool with score-bound pruning.
+#   python -m app.agents.registry --path var/freelancers.sqlite --synthetic 100000
+import argparse
+import heapq
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from ..core.models import Task
+from ..core.scoring import BidArrays, score_bids, score_upper_bounds
+from .freelancer import DEFAULT_FREELANCERS, FreelancerProfile
+
+PRICE_BAND_USD = 25.0
+PORTFOLIO_BANDS = 20  # portfolio_score buckets of 0.05
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS freelancers (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    freelancer_id TEXT NOT NULL UNIQUE,
+    portfolio_score REAL NOT NULL,
+    base_speed INTEGER NOT NULL,
+    base_price REAL NOT NULL,
+    n_flags INTEGER NOT NULL,
+    price_band INTEGER NOT NULL,
+    portfolio_band INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_freelancers_band
+    ON freelancers (price_band, base_speed, n_flags, portfolio_band, base_price, portfolio_score);
+CREATE TABLE IF NOT EXISTS freelancer_flags (
+    freelancer_id TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    flag TEXT NOT NULL,
+    PRIMARY KEY (freelancer_id, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_freelancer_flags_flag ON freelancer_flags (flag, freelancer_id);
+"""
+
+class Shortlist(NamedTuple):
+    freelancers: List[FreelancerProfile]  # registry order, so score ties resolve as in the full pool
+    max_eta_days: int                     # max ETA over the whole eligible pool; score with this
+    scanned: int                          # profiles whose exact score was computed
+    pool_size: int                        # eligible profiles
+
+def _confidence(portfolio: np.ndarray, n_flags: np.ndarray) -> np.ndarray:
+    # bid_terms() confidence, elementwise.
+    return np.maximum(0.35, np.minimum(0.95, 0.6 + 0.4 * portfolio - 0.08 * n_flags))
+
+class FreelancerRegistry:
+    # SQLite-backed pool indexed on (price band, speed, flag count, portfolio band). shortlist()
+    # scores groups of that index by their best corner and only loads groups that could
+    # still reach the top-k, so most of a large pool is never read or bid on.
+    def __init__(self, path: str = ":memory:"):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._groups: Dict[tuple, list] = {}  # index-group summaries per exclude_flags; reset on any write
+        self._version = 0
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync_locked(self) -> None:
+        # PRAGMA data_version moves when another connection commits (the CLI, another
+        # worker); drop the group summaries then, as upsert() does for this connection.
+        dv = self._db.execute("PRAGMA data_version").fetchone()[0]
+        if dv != self._data_version:
+            self._data_version = dv
+            self._groups.clear()
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        # Moves on every write to the pool, from any process; lets result caches key on its contents.
+        with self._lock:
+            self._sync_locked()
+            return self._version
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM freelancers").fetchone()[0]
+
+    def upsert(self, profiles: Iterable[FreelancerProfile]) -> int:
+        profiles = list(profiles)
+        with self._lock, self._db:
+            self._sync_locked()
+            self._groups.clear()
+            self._version += 1
+            self._db.executemany(
+                "INSERT INTO freelancers (freelancer_id, portfolio_score, base_speed, base_price, n_flags, price_band, portfolio_band) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (freelancer_id) DO UPDATE SET "
+                "portfolio_score = excluded.portfolio_score, base_speed = excluded.base_speed, "
+                "base_price = excluded.base_price, n_flags = excluded.n_flags, price_band = excluded.price_band, "
+                "portfolio_band = excluded.portfolio_band",
+                [
+                    (p.freelancer_id, float(p.portfolio_score), int(p.base_speed), float(p.base_price),
+                     len(p.risk_flags), int(p.base_price // PRICE_BAND_USD), int(p.portfolio_score * PORTFOLIO_BANDS))
+                    for p in profiles
+                ],
+            )
+            self._db.executemany(
+                "DELETE FROM freelancer_flags WHERE freelancer_id = ?", [(p.freelancer_id,) for p in profiles]
+            )
+            self._db.executemany(
+                "INSERT INTO freelancer_flags (freelancer_id, pos, flag) VALUES (?, ?, ?)",
+                [(p.freelancer_id, i, f) for p in profiles for i, f in enumerate(p.risk_flags)],
+            )
+        return len(profiles)
+
+    def _flags(self, ids: Sequence[str]) -> Dict[str, List[str]]:
+        out: Dict[str, List[str]] = {i: [] for i in ids}
+        for lo in range(0, len(ids), 500):
+            chunk = ids[lo:lo + 500]
+            rows = self._db.execute(
+                f"SELECT freelancer_id, flag FROM freelancer_flags WHERE freelancer_id IN ({','.join('?' * len(chunk))}) "
+                "ORDER BY freelancer_id, pos",
+                chunk,
+            )
+            for fid, flag in rows:
+                out[fid].append(flag)
+        return out
+
+    def all(self) -> List[FreelancerProfile]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT freelancer_id, portfolio_score, base_speed, base_price FROM freelancers ORDER BY seq"
+            ).fetchall()
+            flags = self._flags([r[0] for r in rows])
+        return [FreelancerProfile(fid, ps, sp, pr, flags[fid]) for fid, ps, sp, pr in rows]
+
+    def shortlist(
+        self,
+        task: Task,
+        weights: Dict[str, float],
+        k: int,
+        *,
+        exclude_flags: Sequence[str] = (),
+    ) -> Shortlist:
+        # Keeps every eligible profile whose exact pre-negotiation score is >= the k-th best;
+        # anything dropped provably scores below k others in the full-pool auction.
+        k = max(1, k)
+        n_crit = len(task.acceptance_criteria)
+        where, args = "", []
+        if exclude_flags:
+            where = (
+                "WHERE NOT EXISTS (SELECT 1 FROM freelancer_flags ff WHERE ff.freelancer_id = f.freelancer_id "
+                f"AND ff.flag IN ({','.join('?' * len(exclude_flags))}))"
+            )
+            args = list(exclude_flags)
+
+        with self._lock:
+            # Task-independent, so one index scan serves every shortlist until the pool changes.
+            self._sync_locked()
+            groups = self._groups.get(tuple(args))
+            if groups is None:
+                groups = self._groups[tuple(args)] = self._db.execute(
+                    "SELECT price_band, base_speed, n_flags, portfolio_band, MIN(base_price), MAX(portfolio_score), COUNT(*) "
+                    f"FROM freelancers f {where} GROUP BY price_band, base_speed, n_flags, portfolio_band",
+                    args,
+                ).fetchall()
+            if not groups:
+                return Shortlist([], 1, 0, 0)
+
+            g = np.array(groups, dtype=np.float64)
+            speed, n_flags = g[:, 1].astype(np.int64), g[:, 2].astype(np.int64)
+            max_eta = max(1, int(speed.max()) + n_crit // 2)
+            corners = BidArrays(
+                price_usd=np.minimum(task.budget_usd, g[:, 4] + n_crit * 15),
+                eta_days=np.maximum(1, speed + n_crit // 2),
+                confidence=_confidence(g[:, 5], n_flags),
+                portfolio_score=g[:, 5],
+                n_flags=n_flags,
+            )
+            bounds = score_upper_bounds(corners, task.budget_usd, weights, max_eta)
+
+            best: List[float] = []  # min-heap of the k best exact totals so far
+            kept = []               # (seq, freelancer_id, portfolio, speed, price, total)
+            scanned = 0
+            group_where = f"{where} {'AND' if where else 'WHERE'} price_band = ? AND base_speed = ? AND n_flags = ? AND portfolio_band = ?"
+            for gi in np.argsort(-bounds, kind="stable"):
+                if len(best) >= k and bounds[gi] < best[0]:
+                    break
+                band, sp, nf, pb = groups[gi][:4]
+                rows = self._db.execute(
+                    "SELECT seq, freelancer_id, portfolio_score, base_speed, base_price "
+                    f"FROM freelancers f {group_where}",
+                    args + [band, sp, nf, pb],
+                ).fetchall()
+                scanned += len(rows)
+                port = np.array([r[2] for r in rows], dtype=np.float64)
+                flags = np.full(len(rows), nf, dtype=np.int64)
+                totals = score_bids(
+                    BidArrays(
+                        price_usd=np.minimum(task.budget_usd, np.array([r[4] for r in rows], dtype=np.float64) + n_crit * 15),
+                        eta_days=np.full(len(rows), max(1, sp + n_crit // 2), dtype=np.int64),
+                        confidence=_confidence(port, flags),
+                        portfolio_score=port,
+                        n_flags=flags,
+                    ),
+                    task.budget_usd, weights, max_eta_days=max_eta,
+                ).total
+                for r, t in zip(rows, totals.tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, t)
+                    elif t > best[0]:
+                        heapq.heapreplace(best, t)
+                    if len(best) < k or t >= best[0]:
+                        kept.append((*r, t))
+
+            kth = best[0] if len(best) >= k else -np.inf
+            kept = sorted((r for r in kept if r[5] >= kth), key=lambda r: r[0])
+            flags_by_id = self._flags([r[1] for r in kept])
+            pool_size = int(g[:, 6].sum())
+
+        return Shortlist(
+            [FreelancerProfile(r[1], r[2], r[3], r[4], flags_by_id[r[1]]) for r in kept],
+            max_eta, scanned, pool_size,
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+def open_registry(path: str, *, seed: Optional[Sequence[FreelancerProfile]] = None) -> FreelancerRegistry:
+    reg = FreelancerRegistry(path)
+    if len(reg) == 0:
+        reg.upsert(DEFAULT_FREELANCERS if seed is None else seed)
+    return reg
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Create or extend a freelancer registry.")
+    ap.add_argument("--path", required=True)
+    ap.add_argument("--synthetic", type=int, default=0, help="add N synthetic profiles around the demo archetypes")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    from ..sim.market import synthetic_pool  # the simulator already knows how to jitter archetypes
+
+    reg = open_registry(args.path)
+    if args.synthetic:
+        reg.upsert(synthetic_pool(args.seed, 0, args.synthetic))
+    print(f"{args.path}: {len(reg)} freelancers")
+    reg.close()
+
+if __name__ == "__main__":
+    main()
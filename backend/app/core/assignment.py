@@ -0,0 +1,71 @@
+from __future__ import annotations
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+class Candidates(NamedTuple):
+    # Per task: freelancer indices, best first (ties by index), and their totals.
+    idx: np.ndarray
+    total: np.ndarray
+
+def top_candidates(totals: np.ndarray, capacity: np.ndarray, n_tasks: int) -> List[Candidates]:
+    # Keeps, per task row, the shortest best-first prefix whose capacity adds up to
+    # n_tasks. Dropping the rest is safe: the other n_tasks - 1 tasks can fill at most
+    # n_tasks - 1 of those slots, so some freelancer in the prefix is always free and
+    # no worse than anything past it.
+    n_rows, n_free = totals.shape
+    k = min(n_free, n_tasks)
+    if k < n_free:
+        part = np.argpartition(-totals, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(n_free), (n_rows, n_free))
+    vals = np.take_along_axis(totals, part, axis=1)
+    order = np.lexsort((part, -vals), axis=-1)
+    idx = np.take_along_axis(part, order, axis=1)
+    vals = np.take_along_axis(vals, order, axis=1)
+
+    enough = np.cumsum(capacity[idx], axis=1) >= n_tasks
+    cut = np.where(enough.any(axis=1), enough.argmax(axis=1) + 1, k)
+    return [Candidates(idx[r, :c].copy(), vals[r, :c].copy()) for r, c in enumerate(cut)]
+
+def solve_assignment(cands: Sequence[Candidates], capacity: np.ndarray) -> np.ndarray:
+    # Max-total assignment of tasks to freelancers, each freelancer taking at most
+    # capacity[f] tasks; more tasks assigned always beats a higher total.
+    # Returns the freelancer index per task, or -1 when the pool ran out of capacity.
+    n_tasks = len(cands)
+    if n_tasks == 0:
+        return np.empty(0, dtype=np.int64)
+    task = np.repeat(np.arange(n_tasks), [len(c.idx) for c in cands])
+    free = np.concatenate([c.idx for c in cands])
+    total = np.concatenate([c.total for c in cands])
+
+    # Freelancer f becomes min(capacity, #tasks that list it) identical unit slots.
+    reps = np.minimum(capacity, np.bincount(free, minlength=len(capacity)))
+    slot_start = np.concatenate(([0], np.cumsum(reps)))
+    n_slots = int(slot_start[-1])
+    per_edge = reps[free]
+    edge_task = np.repeat(task, per_edge)
+    edge_total = np.repeat(total, per_edge)
+    first = np.repeat(np.cumsum(per_edge) - per_edge, per_edge)
+    edge_slot = np.repeat(slot_start[free], per_edge) + (np.arange(len(edge_task)) - first)
+
+    # Costs are shifted to >= 1 (the sparse solver treats explicit zeros as missing).
+    hi, lo = float(total.max()), float(total.min())
+    cost = (hi - edge_total) + 1.0
+    n_cols = n_slots
+    if int(capacity.sum()) < n_tasks:
+        # Not everyone can be served: give each task a private "unassigned" column
+        # priced above any set of real assignments so cardinality comes first.
+        dummy = n_tasks * (hi - lo + 1.0) + 1.0
+        edge_task = np.concatenate((edge_task, np.arange(n_tasks)))
+        edge_slot = np.concatenate((edge_slot, n_slots + np.arange(n_tasks)))
+        cost = np.concatenate((cost, np.full(n_tasks, dummy)))
+        n_cols += n_tasks
+
+    graph = csr_matrix((cost, (edge_task, edge_slot)), shape=(n_tasks, n_cols))
+    _, col = min_weight_full_bipartite_matching(graph)
+
+    owner = np.concatenate((np.repeat(np.arange(len(capacity)), reps), np.full(n_cols - n_slots, -1)))
+    return owner[col]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+# In-process stand-in for the DynamoDB low-level client (the subset DynamoLedgerStore and
+# ensure_table use), so the ledger's DynamoDB path runs offline: same request/response
+# shapes and error codes as boto3, typed attribute values, the 25-item BatchWriteItem
+# limit and paginated Query. Optional per-call latency and a throttled fraction of items
+# returned as UnprocessedItems model a real table under load.
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_BATCH_WRITE = 25
+
+class DynamoError(Exception):
+    # Looks like botocore's ClientError to code that reads e.response["Error"]["Code"].
+    def __init__(self, code: str, message: str):
+        super().__init__(f"{code}: {message}")
+        self.response = {"Error": {"Code": code, "Message": message}}
+
+def _key_value(av: Dict[str, Any]) -> Any:
+    (kind, value), = av.items()
+    return float(value) if kind == "N" else value
+
+class _Table:
+    def __init__(self, name: str, hash_key: str, range_key: Optional[str]):
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.items: Dict[Any, Dict[Any, Dict[str, Any]]] = {}  # hash value -> range value -> item
+
+    def key(self, item: Dict[str, Any]) -> Tuple[Any, Any]:
+        try:
+            h = _key_value(item[self.hash_key])
+            r = _key_value(item[self.range_key]) if self.range_key else None
+        except (KeyError, ValueError) as e:
+            raise DynamoError("ValidationException", f"Missing or invalid key attribute: {e}")
+        return h, r
+
+class LocalDynamoDB:
+    def __init__(
+        self,
+        *,
+        latency_s: float = 0.0,
+        unprocessed_rate: float = 0.0,
+        page_items: int = 1000,
+        seed: int = 0,
+    ):
+        self.latency_s = latency_s
+        self.unprocessed_rate = unprocessed_rate
+        self.page_items = page_items  # stands in for Query's 1 MB page limit
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tables: Dict[str, _Table] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _call(self, op: str) -> None:
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+        if self.latency_s:
+            time.sleep(self.latency_s)  # outside the lock: concurrent requests overlap
+
+    def _table(self, name: str) -> _Table:
+        table = self._tables.get(name)
+        if table is None:
+            raise DynamoError("ResourceNotFoundException", f"Requested resource not found: Table: {name} not found")
+        return table
+
+    def create_table(self, *, TableName: str, KeySchema: List[Dict[str, str]], **_: Any) -> Dict[str, Any]:
+        self._call("CreateTable")
+        keys = {k["KeyType"]: k["AttributeName"] for k in KeySchema}
+        with self._lock:
+            if TableName in self._tables:
+                raise DynamoError("ResourceInUseException", f"Table already exists: {TableName}")
+            self._tables[TableName] = _Table(TableName, keys["HASH"], keys.get("RANGE"))
+        return {"TableDescription": {"TableName": TableName, "TableStatus": "ACTIVE"}}
+
+    def describe_table(self, *, TableName: str) -> Dict[str, Any]:
+        self._call("DescribeTable")
+        with self._lock:
+            table = self._table(TableName)
+            count = sum(len(rows) for rows in table.items.values())
+        return {"Table": {"TableName": TableName, "TableStatus": "ACTIVE", "ItemCount": count}}
+
+    def put_item(self, *, TableName: str, Item: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        self._call("PutItem")
+        with self._lock:
+            table = self._table(TableName)
+            h, r = table.key(Item)
+            table.items.setdefault(h, {})[r] = Item
+        return {}
+
+    def batch_write_item(self, *, RequestItems: Dict[str, List[Dict[str, Any]]], **_: Any) -> Dict[str, Any]:
+        self._call("BatchWriteItem")
+        total = sum(len(reqs) for reqs in RequestItems.values())
+        if not 0 < total <= MAX_BATCH_WRITE:
+            raise DynamoError("ValidationException", f"Member must have length between 1 and {MAX_BATCH_WRITE}")
+        unprocessed: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for name, reqs in RequestItems.items():
+                table = self._table(name)
+                keys = [table.key(r["PutRequest"]["Item"] if "PutRequest" in r else r["DeleteRequest"]["Key"]) for r in reqs]
+                if len(set(keys)) != len(keys):
+                    raise DynamoError("ValidationException", "Provided list of item keys contains duplicates")
+                for req, (h, r) in zip(reqs, keys):
+                    if self.unprocessed_rate and self._rng.random() < self.unprocessed_rate:
+                        unprocessed.setdefault(name, []).append(req)
+                    elif "PutRequest" in req:
+                        table.items.setdefault(h, {})[r] = req["PutRequest"]["Item"]
+                    else:
+                        table.items.get(h, {}).pop(r, None)
+        return {"UnprocessedItems": unprocessed}
+
+    def query(
+        self,
+        *,
+        TableName: str,
+        KeyConditionExpression: str,
+        ExpressionAttributeValues: Dict[str, Any],
+        ExclusiveStartKey: Optional[Dict[str, Any]] = None,
+        Limit: Optional[int] = None,
+        ScanIndexForward: bool = True,
+        **_: Any,
+    ) -> Dict[str, Any]:
+        # Supports only "<hash key> = :placeholder".
+        self._call("Query")
+        with self._lock:
+            table = self._table(TableName)
+            attr, _, placeholder = (p.strip() for p in KeyConditionExpression.partition("="))
+            if attr != table.hash_key or placeholder not in ExpressionAttributeValues:
+                raise DynamoError("ValidationException", f"Unsupported KeyConditionExpression: {KeyConditionExpression}")
+            rows = table.items.get(_key_value(ExpressionAttributeValues[placeholder]), {})
+            order = sorted(rows, reverse=not ScanIndexForward)
+            if ExclusiveStartKey is not None:
+                start = table.key(ExclusiveStartKey)[1]
+                order = [r for r in order if (r > start if ScanIndexForward else r < start)]
+            size = min(Limit or self.page_items, self.page_items)
+            page = [rows[r] for r in order[:size]]
+        out: Dict[str, Any] = {"Items": page, "Count": len(page)}
+        if len(order) > size:
+            last = page[-1]
+            out["LastEvaluatedKey"] = {k: last[k] for k in (table.hash_key, table.range_key) if k}
+        return out
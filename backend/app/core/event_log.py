@@ -0,0 +1,258 @@
+from __future__ import annotations
+# Compact in-memory event list for a run's ledger. Each record keeps an interned run-id
+# index, an integer type id, integer microsecond timestamps and, for before/after events,
+# only the bid fields that changed against that freelancer's previous state. Iterating
+# or dump() expands records back to exactly what the list of Event models used to give.
+import threading
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, get_args
+
+from pydantic import BaseModel, Field
+from pydantic_core import core_schema
+
+EventType = Literal[
+    "TASK_POSTED",
+    "BID_SUBMITTED",
+    "COUNTEROFFER_SENT",
+    "COUNTEROFFER_RESPONSE",
+    "ROUND_COMPLETE",
+    "WINNER_SELECTED",
+    "NEGOTIATION_STOPPED",  # adaptive negotiation only; data.reason says why
+]
+
+class Event(BaseModel):
+    run_id: str
+    seq: int
+    type: EventType
+    ts: str  # ISO string
+    round: int = 0
+    summary: str
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+TYPES: Tuple[str, ...] = get_args(EventType)
+TYPE_IDS: Dict[str, int] = {t: i for i, t in enumerate(TYPES)}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def now_us() -> int:
+    return _us(datetime.now(timezone.utc))
+
+def _us(dt: datetime) -> int:
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+@lru_cache(maxsize=256)
+def _iso_second(sec: int) -> str:
+    return (_EPOCH + timedelta(seconds=sec)).isoformat()[:19]
+
+def iso(ts_us: int) -> str:
+    # The string datetime.now(timezone.utc).isoformat() gave for this instant. A run's
+    # events share a handful of seconds, so only the microseconds are formatted per event.
+    sec, frac = divmod(ts_us, 1_000_000)
+    return f"{_iso_second(sec)}.{frac:06d}+00:00" if frac else f"{_iso_second(sec)}+00:00"
+
+def _compact_ts(ts: str):
+    # Integer when the string round-trips exactly; otherwise keep the string as given.
+    try:
+        us = _us(datetime.fromisoformat(ts))
+    except (TypeError, ValueError):
+        return ts
+    return us if iso(us) == ts else ts
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or (type(a) is type(b) and a == b)
+
+def _diff(base: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Changed fields of `new` against `base` ({} if none); None when the key sets or
+    # their order differ, so a patch couldn't rebuild `new` exactly.
+    if new is base:
+        return {}
+    if len(new) != len(base) or list(new) != list(base):
+        return None
+    return {k: v for k, v in new.items() if not _same(base[k], v)}
+
+def _sets_state(data: Dict[str, Any]):
+    # (freelancer_id, full bid row) for events that establish a bid's state: a bare bid
+    # row (BID_SUBMITTED) or a before/after pair. (None, None) otherwise.
+    before, after = data.get("before"), data.get("after")
+    if len(data) == 2 and isinstance(before, dict) and isinstance(after, dict):
+        fid = after.get("freelancer_id")
+        return (fid, after) if isinstance(fid, str) else (None, None)
+    fid = data.get("freelancer_id")
+    return (fid, data) if isinstance(fid, str) else (None, None)
+
+def _patch(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    return {**base, **delta} if delta else base
+
+# Record: (run index, seq, type id, ts, round, summary, data, delta). `delta` is None
+# or (freelancer_id, before changes, after changes) with data=None.
+Record = Tuple[int, int, int, Any, int, str, Optional[Dict[str, Any]], Optional[tuple]]
+_SEQ = itemgetter(1)
+MAX_MARKS = 8  # replay checkpoints kept per log, so reading page after page stays linear
+# Guards every log's checkpoint table: pages of one run are read from threadpool endpoints
+# concurrently. Held only to pick or store a checkpoint, never while replaying; one
+# module-level lock keeps EventLog picklable and copyable.
+_MARKS_LOCK = threading.Lock()
+
+class EventLog:
+    # Read-only to consumers: expanded events and dump() rows share unchanged payload
+    # dicts with the log and with each other.
+    __slots__ = ("_run_ids", "_run_idx", "_records", "_state", "_marks")
+
+    def __init__(self):
+        self._run_ids: List[str] = []
+        self._run_idx: Dict[str, int] = {}
+        self._records: List[Record] = []
+        self._state: Dict[str, Dict[str, Any]] = {}  # freelancer_id -> latest full bid row
+        self._marks: Dict[int, Dict[str, Dict[str, Any]]] = {}  # record index -> replay state before it
+
+    def append(self, run_id: str, seq: int, type: str, ts, round: int, summary: str, data: Dict[str, Any]) -> None:
+        # `ts` is integer microseconds since the epoch, or an ISO string.
+        run = self._run_idx.get(run_id)
+        if run is None:
+            run = self._run_idx[run_id] = len(self._run_ids)
+            self._run_ids.append(run_id)
+        if type not in TYPE_IDS:
+            raise ValueError(f"Unknown event type {type!r}")
+        if isinstance(ts, str):
+            ts = _compact_ts(ts)
+        delta = None
+        fid, row = _sets_state(data)
+        if fid is not None:
+            base = self._state.get(fid)
+            if row is not data and base is not None and data["before"].get("freelancer_id") == fid:
+                b = _diff(base, data["before"])
+                a = _diff(data["before"], row) if b is not None else None
+                if a is not None:
+                    delta = (fid, b, a)
+            self._state[fid] = row
+        self._records.append((run, seq, TYPE_IDS[type], ts, round, summary, None if delta else data, delta))
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event]) -> "EventLog":
+        log = cls()
+        for e in events:
+            log.append(e.run_id, e.seq, e.type, e.ts, e.round, e.summary, e.data)
+        return log
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def run_id(self) -> Optional[str]:
+        return self._run_ids[0] if self._run_ids else None
+
+    def _rows(self, start: int = 0, state: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+        # Event.model_dump() dicts, rebuilt in order so each delta has its base state;
+        # from record `start`, `state` must be the replay state before it (updated in place).
+        if state is None:
+            state = {}
+        ids = self._run_ids
+        records = self._records if start == 0 else map(self._records.__getitem__, range(start, len(self._records)))
+        for run, seq, type_id, ts, rnd, summary, data, delta in records:
+            if delta is not None:
+                fid, b, a = delta
+                before = _patch(state[fid], b)
+                after = _patch(before, a)
+                state[fid] = after
+                data = {"before": before, "after": after}
+            else:
+                fid, row = _sets_state(data)
+                if fid is not None:
+                    state[fid] = row
+            yield {
+                "run_id": ids[run],
+                "seq": seq,
+                "type": TYPES[type_id],
+                "ts": iso(ts) if type(ts) is int else ts,
+                "round": rnd,
+                "summary": summary,
+                "data": data,
+            }
+
+    def dump(self) -> List[Dict[str, Any]]:
+        # What [e.model_dump() for e in events] returned, without building the models.
+        return list(self._rows())
+
+    def _state_at(self, i: int) -> Dict[str, Dict[str, Any]]:
+        with _MARKS_LOCK:
+            start = max((m for m in self._marks if m <= i), default=0)
+            state = dict(self._marks.get(start, {}))
+        for _ in islice(self._rows(start, state), i - start):
+            pass
+        return state
+
+    def _mark(self, i: int, state: Dict[str, Dict[str, Any]]) -> None:
+        with _MARKS_LOCK:
+            if i not in self._marks:
+                if len(self._marks) >= MAX_MARKS:
+                    del self._marks[next(iter(self._marks))]
+                self._marks[i] = state
+
+    def _span(self, lo: int, hi: int) -> List[Dict[str, Any]]:
+        # dump() rows lo..hi-1, replayed from the nearest checkpoint; the state where they
+        # end is kept, so indexing the next record (e.g. events[-1] as the log grows) is O(1).
+        state = self._state_at(lo)
+        rows = list(islice(self._rows(lo, state), hi - lo))
+        self._mark(hi, state)
+        return rows
+
+    def page(self, after_seq: int = 0, limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        # Up to `limit` dump() rows with seq > after_seq, and the cursor for the next page
+        # (None at the end). Seqs ascend within a run's log. Only the page is expanded; the
+        # replay state where it ends is kept, so the following page starts from there.
+        records = self._records
+        lo = bisect_right(records, after_seq, key=_SEQ)
+        hi = min(lo + max(limit, 0), len(records))
+        rows = self._span(lo, hi)
+        if hi == len(records):
+            return rows, None
+        return rows, records[hi - 1][1] if hi > lo else after_seq
+
+    def __iter__(self) -> Iterator[Event]:
+        for row in self._rows():
+            yield Event.model_construct(**row)
+
+    def __getitem__(self, i):
+        # Expands only the requested records (replayed from the nearest checkpoint).
+        n = len(self._records)
+        if isinstance(i, slice):
+            idx = range(*i.indices(n))
+            if not idx:
+                return []
+            lo, hi = min(idx), max(idx) + 1
+            rows = self._span(lo, hi)
+            return [Event.model_construct(**rows[j - lo]) for j in idx]
+        i = i.__index__()
+        if not -n <= i < n:
+            raise IndexError("EventLog index out of range")
+        i %= n
+        return Event.model_construct(**self._span(i, i + 1)[0])
+
+    def __bool__(self) -> bool:
+        return bool(self._records)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EventLog):
+            return self.dump() == other.dump()
+        if isinstance(other, list):
+            return self.dump() == [e.model_dump() if isinstance(e, Event) else e for e in other]
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EventLog({len(self)} events)"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        # Validates from a list of events (JSON or Python) and serializes to that list, so
+        # DecisionReport dumps and its OpenAPI schema are unchanged.
+        from_list = core_schema.no_info_after_validator_function(cls.from_events, handler.generate_schema(List[Event]))
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(cls), from_list]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls.dump, return_schema=core_schema.list_schema(core_schema.any_schema()),
+            ),
+        )
@@ -1,25 +1,29 @@
 from __future__ import annotations
-from datetime import datetime, timezone
 from uuid import uuid4
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, TYPE_CHECKING
+from .event_log import EventLog, iso, now_us
 from .models import Event
 
+if TYPE_CHECKING:
+    from .ledger_store import LedgerStore
+
 class Ledger:
-    def __init__(self, run_id: str | None = None):
+    def __init__(self, run_id: str | None = None, *, store: Optional["LedgerStore"] = None):
         self.run_id = run_id or str(uuid4())
         self._seq = 0
-        self.events: List[Event] = []
+        self.events = EventLog()  # compact; iterates as Event models
+        self.store = store
 
     def add(self, type: str, summary: str, *, round: int = 0, data: Dict[str, Any] | None = None):
+        # Returns the full Event for callers that stream or persist it; the ledger itself
+        # only keeps the compact record.
         self._seq += 1
-        ev = Event(
-            run_id=self.run_id,
-            seq=self._seq,
-            type=type,  # validated by EventType literal
-            ts=datetime.now(timezone.utc).isoformat(),
-            round=round,
-            summary=summary,
-            data=data or {},
+        ts = now_us()
+        data = data or {}
+        self.events.append(self.run_id, self._seq, type, ts, round, summary, data)  # validates `type`
+        ev = Event.model_construct(
+            run_id=self.run_id, seq=self._seq, type=type, ts=iso(ts), round=round, summary=summary, data=data,
         )
-        self.events.append(ev)
+        if self.store is not None:
+            self.store.append(ev)
         return ev
@@ -0,0 +1,267 @@
+from __future__ import annotations
+# Ledger events in a DynamoDB table keyed (run_id, seq), the hosted architecture's
+# ledger. append() only queues the item; writer threads send BatchWriteItem requests of
+# up to 25 items and retry UnprocessedItems with jittered exponential backoff, so a
+# request never waits on DynamoDB. Once max_pending events are queued the store is
+# `saturated` and the API turns new runs away with a 503; append() still queues events
+# from runs already under way, so none of them fails halfway. Works with a boto3 client
+# (AWS or DynamoDB Local via endpoint_url) or core.dynamo_local.
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .models import Event
+
+log = logging.getLogger(__name__)
+
+BATCH_LIMIT = 25  # BatchWriteItem maximum
+# Errors worth retrying at once; anything else (missing table, bad request) waits for
+# the next flush cycle instead of spinning.
+RETRYABLE = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "InternalServerError",
+    "ServiceUnavailable",
+}
+
+def error_code(e: BaseException) -> Optional[str]:
+    response = getattr(e, "response", None)
+    return response.get("Error", {}).get("Code") if isinstance(response, dict) else None
+
+def to_item(event: Event) -> Dict[str, Any]:
+    return {
+        "run_id": {"S": event.run_id},
+        "seq": {"N": str(event.seq)},
+        "type": {"S": event.type},
+        "round": {"N": str(event.round)},
+        "event": {"S": event.model_dump_json()},
+    }
+
+def dynamodb_client(endpoint_url: Optional[str] = None, *, max_connections: int = 10):
+    try:
+        import boto3
+        from botocore.config import Config
+    except ImportError as e:
+        raise RuntimeError("The DynamoDB ledger needs boto3 (pip install boto3), or use LEDGER_BACKEND=dynamodb-local") from e
+    # The store does its own retries of unprocessed items; keep the SDK's short.
+    config = Config(retries={"max_attempts": 3, "mode": "standard"}, max_pool_connections=max_connections)
+    return boto3.client("dynamodb", endpoint_url=endpoint_url, config=config)
+
+def ensure_table(client, table: str, *, timeout_s: float = 60.0) -> None:
+    # Creates the on-demand (run_id, seq) table if missing, e.g. on a fresh DynamoDB Local.
+    try:
+        status = client.describe_table(TableName=table)["Table"]["TableStatus"]
+    except Exception as e:
+        if error_code(e) != "ResourceNotFoundException":
+            raise
+        client.create_table(
+            TableName=table,
+            KeySchema=[{"AttributeName": "run_id", "KeyType": "HASH"}, {"AttributeName": "seq", "KeyType": "RANGE"}],
+            AttributeDefinitions=[
+                {"AttributeName": "run_id", "AttributeType": "S"},
+                {"AttributeName": "seq", "AttributeType": "N"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        status = "CREATING"
+    deadline = time.monotonic() + timeout_s
+    while status != "ACTIVE":
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"DynamoDB table {table} is still {status}")
+        time.sleep(0.5)
+        status = client.describe_table(TableName=table)["Table"]["TableStatus"]
+
+class DynamoLedgerStore:
+    def __init__(
+        self,
+        client,
+        table: str,
+        *,
+        batch_size: int = BATCH_LIMIT,
+        writers: int = 4,
+        flush_interval_s: float = 0.05,
+        max_pending: int = 10_000,
+        max_attempts: int = 8,
+        base_backoff_s: float = 0.05,
+        max_backoff_s: float = 2.0,
+        background: bool = True,
+    ):
+        if not 1 <= batch_size <= BATCH_LIMIT:
+            raise ValueError(f"batch_size must be 1..{BATCH_LIMIT}")
+        self.client = client
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.base_backoff_s = base_backoff_s
+        self.max_backoff_s = max_backoff_s
+
+        self._cond = threading.Condition()
+        self._queue: Deque[Dict[str, Any]] = deque()  # PutRequest entries
+        self._inflight = 0
+        self._closed = False
+        self._rng = random.Random()
+        self.written = 0
+        self.batches = 0
+        self.retried = 0  # items resent after UnprocessedItems or a retryable error
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+        self._writers = [
+            threading.Thread(target=self._write_loop, name=f"ledger-dynamo-{i}", daemon=True)
+            for i in range(writers if background else 0)
+        ]
+        for t in self._writers:
+            t.start()
+
+    def append(self, event: Event) -> None:
+        request = {"PutRequest": {"Item": to_item(event)}}
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ledger store is closed")
+            self._queue.append(request)
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+
+    @property
+    def saturated(self) -> bool:
+        # Checked before a run starts; appends themselves never block or fail on backlog.
+        with self._cond:
+            return len(self._queue) + self._inflight >= self.max_pending
+
+    # ---- writing ----
+
+    def _take_locked(self) -> List[Dict[str, Any]]:
+        n = min(self.batch_size, len(self._queue))
+        batch = [self._queue.popleft() for _ in range(n)]
+        self._inflight += n
+        return batch
+
+    def _done_locked(self, taken: int, leftover: List[Dict[str, Any]]) -> None:
+        self._inflight -= taken
+        self._queue.extendleft(reversed(leftover))  # back to the front, original order
+        self._cond.notify_all()
+
+    def _backoff(self, attempt: int) -> float:
+        return self._rng.uniform(0, min(self.max_backoff_s, self.base_backoff_s * 2 ** attempt))
+
+    def _count(self, **deltas: int) -> None:
+        with self._cond:
+            for name, n in deltas.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Sends one batch until every item is accepted; returns what is still unwritten
+        # after max_attempts or a non-retryable error.
+        for attempt in range(self.max_attempts):
+            try:
+                resp = self.client.batch_write_item(RequestItems={self.table: batch})
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._count(errors=1)
+                if error_code(e) not in RETRYABLE:
+                    log.warning("DynamoDB ledger write failed: %s", self.last_error)
+                    return batch
+            else:
+                rest = resp.get("UnprocessedItems", {}).get(self.table, [])
+                self._count(batches=1, written=len(batch) - len(rest))
+                if not rest:
+                    return []
+                batch = rest
+            self._count(retried=len(batch))
+            time.sleep(self._backoff(attempt))
+        log.warning("DynamoDB ledger: %d events still unwritten after %d attempts", len(batch), self.max_attempts)
+        return batch
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or len(self._queue) >= self.batch_size, self.flush_interval_s)
+                if self._closed:
+                    return
+                batch = self._take_locked()
+            if not batch:
+                continue
+            leftover = batch
+            try:
+                leftover = self._write(batch)
+            finally:
+                with self._cond:
+                    self._done_locked(len(batch), leftover)
+            if leftover:
+                time.sleep(self.max_backoff_s)
+
+    def flush(self) -> None:
+        # Writes whatever is queued from the calling thread too, then waits for the writer
+        # threads' in-flight batches. Raises if events could not be written.
+        while True:
+            with self._cond:
+                batch = self._take_locked()
+                if not batch:
+                    self._cond.wait_for(lambda: self._inflight == 0)
+                    if not self._queue:
+                        return
+                    continue
+            leftover = batch
+            try:
+                leftover = self._write(batch)
+            finally:
+                with self._cond:
+                    self._done_locked(len(batch), leftover)
+            if leftover:
+                with self._cond:
+                    pending = len(self._queue)
+                raise RuntimeError(f"{pending} ledger events not written to {self.table}: {self.last_error}")
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for t in self._writers:
+            t.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            pending = len(self._queue) + self._inflight
+        return {
+            "pending": pending,
+            "written": self.written,
+            "batches": self.batches,
+            "retried_items": self.retried,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+    # ---- reads ----
+
+    def replay(self, run_id: str) -> List[Event]:
+        return self.query(run_id)
+
+    def query(self, run_id: str, type: Optional[str] = None, round: Optional[int] = None) -> List[Event]:
+        # One partition, in seq order; type/round are filtered here from the key-side
+        # attributes, so only matching events are parsed.
+        self.flush()
+        kwargs: Dict[str, Any] = {
+            "TableName": self.table,
+            "KeyConditionExpression": "run_id = :r",
+            "ExpressionAttributeValues": {":r": {"S": run_id}},
+            "ConsistentRead": True,
+        }
+        out: List[Event] = []
+        while True:
+            resp = self.client.query(**kwargs)
+            for item in resp.get("Items", []):
+                if type is not None and item["type"]["S"] != type:
+                    continue
+                if round is not None and int(item["round"]["N"]) != round:
+                    continue
+                out.append(Event.model_validate_json(item["event"]["S"]))
+            if not resp.get("LastEvaluatedKey"):
+                return out
+            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+import hashlib
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .event_log import TYPE_IDS
+from .models import Event
+
+# Sidecar record per event: (run hash, type id, round, byte offset, byte length).
+RECORD = struct.Struct("<QBiQI")
+RECORD_DTYPE = np.dtype([("run", "<u8"), ("type", "u1"), ("round", "<i4"), ("offset", "<u8"), ("length", "<u4")])
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+INDEX_SUFFIX = ".idx"
+
+def run_hash(run_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(run_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+class SegmentIndex:
+    def __init__(self, segment: Path):
+        self.segment = segment
+        self.path = segment.with_suffix(INDEX_SUFFIX)
+        self._new: List[bytes] = []
+        self._sorted: Optional[np.ndarray] = None  # sorted copy of _records[:len(_sorted)]
+        self._records = self._load()
+        self.covered = int((self._records["offset"] + self._records["length"]).max()) if len(self._records) else 0
+        self._fh = None
+
+    def _load(self) -> np.ndarray:
+        # The sidecar isn't fsync'd with its segment, so after a crash it can end in a torn
+        # record or point past the segment's surviving bytes. Keeps the prefix of records
+        # inside the segment and cuts the file there, so new records never follow stale
+        # ones; catch_up() then indexes whatever the segment holds beyond that.
+        if not self.path.exists():
+            return np.empty(0, dtype=RECORD_DTYPE)
+        raw = self.path.read_bytes()
+        records = np.frombuffer(raw[: len(raw) - len(raw) % RECORD.size], dtype=RECORD_DTYPE).copy()
+        size = self.segment.stat().st_size if self.segment.exists() else 0
+        past = np.flatnonzero(records["offset"] + records["length"] > size)
+        if len(past):
+            records = records[: past[0]]
+        if len(records) * RECORD.size != len(raw):
+            with open(self.path, "r+b") as fh:
+                fh.truncate(len(records) * RECORD.size)
+        return records
+
+    def catch_up(self) -> int:
+        # Index whatever the segment holds past the last indexed byte (missing or stale sidecar).
+        size = self.segment.stat().st_size if self.segment.exists() else 0
+        if size <= self.covered:
+            return 0
+        added = 0
+        with open(self.segment, "rb") as fh:
+            fh.seek(self.covered)
+            offset = self.covered
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break
+                d = json.loads(line)
+                self.add(d["run_id"], d["type"], d.get("round", 0), offset, len(line))
+                offset += len(line)
+                added += 1
+        self.flush()
+        return added
+
+    def add(self, run_id: str, type: str, round: int, offset: int, length: int) -> None:
+        self._new.append(RECORD.pack(run_hash(run_id), TYPE_IDS[type], round, offset, length))
+        self.covered = offset + length
+
+    def flush(self) -> None:
+        if not self._new:
+            return
+        if self._fh is None:
+            self._fh = open(self.path, "ab")
+        buf = b"".join(self._new)
+        self._fh.write(buf)
+        self._fh.flush()
+        self._records = np.concatenate([self._records, np.frombuffer(buf, dtype=RECORD_DTYPE)])
+        self._new.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def lookup(self, run: int, type_id: Optional[int], round: Optional[int]) -> np.ndarray:
+        self.flush()
+        n_sorted = 0 if self._sorted is None else len(self._sorted)
+        if len(self._records) - n_sorted > max(4096, n_sorted // 8):
+            r = self._records
+            self._sorted = r[np.lexsort((r["offset"], r["round"], r["type"], r["run"]))]
+            self._sorted_runs = np.ascontiguousarray(self._sorted["run"])  # searchsorted needs contiguous keys
+            n_sorted = len(self._sorted)
+
+        # Recent appends live in an unsorted tail until the next re-sort.
+        tail = self._records[n_sorted:]
+        if len(tail):
+            mask = tail["run"] == run
+            if type_id is not None:
+                mask &= tail["type"] == type_id
+            if round is not None:
+                mask &= tail["round"] == round
+            tail = tail[mask]
+        if not n_sorted:
+            return tail
+
+        lo = np.searchsorted(self._sorted_runs, run, side="left")
+        hi = np.searchsorted(self._sorted_runs, run, side="right")
+        hits = self._sorted[lo:hi]
+        if type_id is not None:
+            lo = np.searchsorted(hits["type"], type_id, side="left")
+            hi = np.searchsorted(hits["type"], type_id, side="right")
+            hits = hits[lo:hi]
+            if round is not None:
+                lo = np.searchsorted(hits["round"], round, side="left")
+                hi = np.searchsorted(hits["round"], round, side="right")
+                hits = hits[lo:hi]
+        elif round is not None:
+            hits = hits[hits["round"] == round]
+        return np.concatenate([hits, tail]) if len(tail) else hits
+
+class LedgerIndex:
+    def __init__(self):
+        self._segments: Dict[str, SegmentIndex] = {}
+
+    def open(self, segment: Path) -> SegmentIndex:
+        idx = self._segments.get(segment.name)
+        if idx is None:
+            idx = self._segments[segment.name] = SegmentIndex(segment)
+            idx.catch_up()
+        return idx
+
+    def record(self, segment: Path, event: Event, offset: int, length: int) -> None:
+        self.open(segment).add(event.run_id, event.type, event.round, offset, length)
+
+    def flush(self) -> None:
+        for idx in self._segments.values():
+            idx.flush()
+
+    def close(self) -> None:
+        for idx in self._segments.values():
+            idx.close()
+
+    def query(
+        self,
+        segments: List[Path],
+        run_id: str,
+        type: Optional[str] = None,
+        round: Optional[int] = None,
+    ) -> Iterator[Tuple[Path, np.ndarray]]:
+        run = run_hash(run_id)
+        type_id = TYPE_IDS[type] if type is not None else None
+        for seg in segments:
+            hits = self.open(seg).lookup(run, type_id, round)
+            if len(hits):
+                yield seg, hits
+
+def read_records(segment: Path, hits: np.ndarray) -> Iterator[bytes]:
+    with open(segment, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for off, length in zip(hits["offset"].tolist(), hits["length"].tolist()):
+            yield mm[off: off + length]
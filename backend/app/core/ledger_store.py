@@ -0,0 +1,243 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple
+from .models import Event
+from .ledger_index import LedgerIndex, read_records
+
+class LedgerStore(Protocol):
+    # What Ledger and the API need from a persistence backend: JsonlLedgerStore,
+    # MemoryLedgerStore, or DynamoLedgerStore (core/ledger_dynamo.py). A store may also
+    # have a `saturated` flag; the API doesn't start runs while it is set.
+    def append(self, event: Event) -> Any: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+    def query(self, run_id: str, type: Optional[str] = None, round: Optional[int] = None) -> List[Event]: ...
+
+def _matches(e: Event, type: Optional[str], round: Optional[int]) -> bool:
+    return (type is None or e.type == type) and (round is None or e.round == round)
+
+class MemoryLedgerStore:
+    # Events per run in process memory; for tests, benchmarks and single-process demos.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: Dict[str, List[Event]] = {}
+
+    def append(self, event: Event) -> None:
+        with self._lock:
+            self._runs.setdefault(event.run_id, []).append(event)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def replay(self, run_id: str) -> List[Event]:
+        return self.query(run_id)
+
+    def query(self, run_id: str, type: Optional[str] = None, round: Optional[int] = None) -> List[Event]:
+        with self._lock:
+            events = list(self._runs.get(run_id, ()))
+        return sorted((e for e in events if _matches(e, type, round)), key=lambda e: e.seq)
+
+SEGMENT_PREFIX = "ledger-"
+SEGMENT_SUFFIX = ".jsonl"
+
+def segment_name(n: int) -> str:
+    return f"{SEGMENT_PREFIX}{n:06d}{SEGMENT_SUFFIX}"
+
+class JsonlLedgerStore:
+    # Append-only JSONL segments with group commit: writes are buffered and fsync'd
+    # at most once per `fsync_interval_s` (or every `fsync_batch` events), not per event.
+    # With the background flusher, append() only copies into the write buffer: the fsync
+    # runs on the flusher thread, outside the lock, so Ledger.add on the event loop never
+    # waits on the disk.
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        *,
+        segment_bytes: int = 64 * 1024 * 1024,
+        durable: bool = True,
+        fsync_interval_s: float = 0.05,
+        fsync_batch: int = 512,
+        background: bool = True,
+        index: bool = True,
+    ):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.durable = durable
+        self.fsync_interval_s = fsync_interval_s
+        self.fsync_batch = fsync_batch
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._unsynced: List[int] = []  # dup'd fds of rotated segments still to fsync
+        self._last_sync = time.monotonic()
+        self.index = LedgerIndex() if index else None
+
+        segs = self.segments()
+        self._seg_no = int(segs[-1].name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) if segs else 1
+        self._open_segment()
+
+        # Bounds the durability window when appends stop arriving.
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # a full group-commit batch, or a rotated segment
+        self._flusher: Optional[threading.Thread] = None
+        if durable and background:
+            self._flusher = threading.Thread(target=self._flush_loop, name="ledger-fsync", daemon=True)
+            self._flusher.start()
+
+    def segments(self) -> List[Path]:
+        return sorted(self.dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    def _open_segment(self) -> None:
+        self._path = self.dir / segment_name(self._seg_no)
+        _truncate_torn_tail(self._path)
+        self._fh = open(self._path, "ab", buffering=1024 * 1024)
+        self._size = self._fh.tell()
+        if self.index is not None:
+            self.index.open(self._path)  # catch the sidecar up before new appends land
+
+    def _detach_locked(self) -> List[int]:
+        # Hands the buffered bytes to the OS and returns the fds still to fsync (dups, so
+        # they can be synced after the lock is released, even across a rotation).
+        self._fh.flush()
+        if self.index is not None:
+            self.index.flush()
+        fds, self._unsynced = self._unsynced, []
+        if self.durable:
+            fds.append(os.dup(self._fh.fileno()))
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        return fds
+
+    @staticmethod
+    def _fsync(fds: List[int]) -> None:
+        try:
+            for fd in fds:
+                os.fsync(fd)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _sync_locked(self) -> None:
+        self._fsync(self._detach_locked())
+
+    def _rotate_locked(self) -> None:
+        fds = self._detach_locked()
+        if self._flusher is None:
+            self._fsync(fds)
+        else:
+            self._unsynced = fds
+            self._wake.set()
+        self._fh.close()
+        self._seg_no += 1
+        self._open_segment()
+
+    def append(self, event: Event) -> Tuple[str, int, int]:
+        line = event.model_dump_json().encode("utf-8") + b"\n"
+        with self._lock:
+            if self._size and self._size + len(line) > self.segment_bytes:
+                self._rotate_locked()
+            offset = self._size
+            self._fh.write(line)
+            self._size += len(line)
+            self._pending += 1
+            if self.index is not None:
+                self.index.record(self._path, event, offset, len(line))
+            if self.durable and self._pending >= self.fsync_batch:
+                if self._flusher is not None:
+                    self._wake.set()
+                else:
+                    self._sync_locked()
+            elif self.durable and self._flusher is None and time.monotonic() - self._last_sync >= self.fsync_interval_s:
+                self._sync_locked()
+            return self._path.name, offset, len(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not (self._pending or self._unsynced):
+                return
+            fds = self._detach_locked()
+        self._fsync(fds)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.fsync_interval_s)
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if not self._fh.closed:
+                self._sync_locked()
+                self._fh.close()
+            if self.index is not None:
+                self.index.close()
+
+    # ---- replay ----
+
+    def iter_events(self, run_id: Optional[str] = None) -> Iterator[Event]:
+        self.flush()
+        for seg in self.segments():
+            with open(seg, "rb") as fh:
+                for line in fh:
+                    if not line.endswith(b"\n"):
+                        break  # torn tail from a crash mid-write
+                    if run_id is not None and run_id.encode() not in line:
+                        continue
+                    ev = Event.model_validate_json(line)
+                    if run_id is None or ev.run_id == run_id:
+                        yield ev
+
+    def replay(self, run_id: str) -> List[Event]:
+        if self.index is not None:
+            return self.query(run_id)
+        return sorted(self.iter_events(run_id), key=lambda e: e.seq)
+
+    def query(self, run_id: str, type: Optional[str] = None, round: Optional[int] = None) -> List[Event]:
+        # Reads only the indexed records for (run_id[, type[, round]]) via mmap.
+        if self.index is None:
+            return [e for e in self.replay(run_id) if _matches(e, type, round)]
+        self.flush()
+        with self._lock:
+            matches = list(self.index.query(self.segments(), run_id, type, round))
+        out = []
+        for seg, hits in matches:
+            for raw in read_records(seg, hits):
+                ev = Event.model_validate_json(raw)
+                if ev.run_id == run_id:  # guard against 64-bit run hash collisions
+                    out.append(ev)
+        out.sort(key=lambda e: e.seq)
+        return out
+
+def _truncate_torn_tail(path: Path) -> None:
+    if not path.exists():
+        return
+    with open(path, "rb+") as fh:
+        size = fh.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        fh.seek(size - 1)
+        if fh.read(1) == b"\n":
+            return
+        # Walk back to the last complete record and drop the partial one.
+        pos = size
+        while pos > 0:
+            step = min(64 * 1024, pos)
+            fh.seek(pos - step)
+            chunk = fh.read(step)
+            nl = chunk.rfind(b"\n")
+            if nl != -1:
+                fh.truncate(pos - step + nl + 1)
+                return
+            pos -= step
+        fh.truncate(0)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+# Stage timings: Prometheus histograms for /metrics plus per-request totals for the
+# Server-Timing header. METRICS=0 turns span() into a shared no-op context manager.
+import bisect
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_enabled = os.getenv("METRICS", "1") == "1"
+
+def enabled() -> bool:
+    return _enabled
+
+def set_enabled(on: bool) -> None:
+    global _enabled
+    _enabled = on
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        i = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+class Registry:
+    def __init__(self):
+        self._hists: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        h = self._hists.get(key)
+        if h is None:
+            with self._lock:
+                h = self._hists.setdefault(key, Histogram())
+        return h
+
+    def render(self) -> str:
+        # Prometheus text exposition format 0.0.4.
+        by_name: Dict[str, List[Tuple[Tuple[Tuple[str, str], ...], Histogram]]] = {}
+        for (name, labels), h in sorted(self._hists.items()):
+            by_name.setdefault(name, []).append((labels, h))
+        lines: List[str] = []
+        for name, series in by_name.items():
+            lines.append(f"# TYPE {name} histogram")
+            for labels, h in series:
+                base = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                sep = "," if base else ""
+                cumulative = 0
+                for le, n in zip(BUCKETS + (float("inf"),), h.counts):
+                    cumulative += n
+                    le_s = "+Inf" if le == float("inf") else repr(le)
+                    lines.append(f'{name}_bucket{{{base}{sep}le="{le_s}"}} {cumulative}')
+                lab = f"{{{base}}}" if base else ""
+                lines.append(f"{name}_sum{lab} {h.sum!r}")
+                lines.append(f"{name}_count{lab} {h.count}")
+        return "\n".join(lines) + "\n"
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+REGISTRY = Registry()
+STAGE_METRIC = "taskbounty_stage_seconds"
+REQUEST_METRIC = "taskbounty_request_seconds"
+
+# Per-request {stage: [seconds, count]}; tasks spawned by the request share the dict.
+_timings: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = contextvars.ContextVar("timings", default=None)
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _Noop()
+
+class _Span:
+    __slots__ = ("name", "hist", "t0")
+
+    def __init__(self, name: str, hist: Histogram):
+        self.name = name
+        self.hist = hist
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        dt = time.perf_counter() - self.t0
+        self.hist.observe(dt)
+        acc = _timings.get()
+        if acc is not None:
+            slot = acc.get(self.name)
+            if slot is None:
+                acc[self.name] = [dt, 1]
+            else:
+                slot[0] += dt
+                slot[1] += 1
+        return False
+
+_stage_hists: Dict[str, Histogram] = {}
+
+def span(name: str):
+    # with span("llm.generate"): ...  Time spent inside is recorded under `name`.
+    if not _enabled:
+        return _NOOP
+    h = _stage_hists.get(name)
+    if h is None:
+        h = _stage_hists[name] = REGISTRY.histogram(STAGE_METRIC, stage=name)
+    return _Span(name, h)
+
+def timed(name: str):
+    # Decorator form of span() for sync and async functions.
+    def deco(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def awrapper(*args, **kwargs):
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return awrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+@contextmanager
+def collect() -> Iterator[Dict[str, List[float]]]:
+    # Starts a fresh per-request timing scope (what Server-Timing reports).
+    acc: Dict[str, List[float]] = {}
+    token = _timings.set(acc)
+    try:
+        yield acc
+    finally:
+        _timings.reset(token)
+
+def server_timing(acc: Dict[str, List[float]], total_s: Optional[float] = None) -> str:
+    # Stage names become metric tokens ("llm.generate" -> "llm-generate"); dur is in ms.
+    parts = [
+        f'{name.replace(".", "-").replace("_", "-")};dur={secs * 1000:.2f};desc="{name} x{int(n)}"'
+        for name, (secs, n) in acc.items()
+    ]
+    if total_s is not None:
+        parts.append(f"total;dur={total_s * 1000:.2f}")
+    return ", ".join(parts)
+
+class TimingMiddleware:
+    # Pure ASGI (no BaseHTTPMiddleware buffering): opens a timing scope per HTTP request,
+    # adds Server-Timing to the response head and records request latency per route.
+    # Streaming responses send their head first, so their header only covers prior stages.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+        t0 = time.perf_counter()
+        with collect() as acc:
+            async def send_timed(message):
+                if message["type"] == "http.response.start":
+                    header = server_timing(acc, time.perf_counter() - t0).encode("latin-1")
+                    message = {**message, "headers": list(message.get("headers") or []) + [(b"server-timing", header)]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_timed)
+            finally:
+                route = scope.get("route")
+                REGISTRY.histogram(
+                    REQUEST_METRIC,
+                    method=scope.get("method", ""),
+                    route=getattr(route, "path", "unmatched"),
+                ).observe(time.perf_counter() - t0)
@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Literal
 from uuid import uuid4
 from datetime import datetime
+from .event_log import Event, EventLog, EventType  # noqa: F401  (re-exported; defined with the compact log)
 
 class Task(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid4()))
@@ -19,6 +20,10 @@ class Bid(BaseModel):
     risk_flags: List[str] = Field(default_factory=list)
     notes: Optional[str] = None
 
+class Deliverable(BaseModel):
+    freelancer_id: str
+    files: Dict[str, str]  # relative path -> source text; test*.py files are its unit tests
+
 class ScoreBreakdown(BaseModel):
     price_term: float
     eta_term: float
@@ -34,26 +39,12 @@ class DecisionReport(BaseModel):
     winner_id: str
     rationale: List[str]
     referee_summary: Dict[str, Any]
-    events: List["Event"] = Field(default_factory=list)
+    events: EventLog = Field(default_factory=EventLog)  # a List[Event] to validation and dumps
     score_history: List[Dict[str, Any]] = Field(default_factory=list)
+    degraded_bids: Dict[str, str] = Field(default_factory=dict)  # freelancer_id -> why its LLM note fell back
 
 
 
 
-EventType = Literal[
-    "TASK_POSTED",
-    "BID_SUBMITTED",
-    "COUNTEROFFER_SENT",
-    "COUNTEROFFER_RESPONSE",
-    "ROUND_COMPLETE",
-    "WINNER_SELECTED",
-]
-
-class Event(BaseModel):
-    run_id: str
-    seq: int
-    type: EventType
-    ts: str  # ISO string
-    round: int = 0
-    summary: str
-    data: Dict[str, Any] = Field(default_factory=dict)
\ No newline at end of file
+# Resolve the forward reference now so the first request doesn't pay for the schema build.
+DecisionReport.model_rebuild()
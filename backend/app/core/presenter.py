@@ -1,11 +1,17 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+from .fast_json import dumps
+from .metrics import timed
 from .models import DecisionReport
 
+_ROUND = itemgetter("round")
+
 def _round(x: float, n: int = 4) -> float:
     return float(round(x, n))
 
-def to_ui(report: DecisionReport) -> Dict[str, Any]:
+def _summary(report: DecisionReport) -> Dict[str, Any]:
     # Build flat rows
     rows: List[Dict[str, Any]] = []
     for bid in report.bids:
@@ -50,7 +56,49 @@ def to_ui(report: DecisionReport) -> Dict[str, Any]:
         },
         "referee": report.referee_summary,
         "bids": rows,
-        "events": [e.model_dump() for e in (report.events or [])],
-        "scoreHistory": report.score_history,
+    }
 
+@timed("present")
+def to_ui(report: DecisionReport) -> Dict[str, Any]:
+    return {
+        **_summary(report),
+        "events": report.events.dump(),
+        "scoreHistory": report.score_history,
+        "degradedBids": report.degraded_bids,
     }
+
+def history_page(
+    rows: List[Dict[str, Any]], after_round: int = -1, limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    # score_history rows of rounds > after_round, whole rounds only: as many as fit in
+    # `limit` rows, or just the next round if it alone is larger. Returns the rows and the
+    # round to pass as after_round for the rest (None when there is no more).
+    lo = bisect_right(rows, after_round, key=_ROUND)
+    if lo == len(rows):
+        return [], None
+    if limit <= 0:
+        return [], after_round
+    hi = lo + limit
+    if hi < len(rows):
+        cut = bisect_left(rows, _ROUND(rows[hi]), lo, hi, key=_ROUND)
+        hi = cut if cut > lo else bisect_right(rows, _ROUND(rows[lo]), lo, key=_ROUND)
+    hi = min(hi, len(rows))
+    return rows[lo:hi], (_ROUND(rows[hi - 1]) if hi < len(rows) else None)
+
+@timed("present.page")
+def to_ui_page(report: DecisionReport, *, events_limit: int = 100, history_limit: int = 100) -> bytes:
+    # The to_ui summary (task, winner, ranked bids) with only the first page of events and
+    # scoreHistory, encoded straight to JSON bytes. eventsNext / scoreHistoryNext are the
+    # cursors for the /runs/{runId}/ui/... endpoints, or null when everything is included.
+    events, events_next = report.events.page(0, events_limit)
+    history, history_next = history_page(report.score_history, -1, history_limit)
+    return dumps({
+        **_summary(report),
+        "degradedBids": report.degraded_bids,
+        "runId": report.events.run_id,
+        "events": events,
+        "eventsTotal": len(report.events),
+        "eventsNext": events_next,
+        "scoreHistory": history,
+        "scoreHistoryNext": history_next,
+    })
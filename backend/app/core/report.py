@@ -1,12 +1,30 @@
 from __future__ import annotations
-from .models import DecisionReport, Task, Bid
-from .scoring import score_bid
+from typing import Dict, Optional
+from .models import DecisionReport, Task, Bid, ScoreBreakdown
+from .metrics import timed
+from .scoring import score_bids
 
-def pick_winner(task: Task, bids: list[Bid], weights: dict) -> DecisionReport:
-    max_eta = max(b.eta_days for b in bids) if bids else 1
-    scores = {}
-    for b in bids:
-        scores[b.freelancer_id] = score_bid(b, task.budget_usd, max_eta, weights)
+def stub_referee_summary() -> dict:
+    return {
+        "tests_passing": True,
+        "rubric_score": 8.5,
+        "style_score": 9.0,
+        "plagiarism_risk": "low",
+        "note": "v0.1 uses stub referee metrics (v0.3 will run real tests + rubric evaluation).",
+    }
+
+@timed("pick_winner")
+def pick_winner(
+    task: Task,
+    bids: list[Bid],
+    weights: dict,
+    scores: Optional[Dict[str, ScoreBreakdown]] = None,
+    max_eta_days: Optional[int] = None,
+) -> DecisionReport:
+    # max_eta_days: normalise ETA against a larger pool than `bids` (e.g. a registry shortlist).
+    if scores is None:
+        batch = score_bids(bids, task.budget_usd, weights, max_eta_days=max_eta_days)
+        scores = {b.freelancer_id: batch.breakdown(i) for i, b in enumerate(bids)}
 
     winner_id = max(scores.items(), key=lambda kv: kv[1].total)[0]
 
@@ -16,14 +34,6 @@ def pick_winner(task: Task, bids: list[Bid], weights: dict) -> DecisionReport:
         f"Winner '{winner_id}' had the highest total score after risk/quality normalization."
     ]
 
-    referee_summary = {
-        "tests_passing": True,
-        "rubric_score": 8.5,
-        "style_score": 9.0,
-        "plagiarism_risk": "low",
-        "note": "v0.1 uses stub referee metrics (v0.3 will run real tests + rubric evaluation).",
-    }
-
     return DecisionReport(
         task=task,
         weights=weights,
@@ -31,5 +41,5 @@ def pick_winner(task: Task, bids: list[Bid], weights: dict) -> DecisionReport:
         scores=scores,
         winner_id=winner_id,
         rationale=rationale,
-        referee_summary=referee_summary,
+        referee_summary=stub_referee_summary(),
     )
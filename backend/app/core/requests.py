@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
+from .models import Bid, Deliverable
 
 class RunRequest(BaseModel):
     title: str
@@ -8,3 +9,42 @@ class RunRequest(BaseModel):
     weights: Optional[Dict[str, float]] = None
     use_llm: bool = True
     model: str = "llama3.1:8b"
+    exclude_flags: List[str] = Field(default_factory=list)  # skip freelancers carrying any of these risk flags
+    deliverables: List[Deliverable] = Field(default_factory=list)  # refereed for the top REFEREE_TOP_K bidders
+
+class FreelancerSpec(BaseModel):
+    freelancer_id: str
+    portfolio_score: float = Field(ge=0, le=1)
+    base_speed: int = Field(ge=0)
+    base_price: float = Field(ge=0)
+    risk_flags: List[str] = Field(default_factory=list)
+    capacity: int = Field(1, ge=1)  # max tasks this freelancer may win in one batch
+
+class BatchTaskSpec(BaseModel):
+    id: Optional[str] = None
+    title: str
+    acceptance_criteria: List[str]
+    budget_usd: float = Field(gt=0)
+
+class BatchRunRequest(BaseModel):
+    tasks: List[BatchTaskSpec] = Field(min_length=1)
+    freelancers: List[FreelancerSpec] = Field(min_length=1)
+    weights: Optional[Dict[str, float]] = None
+    top_k: int = Field(5, ge=1)  # bids listed per task report (the winner is always included)
+
+class WhatIfRequest(BaseModel):
+    # Either a bid set (e.g. the bids of a finished run) or the termsKey of an earlier what-if.
+    bids: Optional[List[Bid]] = None
+    budget_usd: Optional[float] = Field(None, gt=0)
+    max_eta_days: Optional[int] = Field(None, ge=1)  # only when the auction's pool was larger than `bids`
+    terms_key: Optional[str] = None
+    weights: Optional[Dict[str, float]] = None  # baseline; defaults to the demo weights
+    grid: Optional[Dict[str, List[float]]] = None  # cartesian product, missing keys stay at baseline
+    samples: int = Field(0, ge=0, le=1_000_000)  # random vectors within +-spread of the baseline
+    spread: float = Field(0.5, ge=0)
+    seed: int = 0
+    include_vectors: bool = False  # also return winner/rank per vector
+
+class RefereeRequest(BaseModel):
+    acceptance_criteria: List[str]
+    deliverables: List[Deliverable] = Field(min_length=1)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+# Encoded-response cache for deterministic runs: canonical request key -> JSON bytes + ETag.
+# TTL plus a byte budget with LRU eviction; identical concurrent requests share one
+# computation (single-flight). The ETag hashes the key and the body minus the fields every
+# run makes fresh (task/run ids, timestamps), so it survives a recompute after expiry.
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from .fast_json import dumps, loads
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    expires_at: float
+    # What the body refers to and must outlive it, e.g. the DecisionReport behind a
+    # summary's runId cursors; not counted against max_bytes.
+    keep: Any = None
+
+def cache_key(kind: str, **params: Any) -> str:
+    raw = json.dumps([kind, params], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def encode_json(payload: Any) -> bytes:
+    # Same bytes FastAPI's JSONResponse would send for this payload.
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+# Differ between runs of the same request: the task's uuid, the run id (`run_id` on each
+# event, `runId` on summaries) and event timestamps.
+VOLATILE_KEYS = frozenset({"id", "run_id", "runId", "ts"})
+
+def _stable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _stable(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_stable(v) for v in value]
+    return value
+
+def etag_for(body: bytes, key: str = "") -> str:
+    h = hashlib.blake2b(key.encode("utf-8"), digest_size=12)
+    h.update(dumps(_stable(loads(body))))
+    return '"' + h.hexdigest() + '"'
+
+def _consume_exception(fut: asyncio.Future) -> None:
+    if not fut.cancelled():
+        fut.exception()
+
+# compute() returns (payload, cacheable) or (payload, cacheable, keep), the payload
+# JSON-able or already-encoded bytes; uncacheable results (e.g. degraded LLM notes) are
+# still shared with concurrent waiters but not stored.
+Compute = Callable[[], Awaitable[Tuple[Any, ...]]]
+
+class ResponseCache:
+    def __init__(self, *, ttl_s: float = 60.0, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+
+    def peek(self, key: str) -> Optional[CachedResponse]:
+        hit = self._items.get(key)
+        if hit is None:
+            return None
+        if hit.expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        self._items.move_to_end(key)
+        return hit
+
+    async def get(self, key: str, compute: Compute) -> Tuple[CachedResponse, str]:
+        # Returns the response and how it was served: "hit", "shared" or "miss".
+        hit = self.peek(key)
+        if hit is not None:
+            self.hits += 1
+            return hit, "hit"
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+            return await asyncio.shield(pending), "shared"
+        self.misses += 1
+        # Detached and shielded: a client that disconnects doesn't cancel the run for the others.
+        pending = self._inflight[key] = asyncio.ensure_future(self._load(key, compute))
+        pending.add_done_callback(_consume_exception)
+        return await asyncio.shield(pending), "miss"
+
+    async def _load(self, key: str, compute: Compute) -> CachedResponse:
+        try:
+            payload, cacheable, *keep = await compute()
+            body = payload if isinstance(payload, bytes) else encode_json(payload)
+            entry = CachedResponse(body, etag_for(body, key), time.monotonic() + self.ttl_s, *keep)
+            if cacheable and self.ttl_s > 0 and len(body) <= self.max_bytes:
+                self._put(key, entry)
+            return entry
+        finally:
+            del self._inflight[key]
+
+    def _put(self, key: str, entry: CachedResponse) -> None:
+        if key in self._items:
+            self._drop(key)
+        self._items[key] = entry
+        self._bytes += len(entry.body)
+        while self._bytes > self.max_bytes:
+            old, _ = next(iter(self._items.items()))
+            self._drop(old)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._items.pop(key)
+        self._bytes -= len(entry.body)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_inflight": self.shared,
+            "evictions": self.evictions,
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_s": self.ttl_s,
+        }
+
+class RecentReports:
+    # The last `max_runs` DecisionReports by run id, for paging through a run's events and
+    # score history after its summary was sent.
+    def __init__(self, max_runs: int = 64):
+        self.max_runs = max_runs
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+
+    def put(self, report: Any) -> None:
+        run_id = report.events.run_id
+        if run_id is None or self.max_runs <= 0:
+            return
+        self._items[run_id] = report
+        self._items.move_to_end(run_id)
+        while len(self._items) > self.max_runs:
+            self._items.popitem(last=False)
+
+    def get(self, run_id: str) -> Optional[Any]:
+        report = self._items.get(run_id)
+        if report is not None:
+            self._items.move_to_end(run_id)
+        return report
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -1,4 +1,6 @@
 from __future__ import annotations
+from typing import NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
 from .models import Bid, ScoreBreakdown
 
 def clamp(x: float, lo: float, hi: float) -> float:
@@ -42,3 +44,102 @@ def score_bid(
         risk_term=risk_term,
         total=total,
     )
+
+
+class BidArrays(NamedTuple):
+    price_usd: np.ndarray
+    eta_days: np.ndarray
+    confidence: np.ndarray
+    portfolio_score: np.ndarray
+    n_flags: np.ndarray
+
+    @classmethod
+    def from_bids(cls, bids: Sequence[Bid]) -> "BidArrays":
+        return cls(
+            price_usd=np.fromiter((b.price_usd for b in bids), dtype=np.float64, count=len(bids)),
+            eta_days=np.fromiter((b.eta_days for b in bids), dtype=np.int64, count=len(bids)),
+            confidence=np.fromiter((b.confidence for b in bids), dtype=np.float64, count=len(bids)),
+            portfolio_score=np.fromiter((b.portfolio_score for b in bids), dtype=np.float64, count=len(bids)),
+            n_flags=np.fromiter((len(b.risk_flags) for b in bids), dtype=np.int64, count=len(bids)),
+        )
+
+
+class BatchScores(NamedTuple):
+    price_term: np.ndarray
+    eta_term: np.ndarray
+    quality_term: np.ndarray
+    risk_term: np.ndarray
+    total: np.ndarray
+
+    def breakdown(self, i: int) -> ScoreBreakdown:
+        return ScoreBreakdown(
+            price_term=float(self.price_term[i]),
+            eta_term=float(self.eta_term[i]),
+            quality_term=float(self.quality_term[i]),
+            risk_term=float(self.risk_term[i]),
+            total=float(self.total[i]),
+        )
+
+    def ranking(self) -> np.ndarray:
+        # Descending by total; ties keep input order (same as list.sort(reverse=True)).
+        return np.argsort(-self.total, kind="stable")
+
+
+WEIGHT_KEYS = ("price", "eta", "quality", "risk")
+
+def normalized_terms(
+    bids: Union[Sequence[Bid], BidArrays],
+    budget_usd: Union[float, np.ndarray],
+    max_eta_days: Union[int, np.ndarray, None] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # price_norm, eta_norm, quality, risk: the weight-free inputs of score_bid's four terms.
+    a = bids if isinstance(bids, BidArrays) else BidArrays.from_bids(bids)
+    if max_eta_days is None:
+        max_eta_days = int(a.eta_days.max()) if len(a.eta_days) else 1
+
+    price_norm = np.clip(a.price_usd / np.maximum(budget_usd, 1.0), 0.0, 2.0)
+    eta_norm = np.clip(a.eta_days / np.maximum(max_eta_days, 1), 0.0, 2.0)
+    quality = np.clip(0.55 * a.confidence + 0.45 * a.portfolio_score - 0.12 * a.n_flags, 0.0, 1.0)
+    risk = np.clip(0.15 * a.n_flags + (1.0 - a.confidence) * 0.35, 0.0, 1.0)
+    return price_norm, eta_norm, quality, risk
+
+def term_matrix(
+    bids: Union[Sequence[Bid], BidArrays],
+    budget_usd: float,
+    max_eta_days: Optional[int] = None,
+) -> np.ndarray:
+    # (n_bids, 4) signed per-unit-weight terms in WEIGHT_KEYS order: totals = terms @ w.
+    price_norm, eta_norm, quality, risk = normalized_terms(bids, budget_usd, max_eta_days)
+    return np.column_stack((-price_norm, -eta_norm, quality, -risk)).astype(np.float64)
+
+def score_bids(
+    bids: Union[Sequence[Bid], BidArrays],
+    budget_usd: Union[float, np.ndarray],
+    weights: dict,
+    max_eta_days: Union[int, np.ndarray, None] = None,
+) -> BatchScores:
+    # Same arithmetic, in the same order, as score_bid so results agree bit-for-bit.
+    # Columns may be 2-D (tasks x freelancers) with per-task budget/max ETA of shape (T, 1).
+    price_norm, eta_norm, quality, risk = normalized_terms(bids, budget_usd, max_eta_days)
+
+    price_term = -weights["price"] * price_norm
+    eta_term = -weights["eta"] * eta_norm
+    quality_term = weights["quality"] * quality
+    risk_term = -weights["risk"] * risk
+
+    total = price_term + eta_term + quality_term + risk_term
+    return BatchScores(price_term, eta_term, quality_term, risk_term, total)
+
+
+def score_upper_bounds(
+    best: BidArrays,
+    budget_usd: float,
+    weights: dict,
+    max_eta_days: int,
+) -> np.ndarray:
+    # `best` holds each group's most favourable corner: lowest price/ETA/flag count and
+    # highest confidence/portfolio. With non-negative weights score_bid is monotone in
+    # every field (and so is each float op), so the corner's score bounds the whole group.
+    if any(weights[k] < 0 for k in ("price", "eta", "quality", "risk")):
+        return np.full(len(best.price_usd), np.inf)
+    return score_bids(best, budget_usd, weights, max_eta_days=max_eta_days).total
@@ -0,0 +1,219 @@
+from __future__ import annotations
+# What-if analysis over scoring weights. Every score term is linear in its weight, so
+# for a fixed bid set totals = terms @ w and a whole sweep is one matrix multiply.
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .models import Bid
+from .scoring import WEIGHT_KEYS, BidArrays, score_bids, term_matrix
+
+class BidTerms(NamedTuple):
+    key: str
+    ids: List[str]
+    terms: np.ndarray      # (n_bids, 4), see scoring.term_matrix
+    arrays: BidArrays      # kept to score the baseline exactly like pick_winner
+    budget_usd: float
+    max_eta_days: Optional[int]
+
+    def baseline(self, weights: Dict[str, float]) -> "Baseline":
+        exact = score_bids(self.arrays, self.budget_usd, weights, max_eta_days=self.max_eta_days).total
+        return Baseline(weight_vector(weights), int(np.argmax(exact)))  # first max, like pick_winner
+
+class Baseline(NamedTuple):
+    weights: np.ndarray
+    winner: int
+
+def terms_key(bids: Sequence[Bid], budget_usd: float, max_eta_days: Optional[int]) -> str:
+    raw = json.dumps(
+        [budget_usd, max_eta_days,
+         [[b.freelancer_id, b.price_usd, b.eta_days, b.confidence, b.portfolio_score, len(b.risk_flags)] for b in bids]],
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+def weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    return np.array([float(weights[k]) for k in WEIGHT_KEYS], dtype=np.float64)
+
+def build_terms(bids: Sequence[Bid], budget_usd: float, max_eta_days: Optional[int] = None) -> BidTerms:
+    arrays = BidArrays.from_bids(bids)
+    return BidTerms(
+        key=terms_key(bids, budget_usd, max_eta_days),
+        ids=[b.freelancer_id for b in bids],
+        terms=term_matrix(arrays, budget_usd, max_eta_days),
+        arrays=arrays,
+        budget_usd=budget_usd,
+        max_eta_days=max_eta_days,
+    )
+
+class TermCache:
+    # LRU of BidTerms by terms_key, so repeated what-ifs on one bid set skip rebuilding.
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, BidTerms]" = OrderedDict()
+        self._lock = threading.Lock()  # endpoints using it run in the threadpool
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[BidTerms]:
+        with self._lock:
+            t = self._items.get(key)
+            if t is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+            return t
+
+    def put(self, t: BidTerms) -> BidTerms:
+        with self._lock:
+            self._items[t.key] = t
+            self._items.move_to_end(t.key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return t
+
+    def build(self, bids: Sequence[Bid], budget_usd: float, max_eta_days: Optional[int] = None) -> BidTerms:
+        t = self.get(terms_key(bids, budget_usd, max_eta_days))
+        if t is not None:
+            return t
+        self.misses += 1
+        return self.put(build_terms(bids, budget_usd, max_eta_days))
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._items), "hits": self.hits, "misses": self.misses}
+
+def grid_weights(base: Dict[str, float], grid: Dict[str, Sequence[float]]) -> np.ndarray:
+    # Cartesian product over the given keys; other keys stay at their base value.
+    axes = [np.asarray(grid.get(k, [base[k]]), dtype=np.float64) for k in WEIGHT_KEYS]
+    mesh = np.meshgrid(*axes, indexing="ij")
+    return np.column_stack([m.ravel() for m in mesh])
+
+def sample_weights(base: Dict[str, float], n: int, spread: float = 0.5, seed: int = 0) -> np.ndarray:
+    # Uniform within +-spread of each base weight (relative), floored at zero.
+    w0 = weight_vector(base)
+    rng = np.random.default_rng(seed)
+    return np.maximum(0.0, w0 * (1.0 + rng.uniform(-spread, spread, size=(n, len(WEIGHT_KEYS)))))
+
+def weight_vectors(
+    base: Dict[str, float],
+    *,
+    grid: Optional[Dict[str, Sequence[float]]] = None,
+    samples: int = 0,
+    spread: float = 0.5,
+    seed: int = 0,
+) -> np.ndarray:
+    # Grid rows then sampled rows; just the baseline when neither is asked for.
+    parts = []
+    if grid:
+        parts.append(grid_weights(base, grid))
+    if samples:
+        parts.append(sample_weights(base, samples, spread, seed))
+    return np.vstack(parts) if parts else weight_vector(base)[None, :]
+
+def break_even(t: BidTerms, b: Baseline) -> Dict[str, Dict[str, Optional[Dict[str, object]]]]:
+    # Per weight, the nearest value below/above the baseline where the winner changes,
+    # holding the other weights fixed, and who takes over there.
+    gap = (t.terms[b.winner] - t.terms) @ b.weights            # winner's lead over each bid
+    out: Dict[str, Dict[str, Optional[Dict[str, object]]]] = {}
+    for k, key in enumerate(WEIGHT_KEYS):
+        slope = t.terms[b.winner, k] - t.terms[:, k]            # d(lead)/d(w_k)
+        down = up = None
+        for j in range(len(t.ids)):
+            if j == b.winner or slope[j] == 0:
+                continue
+            at = float(b.weights[k] - gap[j] / slope[j])
+            side = "up" if slope[j] < 0 else "down"
+            cur = up if side == "up" else down
+            if cur is None or abs(at - b.weights[k]) < abs(cur["value"] - b.weights[k]):
+                hit = {"value": at, "challenger": t.ids[j]}
+                if side == "up":
+                    up = hit
+                else:
+                    down = hit
+        out[key] = {"down": down, "up": up}
+    return out
+
+def stability_margin(t: BidTerms, b: Baseline) -> Dict[str, object]:
+    # Euclidean distance in weight space from the baseline to the nearest tie with any
+    # other bid: the smallest simultaneous weight change that can flip the winner.
+    if len(t.ids) < 2:
+        return {"margin": None, "challenger": None}
+    d = t.terms[b.winner] - t.terms
+    norm = np.linalg.norm(d, axis=1)
+    dist = np.full(len(t.ids), np.inf)
+    live = norm > 0
+    dist[live] = (d[live] @ b.weights) / norm[live]
+    dist[b.winner] = np.inf
+    j = int(np.argmin(dist))
+    return {"margin": float(dist[j]) if np.isfinite(dist[j]) else None, "challenger": t.ids[j]}
+
+class Sweep(NamedTuple):
+    winners: np.ndarray      # (m,) bid index winning each weight vector
+    winner_rank: np.ndarray  # (m,) 1-based rank of the baseline winner under each vector
+
+# Score cells (vectors x bids) materialised at once by sweep(): 32 MB of float64.
+SWEEP_CELLS = 1 << 22
+
+def sweep(t: BidTerms, b: Baseline, weights: np.ndarray, *, max_cells: int = SWEEP_CELLS) -> Sweep:
+    # In blocks of vectors, so memory stays bounded however many vectors and bids come in.
+    m = len(weights)
+    winners = np.empty(m, dtype=np.intp)
+    rank = np.empty(m, dtype=np.int64)
+    step = max(1, max_cells // max(len(t.ids), 1))
+    for lo in range(0, m, step):
+        totals = weights[lo:lo + step] @ t.terms.T                # (step, n_bids)
+        winners[lo:lo + step] = np.argmax(totals, axis=1)
+        mine = totals[:, b.winner][:, None]
+        rank[lo:lo + step] = 1 + (totals > mine).sum(axis=1)
+    return Sweep(winners, rank)
+
+def regions(t: BidTerms, weights: np.ndarray, s: Sweep) -> List[Dict[str, object]]:
+    # One entry per bid that wins somewhere: share of vectors and the weight box it wins in.
+    counts = np.bincount(s.winners, minlength=len(t.ids))
+    out = []
+    for j in np.argsort(-counts, kind="stable"):
+        if counts[j] == 0:
+            break
+        w = weights[s.winners == j]
+        out.append({
+            "freelancerId": t.ids[j],
+            "wins": int(counts[j]),
+            "share": float(counts[j] / len(weights)),
+            "weightMin": dict(zip(WEIGHT_KEYS, w.min(axis=0).tolist())),
+            "weightMax": dict(zip(WEIGHT_KEYS, w.max(axis=0).tolist())),
+            "centroid": dict(zip(WEIGHT_KEYS, w.mean(axis=0).tolist())),
+        })
+    return out
+
+def analyze(
+    t: BidTerms,
+    base: Dict[str, float],
+    weights: np.ndarray,
+    *,
+    include_vectors: bool = False,
+) -> Dict[str, object]:
+    b = t.baseline(base)
+    s = sweep(t, b, weights)
+    out: Dict[str, object] = {
+        "termsKey": t.key,
+        "baseline": {
+            "weights": dict(zip(WEIGHT_KEYS, b.weights.tolist())),
+            "winnerId": t.ids[b.winner],
+        },
+        "stability": {**stability_margin(t, b), "breakEven": break_even(t, b)},
+        "vectors": int(len(weights)),
+        "flipShare": float((s.winners != b.winner).mean()) if len(weights) else 0.0,
+        "winnerRank": {
+            "best": int(s.winner_rank.min()) if len(weights) else None,
+            "worst": int(s.winner_rank.max()) if len(weights) else None,
+            "mean": float(s.winner_rank.mean()) if len(weights) else None,
+        },
+        "regions": regions(t, weights, s),
+    }
+    if include_vectors:
+        out["ids"] = t.ids
+        out["winners"] = s.winners.tolist()
+        out["ranks"] = s.winner_rank.tolist()
+    return out
@@ -0,0 +1,197 @@
+from __future__ import annotations
+# Near-duplicate lookup for deliverables: MinHash signatures over token shingles, banded
+# into an LSH table in SQLite. A lookup reads BANDS index entries plus the signatures of
+# the colliding documents, so its cost tracks the number of near-duplicates, not the
+# size of the index; inserts are incremental.
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16            # 16 bands x 4 rows: pairs at Jaccard 0.5 collide ~65%, at 0.8 ~100%
+SHINGLE = 5           # tokens per shingle
+SEED = 20240601       # fixes the permutations, so signatures stay comparable across restarts
+MAX_CANDIDATES = 2000 # cap on colliding docs verified per lookup (boilerplate buckets)
+_P = np.uint64((1 << 31) - 1)
+_TOKEN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+|[^\sA-Za-z0-9_]")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sim_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS sim_docs (
+    doc_id INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL UNIQUE,
+    freelancer_id TEXT NOT NULL,
+    sig BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sim_buckets (
+    bucket INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, doc_id)
+) WITHOUT ROWID;
+"""
+
+class Match(NamedTuple):
+    doc_key: str
+    freelancer_id: str
+    similarity: float  # estimated Jaccard similarity of the shingle sets
+
+def tokenize(files: Dict[str, str]) -> List[str]:
+    # Lowercased code tokens of every file in path order; '#' comments are dropped so
+    # pasted code with rewritten comments still matches.
+    out: List[str] = []
+    for path in sorted(files):
+        for line in files[path].splitlines():
+            code = line.split("#", 1)[0] if path.endswith(".py") else line
+            out.extend(t.lower() for t in _TOKEN.findall(code))
+    return out
+
+def shingle_hashes(tokens: Sequence[str], k: int = SHINGLE) -> np.ndarray:
+    if not tokens:
+        return np.zeros(0, dtype=np.uint64)
+    n = max(1, len(tokens) - k + 1)
+    return np.unique(np.fromiter(
+        (zlib.crc32(" ".join(tokens[i:i + k]).encode("utf-8")) for i in range(n)), dtype=np.uint64, count=n,
+    ))
+
+_rng = np.random.default_rng(SEED)
+_A = _rng.integers(1, int(_P), size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, int(_P), size=NUM_PERM, dtype=np.uint64)
+_BAND_MULT = _rng.integers(1, 1 << 63, size=NUM_PERM // BANDS, dtype=np.uint64) | np.uint64(1)
+
+def minhash(hashes: np.ndarray) -> np.ndarray:
+    # (NUM_PERM,) uint32 signature of one shingle-hash set (all-max for an empty set), or
+    # (n, NUM_PERM) for an (n, s) batch of equal-size sets.
+    if hashes.shape[-1] == 0:
+        return np.full(hashes.shape[:-1] + (NUM_PERM,), int(_P), dtype=np.uint32)
+    x = hashes.astype(np.uint64) % _P
+    return ((x[..., None] * _A + _B) % _P).min(axis=-2).astype(np.uint32)
+
+def signature(files: Dict[str, str]) -> np.ndarray:
+    return minhash(shingle_hashes(tokenize(files)))
+
+def band_keys(sigs: np.ndarray) -> np.ndarray:
+    # (n, BANDS) signed 64-bit bucket ids; the band number is mixed in so bands never share buckets.
+    sigs = np.atleast_2d(sigs).astype(np.uint64)
+    rows = NUM_PERM // BANDS
+    with np.errstate(over="ignore"):
+        h = (sigs.reshape(len(sigs), BANDS, rows) * _BAND_MULT).sum(axis=2)
+        h ^= np.arange(BANDS, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    return h.view(np.int64)
+
+def risk_level(similarity: Optional[float]) -> str:
+    if similarity is None or similarity < 0.5:
+        return "low"
+    return "high" if similarity >= 0.8 else "medium"
+
+class SimilarityIndex:
+    def __init__(self, path: str = ":memory:"):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.executescript(_SCHEMA)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        params = {"num_perm": NUM_PERM, "bands": BANDS, "shingle": SHINGLE, "seed": SEED}
+        for name, value in params.items():
+            self._db.execute("INSERT OR IGNORE INTO sim_meta (name, value) VALUES (?, ?)", (name, value))
+        stored = dict(self._db.execute("SELECT name, value FROM sim_meta"))
+        if any(stored.get(k) != v for k, v in params.items()):
+            raise ValueError(f"{path} was built with different MinHash parameters: {stored}")
+        self._db.commit()
+        self.lookups = 0
+        self.candidates = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM sim_docs").fetchone()[0]
+
+    def add_many(self, keys: Sequence[str], freelancer_ids: Sequence[str], sigs: np.ndarray) -> int:
+        # Bulk insert; documents whose key is already indexed are skipped. Returns rows added.
+        sigs = np.ascontiguousarray(np.atleast_2d(sigs), dtype=np.uint32)
+        buckets = band_keys(sigs).tolist()
+        with self._lock, self._db:
+            start = self._db.execute("SELECT COALESCE(MAX(doc_id), 0) FROM sim_docs").fetchone()[0] + 1
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO sim_docs (doc_id, doc_key, freelancer_id, sig) VALUES (?, ?, ?, ?)",
+                [(start + i, k, f, s.tobytes()) for i, (k, f, s) in enumerate(zip(keys, freelancer_ids, sigs))],
+            )
+            added = self._db.total_changes - before
+            if added == len(keys):
+                kept = range(len(keys))
+            else:
+                present = {r[0] for r in self._db.execute(
+                    "SELECT doc_id FROM sim_docs WHERE doc_id >= ?", (start,)
+                )}
+                kept = [i for i in range(len(keys)) if start + i in present]
+            self._db.executemany(
+                "INSERT OR IGNORE INTO sim_buckets (bucket, doc_id) VALUES (?, ?)",
+                [(b, start + i) for i in kept for b in buckets[i]],
+            )
+        return added
+
+    def add(self, key: str, freelancer_id: str, sig: np.ndarray) -> bool:
+        return self.add_many([key], [freelancer_id], sig[None, :]) == 1
+
+    def query(
+        self,
+        sig: np.ndarray,
+        *,
+        exclude_key: Optional[str] = None,
+        exclude_freelancer: Optional[str] = None,
+        min_similarity: float = 0.0,
+        limit: int = 5,
+        before: Optional[int] = None,
+    ) -> List[Match]:
+        # Indexed documents sharing at least one band with `sig`, best first; with `before`,
+        # only documents indexed earlier than that doc_id. Documents below roughly 0.3
+        # similarity rarely collide, so this is not a full ranking.
+        buckets = band_keys(sig)[0].tolist()
+        with self._lock:
+            self.lookups += 1
+            ids = [r[0] for r in self._db.execute(
+                f"SELECT DISTINCT doc_id FROM sim_buckets WHERE bucket IN ({','.join('?' * len(buckets))})"
+                " AND doc_id < ? LIMIT ?",
+                buckets + [before if before is not None else 1 << 62, MAX_CANDIDATES],
+            )]
+            if not ids:
+                return []
+            rows = self._db.execute(
+                f"SELECT doc_key, freelancer_id, sig FROM sim_docs WHERE doc_id IN ({','.join('?' * len(ids))})", ids,
+            ).fetchall()
+            self.candidates += len(rows)
+        rows = [r for r in rows if r[0] != exclude_key and r[1] != exclude_freelancer]
+        if not rows:
+            return []
+        mat = np.frombuffer(b"".join(r[2] for r in rows), dtype=np.uint32).reshape(len(rows), NUM_PERM)
+        sims = (mat == np.asarray(sig, dtype=np.uint32)).mean(axis=1)
+        order = np.argsort(-sims, kind="stable")[:limit]
+        return [Match(rows[i][0], rows[i][1], float(sims[i])) for i in order if sims[i] >= min_similarity]
+
+    def _doc(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            return self._db.execute("SELECT doc_id, sig FROM sim_docs WHERE doc_key = ?", (key,)).fetchone()
+
+    def check_and_add(self, content_key: str, freelancer_id: str, files: Dict[str, str]) -> Optional[Match]:
+        # Closest submission by another freelancer among those indexed before this one was
+        # first seen, indexing it if it is new. Re-checking an unchanged submission gives the
+        # same answer, so the original of a later copy is never flagged against the copy.
+        # Documents are keyed per freelancer: the same files from two freelancers are two documents.
+        key = f"{freelancer_id}:{content_key}"
+        row = self._doc(key)
+        if row is None:
+            self.add(key, freelancer_id, signature(files))
+            row = self._doc(key)
+        doc_id, sig = row[0], np.frombuffer(row[1], dtype=np.uint32)
+        best = self.query(sig, exclude_freelancer=freelancer_id, limit=1, before=doc_id)
+        return best[0] if best else None
+
+    def stats(self) -> Dict[str, int]:
+        return {"documents": len(self), "lookups": self.lookups, "candidates_verified": self.candidates}
+
+    def close(self) -> None:
+        self._db.close()
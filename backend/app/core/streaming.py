@@ -0,0 +1,59 @@
+from __future__ import annotations
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+from pydantic import BaseModel
+
+Sink = Callable[[str, Any], Awaitable[None]]
+
+def _jsonable(payload: Any) -> Any:
+    return payload.model_dump(mode="json") if isinstance(payload, BaseModel) else payload
+
+def encode_ndjson(kind: str, payload: Any) -> bytes:
+    return (json.dumps({"kind": kind, "data": _jsonable(payload)}, separators=(",", ":")) + "\n").encode("utf-8")
+
+def encode_sse(kind: str, payload: Any) -> bytes:
+    return f"event: {kind}\ndata: {json.dumps(_jsonable(payload), separators=(',', ':'))}\n\n".encode("utf-8")
+
+ENCODERS = {"ndjson": encode_ndjson, "sse": encode_sse}
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+async def stream_frames(
+    produce: Callable[[Sink], Awaitable[Tuple[str, Any]]],
+    *,
+    fmt: str = "ndjson",
+    max_pending: int = 64,
+) -> AsyncIterator[bytes]:
+    # Runs `produce(sink)` in a task and yields each frame it emits, then its final
+    # (kind, payload). The queue is bounded, so a slow client stalls the producer at
+    # its next emit; closing the generator (client disconnect) cancels the producer.
+    encode = ENCODERS[fmt]
+    queue: "asyncio.Queue[Optional[Tuple[str, Any]]]" = asyncio.Queue(maxsize=max_pending)
+
+    async def sink(kind: str, payload: Any) -> None:
+        await queue.put((kind, payload))
+
+    async def run() -> None:
+        try:
+            await queue.put(await produce(sink))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(("error", {"detail": str(e) or type(e).__name__}))
+        await queue.put(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            yield encode(*item)
+    finally:
+        if not task.done():
+            task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
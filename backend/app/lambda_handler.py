@@ -0,0 +1,120 @@
+from __future__ import annotations
+# AWS Lambda entry point (infra/template.yaml): Handler app.lambda_handler.handler.
+# Translates API Gateway HTTP API (payload 2.0) and REST API (1.0) events to one ASGI
+# call on app.main:app. Responses are buffered, so /stream routes arrive in one piece.
+import asyncio
+import base64
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from .main import app, flush_ledger, warm_up
+
+if os.getenv("PREWARM", "0") == "1":
+    warm_up()
+
+# One loop for the life of the execution environment: pooled clients bind to it.
+_loop = asyncio.new_event_loop()
+
+_TEXT_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml")
+
+def _request(event: Dict[str, Any]) -> Tuple[str, str, str, List[Tuple[bytes, bytes]], bytes]:
+    if event.get("version") == "2.0":
+        method = event["requestContext"]["http"]["method"]
+        path = event.get("rawPath") or "/"
+        query = event.get("rawQueryString") or ""
+        headers = [(k.lower().encode(), str(v).encode()) for k, v in (event.get("headers") or {}).items()]
+        if event.get("cookies"):
+            headers.append((b"cookie", "; ".join(event["cookies"]).encode()))
+    else:
+        method = event["httpMethod"]
+        path = event.get("path") or "/"
+        multi = event.get("multiValueQueryStringParameters")
+        query = urlencode(multi, doseq=True) if multi else urlencode(event.get("queryStringParameters") or {})
+        multi_h = event.get("multiValueHeaders")
+        if multi_h:
+            headers = [(k.lower().encode(), v.encode()) for k, vs in multi_h.items() for v in vs]
+        else:
+            headers = [(k.lower().encode(), str(v).encode()) for k, v in (event.get("headers") or {}).items()]
+
+    body = event.get("body") or ""
+    raw = base64.b64decode(body) if event.get("isBase64Encoded") else body.encode()
+    return method, path, query, headers, raw
+
+async def _call(event: Dict[str, Any]) -> Dict[str, Any]:
+    method, path, query, headers, body = _request(event)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": headers,
+        "client": None,
+        "server": None,
+    }
+    status = 500
+    out_headers: List[Tuple[bytes, bytes]] = []
+    chunks: List[bytes] = []
+    done = asyncio.Event()
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await done.wait()  # streaming responses poll for disconnect; only report it once we are done
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status, out_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            out_headers = list(message.get("headers") or [])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        done.set()
+    return _response(event, status, out_headers, b"".join(chunks))
+
+def _response(event: Dict[str, Any], status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> Dict[str, Any]:
+    single: Dict[str, str] = {}
+    cookies: List[str] = []
+    for k, v in headers:
+        name, value = k.decode("latin-1").lower(), v.decode("latin-1")
+        if name == "set-cookie":
+            cookies.append(value)
+        else:
+            single[name] = f"{single[name]},{value}" if name in single else value
+
+    content_type: Optional[str] = single.get("content-type")
+    text = content_type is None or content_type.startswith(_TEXT_TYPES)
+    resp: Dict[str, Any] = {
+        "statusCode": status,
+        "headers": single,
+        "body": body.decode("utf-8") if text else base64.b64encode(body).decode(),
+        "isBase64Encoded": not text,
+    }
+    if event.get("version") == "2.0":
+        resp["cookies"] = cookies
+    elif cookies:
+        resp["multiValueHeaders"] = {"set-cookie": cookies}
+    return resp
+
+def handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    try:
+        return _loop.run_until_complete(_call(event))
+    finally:
+        # The environment is frozen once we return, background writer threads included;
+        # write the run's queued ledger events now (in 25-item batches, not per event).
+        flush_ledger()
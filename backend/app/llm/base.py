@@ -2,4 +2,5 @@ from __future__ import annotations
 from typing import Protocol, Optional, Dict, Any
 
 class LLM(Protocol):
-    async def generate(self, prompt: str, *, system: Optional[str] = None) -> str: ...
+    # format: Ollama's structured-output mode ("json"); None = free text.
+    async def generate(self, prompt: str, *, system: Optional[str] = None, format: Optional[str] = None) -> str: ...
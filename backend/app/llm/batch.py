@@ -0,0 +1,81 @@
+from __future__ import annotations
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .base import LLM
+from .guard import NoteGuard
+
+BATCH_SYSTEM = (
+    "You write concise 1–2 sentence freelancer bid notes. "
+    "Reply with ONLY a JSON object mapping each bid id to its note text."
+)
+
+# (freelancer_id, price, eta_days, confidence)
+Quote = Tuple[str, float, int, float]
+
+def batch_prompt(title: str, criteria: Sequence[str], quotes: Sequence[Quote]) -> str:
+    # Shared task prefix once, then one line per bid.
+    lines = [
+        f"Task: {title}",
+        f"Criteria: {list(criteria)}",
+        "Bids:",
+    ]
+    lines += [f"- id={fid} price={price} eta_days={eta} confidence={conf:.2f}" for fid, price, eta, conf in quotes]
+    lines.append('Return JSON: {"<id>": "<note>", ...} with one entry per bid id above.')
+    return "\n".join(lines)
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
+def parse_notes(raw: str, ids: Sequence[str]) -> Dict[str, str]:
+    # Lenient: strips code fences / chatter around the object; drops non-string or empty notes.
+    text = _FENCE.sub("", raw.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        obj = json.loads(text[start: end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(obj, dict):
+        return {}
+    wanted = set(ids)
+    return {k: v.strip() for k, v in obj.items() if k in wanted and isinstance(v, str) and v.strip()}
+
+class BatchNoteGenerator:
+    # One structured /generate call per auction; bids the reply misses go back to the caller.
+    def __init__(self, llm: LLM, *, max_batch: int = 32, json_format: bool = False):
+        self.llm = llm
+        self.max_batch = max_batch
+        self.json_format = json_format  # Ollama `format: "json"` constrains output to valid JSON
+        self.batches = 0
+        self.parse_misses = 0
+
+    async def notes(
+        self,
+        title: str,
+        criteria: Sequence[str],
+        quotes: Sequence[Quote],
+        *,
+        guard: Optional[NoteGuard] = None,
+    ) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        for i in range(0, len(quotes), self.max_batch):
+            chunk = quotes[i: i + self.max_batch]
+            kw = {"system": BATCH_SYSTEM}
+            if self.json_format:
+                kw["format"] = "json"
+            prompt = batch_prompt(title, criteria, chunk)
+            self.batches += 1
+            if guard is not None:
+                raw, _ = await guard.attempt(self.llm, prompt, **kw)
+            else:
+                try:
+                    raw = await self.llm.generate(prompt, **kw)
+                except Exception:
+                    raw = None
+            ids: List[str] = [q[0] for q in chunk]
+            got = parse_notes(raw, ids) if raw else {}
+            self.parse_misses += len(ids) - len(got)
+            out.update(got)
+        return out
@@ -0,0 +1,120 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .base import LLM
+
+class _DiskTier:
+    # Also used by the referee's result cache (its own table, possibly the same file).
+    # Called from asyncio.to_thread workers, so the one connection is used under a lock.
+    def __init__(self, path: str, table: str = "llm_cache"):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._table = table
+        with self._lock, self._db:
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(f"SELECT value FROM {self._table} WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(f"INSERT OR REPLACE INTO {self._table} (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+def _consume_exception(fut: asyncio.Future) -> None:
+    # Every caller may have given up already; don't log "exception was never retrieved".
+    if not fut.cancelled():
+        fut.exception()
+
+# Wraps any LLM and memoizes generate() by a content hash of (model, system, prompt).
+# Tiers: bounded in-memory LRU, then an optional SQLite file that survives restarts.
+class CachedLLM:
+    def __init__(self, llm: LLM, *, max_entries: int = 1024, path: Optional[str] = None):
+        self.llm = llm
+        self.model = getattr(llm, "model", type(llm).__name__)
+        self.max_entries = max_entries
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self._disk = _DiskTier(path) if path else None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.shared = 0  # callers that joined an in-flight generation
+
+    @staticmethod
+    def key(model: str, prompt: str, system: Optional[str], format: Optional[str] = None) -> str:
+        raw = json.dumps([model, system, prompt] + ([format] if format else []), ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, value: str) -> None:
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    async def generate(self, prompt: str, *, system: Optional[str] = None, format: Optional[str] = None) -> str:
+        k = self.key(self.model, prompt, system, format)
+
+        if k in self._mem:
+            self._mem.move_to_end(k)
+            self.hits += 1
+            return self._mem[k]
+
+        pending = self._inflight.get(k)
+        if pending is not None:
+            self.shared += 1
+        else:
+            # Generation runs detached and is shielded from callers, so one caller timing
+            # out neither cancels it for the others nor throws away the result.
+            kw = {"format": format} if format else {}
+            pending = self._inflight[k] = asyncio.ensure_future(self._load(k, prompt, system, kw))
+            pending.add_done_callback(_consume_exception)
+        return await asyncio.shield(pending)
+
+    async def _load(self, k: str, prompt: str, system: Optional[str], kw: Dict[str, str]) -> str:
+        try:
+            value = await asyncio.to_thread(self._disk.get, k) if self._disk else None
+            if value is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                value = await self.llm.generate(prompt, system=system, **kw)  # failures are not cached
+                if self._disk:
+                    await asyncio.to_thread(self._disk.put, k, value)
+            self._remember(k, value)
+            return value
+        finally:
+            del self._inflight[k]
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "shared_inflight": self.shared,
+            "entries": len(self._mem),
+            "max_entries": self.max_entries,
+        }
+
+    async def aclose(self) -> None:
+        close = getattr(self.llm, "aclose", None)
+        if close is not None:
+            await close()
+        if self._disk:
+            self._disk.close()
+            self._disk = None
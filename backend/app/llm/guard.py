@@ -0,0 +1,130 @@
+from __future__ import annotations
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .base import LLM
+
+class Deadline:
+    def __init__(self, budget_s: float):
+        self.budget_s = budget_s
+        self.expires_at = time.monotonic() + budget_s
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+class CircuitBreaker:
+    # closed -> open after `failure_threshold` consecutive failures; after `reset_after_s`
+    # one probe call is let through (half-open) and its outcome closes or re-opens it.
+    def __init__(self, failure_threshold: int = 3, reset_after_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after_s = reset_after_s
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_after_s else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        # A call that ended without telling us anything about the LLM (cancelled, or cut
+        # short by the caller's budget): lets the next half-open probe through.
+        self._probing = False
+
+class NoteGuard:
+    # Request-level policy for bid-note generation: every call shares one latency budget,
+    # is skipped while the breaker is open, and degrades to `fallback` instead of failing
+    # the request. `degraded` records freelancer_id -> reason for the report.
+    def __init__(
+        self,
+        deadline: Deadline,
+        breaker: Optional[CircuitBreaker] = None,
+        *,
+        call_timeout_s: Optional[float] = None,
+        template_fallback: bool = True,
+    ):
+        self.deadline = deadline
+        self.breaker = breaker or CircuitBreaker()
+        self.call_timeout_s = call_timeout_s
+        self.template_fallback = template_fallback  # False: degraded bids get no notes
+        self.degraded: Dict[str, str] = {}
+
+    def _degrade(self, key: str, reason: str, fallback: Callable[[], Optional[str]]) -> Optional[str]:
+        self.degraded[key] = reason
+        return fallback() if self.template_fallback else None
+
+    async def attempt(self, llm: LLM, prompt: str, **kw: Any) -> Tuple[Optional[str], Optional[str]]:
+        # One guarded call: (text, None) on success, (None, reason) otherwise. Only errors
+        # and per-call timeouts count against the breaker; running out of the request's
+        # shared budget, or being cancelled, says nothing about the LLM.
+        budget = self.deadline.remaining()
+        per_call = self.call_timeout_s is not None and self.call_timeout_s <= budget
+        timeout = self.call_timeout_s if per_call else budget
+        if timeout <= 0:
+            return None, "deadline"
+        if not self.breaker.allow():
+            return None, "circuit_open"
+        try:
+            text = await asyncio.wait_for(llm.generate(prompt, **kw), timeout)
+        except asyncio.TimeoutError:
+            if not per_call:
+                self.breaker.release()
+                return None, "deadline"
+            self.breaker.record_failure()
+            return None, "timeout"
+        except Exception:
+            self.breaker.record_failure()
+            return None, "error"
+        except BaseException:
+            self.breaker.release()  # e.g. CancelledError when a stream client disconnects
+            raise
+        self.breaker.record_success()
+        return text, None
+
+    async def note(
+        self,
+        key: str,
+        llm: LLM,
+        prompt: str,
+        *,
+        system: Optional[str] = None,
+        fallback: Callable[[], Optional[str]] = lambda: None,
+    ) -> Optional[str]:
+        text, reason = await self.attempt(llm, prompt, system=system)
+        if reason is not None:
+            return self._degrade(key, reason, fallback)
+        return text
+
+    def annotate(self, report) -> None:
+        # Record degraded bids on a DecisionReport and explain them in the rationale.
+        if not self.degraded:
+            return
+        report.degraded_bids = dict(self.degraded)
+        reasons = ", ".join(sorted(set(self.degraded.values())))
+        fallback = "template notes" if self.template_fallback else "no notes"
+        report.rationale.insert(
+            0, f"LLM notes degraded for {len(self.degraded)}/{len(report.bids)} bids ({reasons}); used {fallback}."
+        )
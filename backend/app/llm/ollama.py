@@ -2,12 +2,47 @@ from __future__ import annotations
 import httpx
 from typing import Optional
 
+from ..core.metrics import timed
+
 class OllamaLLM:
-    def __init__(self, model: str = "llama3.1:8b", base_url: str = "http://127.0.0.1:11434/api"):
+    def __init__(
+        self,
+        model: str = "llama3.1:8b",
+        base_url: str = "http://127.0.0.1:11434/api",
+        *,
+        timeout: float = 60,
+        max_connections: int = 16,
+        keep_alive: Optional[str] = None,
+    ):
         self.model = model
         self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keep_alive = keep_alive  # e.g. "10m": keeps the model (and its prompt cache) loaded between calls
+        self._client: Optional[httpx.AsyncClient] = None
+        self.prompt_tokens = 0
+        self.eval_tokens = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # One pooled client per instance; keep-alive connections are reused across bids.
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-    async def generate(self, prompt: str, *, system: Optional[str] = None) -> str:
+    @timed("llm.generate")
+    async def generate(self, prompt: str, *, system: Optional[str] = None, format: Optional[str] = None) -> str:
         payload = {
             "model": self.model,
             "prompt": prompt,
@@ -15,9 +50,14 @@ class OllamaLLM:
         }
         if system:
             payload["system"] = system
+        if format:
+            payload["format"] = format
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            r = await client.post(f"{self.base_url}/generate", json=payload)
-            r.raise_for_status()
-            data = r.json()
-            return data.get("response", "").strip()
+        r = await self.client.post(f"{self.base_url}/generate", json=payload)
+        r.raise_for_status()
+        data = r.json()
+        self.prompt_tokens += data.get("prompt_eval_count", 0)
+        self.eval_tokens += data.get("eval_count", 0)
+        return data.get("response", "").strip()
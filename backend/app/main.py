@@ -1,18 +1,190 @@
-from fastapi import FastAPI, Query
-from fastapi.middleware.cors import CORSMiddleware
-from .sim.demo import run_demo
-from .llm.ollama import OllamaLLM
-from .core.presenter import to_ui
+from __future__ import annotations
+# Keep module import cheap: numpy/scipy (scoring, simulator), httpx (Ollama) and the
+# ledger store are imported inside the handlers that need them, so a cold start that
+# only serves /health or a cached request never pays for them.
+import asyncio
+import math
 import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Dict, Optional, Set
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.middleware.cors import CORSMiddleware
+
+from .core.requests import BatchRunRequest, RefereeRequest, RunRequest, WhatIfRequest
+from .core.models import EventType, Task
+from .core.event_log import EventLog
+from .core.fast_json import dumps
+from .core.presenter import history_page, to_ui, to_ui_page
+from .core.metrics import REGISTRY, TimingMiddleware
+from .core.response_cache import RecentReports, ResponseCache, cache_key
+from .core.streaming import MEDIA_TYPES, stream_frames
+from .agents.freelancer import DEFAULT_FREELANCERS, FreelancerProfile, collect_bids
+from .llm.cache import CachedLLM
+from .llm.guard import CircuitBreaker, Deadline, NoteGuard
+from .llm.batch import BatchNoteGenerator
+
+if TYPE_CHECKING:
+    from .agents.referee import Referee
+    from .agents.registry import FreelancerRegistry
+    from .core.ledger_store import LedgerStore
+    from .core.sensitivity import TermCache
+
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434/api")
+BID_CONCURRENCY = int(os.getenv("BID_CONCURRENCY", "8"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")  # e.g. ./llm_cache.sqlite; unset = memory only
+# Comma-separated models a request may ask for; unset = any. Either way at most
+# LLM_MAX_MODELS pooled clients stay open, least recently used closed first.
+OLLAMA_MODELS = {m.strip() for m in os.getenv("OLLAMA_MODELS", "").split(",") if m.strip()}
+LLM_MAX_MODELS = int(os.getenv("LLM_MAX_MODELS", "4"))
+LEDGER_DIR = os.getenv("LEDGER_DIR")  # e.g. ./var/ledger; unset = in-memory ledger only
+# none | memory | jsonl (LEDGER_DIR) | dynamodb (LEDGER_TABLE via boto3) | dynamodb-local (in-process stand-in)
+LEDGER_BACKEND = os.getenv("LEDGER_BACKEND", "jsonl" if LEDGER_DIR else "none")
+LEDGER_TABLE = os.getenv("LEDGER_TABLE", "taskbounty-ledger")
+DYNAMODB_ENDPOINT = os.getenv("DYNAMODB_ENDPOINT")  # e.g. http://localhost:8000 for DynamoDB Local
+LEDGER_WRITERS = int(os.getenv("LEDGER_WRITERS", "4"))  # concurrent DynamoDB batch writers
+LEDGER_RETRY_AFTER_S = int(os.getenv("LEDGER_RETRY_AFTER_S", "2"))  # Retry-After on a 503 while the ledger is behind
+LEDGER_DURABLE = os.getenv("LEDGER_DURABLE", "1") == "1"
+LEDGER_FSYNC_MS = float(os.getenv("LEDGER_FSYNC_MS", "50"))
+LLM_BUDGET_MS = float(os.getenv("LLM_BUDGET_MS", "8000"))  # shared by all bid notes of one request
+LLM_CALL_TIMEOUT_MS = os.getenv("LLM_CALL_TIMEOUT_MS")  # optional per-note cap within the budget
+LLM_FALLBACK = os.getenv("LLM_FALLBACK", "template")  # template | none
+LLM_BATCH_NOTES = os.getenv("LLM_BATCH_NOTES", "1") == "1"  # one structured call per auction instead of one per bid
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "10m")
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+LLM_BREAKER_RESET_S = float(os.getenv("LLM_BREAKER_RESET_S", "30"))
+STREAM_MAX_PENDING = int(os.getenv("STREAM_MAX_PENDING", "64"))  # frames buffered before the run waits on the client
+FREELANCER_DB = os.getenv("FREELANCER_DB")  # e.g. ./var/freelancers.sqlite; unset = the built-in five-profile pool
+REGISTRY_TOP_K = int(os.getenv("REGISTRY_TOP_K", "20"))  # registry profiles invited to bid per task
+WHATIF_CACHE_SIZE = int(os.getenv("WHATIF_CACHE_SIZE", "256"))  # bid sets whose term matrix is kept
+WHATIF_MAX_VECTORS = int(os.getenv("WHATIF_MAX_VECTORS", "1000000"))
+RESULT_CACHE_TTL_S = float(os.getenv("RESULT_CACHE_TTL_S", "60"))  # 0 = no caching (still single-flight)
+RESULT_CACHE_MB = float(os.getenv("RESULT_CACHE_MB", "64"))
+NEGOTIATION_MAX_ROUNDS = int(os.getenv("NEGOTIATION_MAX_ROUNDS", "50"))  # hard cap, adaptive or not
+NEGOTIATION_BUDGET_MS = float(os.getenv("NEGOTIATION_BUDGET_MS", "2000"))  # 0 = no time budget
+NEGOTIATION_PATIENCE = int(os.getenv("NEGOTIATION_PATIENCE", "2"))  # stable rounds before stopping early
+NEGOTIATION_PRICE_EPS = float(os.getenv("NEGOTIATION_PRICE_EPS", "0.5"))  # USD; smaller moves count as stable
+# The referee executes submitted Python. Its subprocesses have resource limits but run as
+# the server's user with network access, so it is off unless explicitly enabled; only
+# enable it where jobs get real isolation (unprivileged uid, no network, read-only fs).
+REFEREE_ENABLED = os.getenv("REFEREE_ENABLED", "0") == "1"
+REFEREE_WORKERS = int(os.getenv("REFEREE_WORKERS", "0"))  # concurrent test/style subprocesses; 0 = CPU count
+REFEREE_CPU_S = int(os.getenv("REFEREE_CPU_S", "10"))
+REFEREE_TIMEOUT_S = float(os.getenv("REFEREE_TIMEOUT_S", "30"))
+REFEREE_MEMORY_MB = int(os.getenv("REFEREE_MEMORY_MB", "512"))
+REFEREE_CACHE_PATH = os.getenv("REFEREE_CACHE_PATH")  # e.g. ./var/referee.sqlite; unset = memory only
+REFEREE_TOP_K = int(os.getenv("REFEREE_TOP_K", "3"))  # best-scored bidders whose deliverables are refereed
+SIMILARITY_DB = os.getenv("SIMILARITY_DB")  # e.g. ./var/similarity.sqlite; unset = in-memory MinHash index
+UI_PAGE_MAX = int(os.getenv("UI_PAGE_MAX", "1000"))  # events / scoreHistory rows per page
+UI_KEEP_RUNS = int(os.getenv("UI_KEEP_RUNS", "64"))  # recent run reports kept for paging
+
+# One long-lived pooled (and note-caching) client per recently used model, closed on
+# eviction or shutdown.
+_llms: "OrderedDict[str, CachedLLM]" = OrderedDict()
+_retiring: Set[CachedLLM] = set()
+_breakers: Dict[str, CircuitBreaker] = {}
+_batchers: Dict[str, BatchNoteGenerator] = {}
+_store: Optional[LedgerStore] = None
+_registry: Optional[FreelancerRegistry] = None
+_terms: Optional[TermCache] = None
+_referee: Optional[Referee] = None
+_results = ResponseCache(ttl_s=RESULT_CACHE_TTL_S, max_bytes=int(RESULT_CACHE_MB * 1024 * 1024))
+_reports = RecentReports(UI_KEEP_RUNS)
+
+def get_registry() -> Optional[FreelancerRegistry]:
+    global _registry
+    if FREELANCER_DB and _registry is None:
+        from .agents.registry import open_registry
+        _registry = open_registry(FREELANCER_DB)
+    return _registry
+
+def get_terms() -> TermCache:
+    global _terms
+    if _terms is None:
+        from .core.sensitivity import TermCache
+        _terms = TermCache(WHATIF_CACHE_SIZE)
+    return _terms
+
+def get_referee() -> Referee:
+    global _referee
+    if _referee is None:
+        from .agents.referee import Limits, Referee
+        from .core.similarity import SimilarityIndex
+        _referee = Referee(
+            workers=REFEREE_WORKERS or None,
+            limits=Limits(cpu_s=REFEREE_CPU_S, wall_s=REFEREE_TIMEOUT_S, memory_mb=REFEREE_MEMORY_MB),
+            path=REFEREE_CACHE_PATH,
+            index=SimilarityIndex(SIMILARITY_DB or ":memory:"),
+        )
+    return _referee
+
+def get_store() -> Optional[LedgerStore]:
+    global _store
+    if _store is not None or LEDGER_BACKEND == "none":
+        return _store
+    if LEDGER_BACKEND == "jsonl":
+        from .core.ledger_store import JsonlLedgerStore
+        if not LEDGER_DIR:
+            raise RuntimeError("LEDGER_BACKEND=jsonl needs LEDGER_DIR")
+        _store = JsonlLedgerStore(LEDGER_DIR, durable=LEDGER_DURABLE, fsync_interval_s=LEDGER_FSYNC_MS / 1000)
+    elif LEDGER_BACKEND == "memory":
+        from .core.ledger_store import MemoryLedgerStore
+        _store = MemoryLedgerStore()
+    elif LEDGER_BACKEND in ("dynamodb", "dynamodb-local"):
+        from .core.ledger_dynamo import DynamoLedgerStore, dynamodb_client, ensure_table
+        if LEDGER_BACKEND == "dynamodb":
+            client = dynamodb_client(DYNAMODB_ENDPOINT, max_connections=LEDGER_WRITERS + 2)
+        else:
+            from .core.dynamo_local import LocalDynamoDB
+            client = LocalDynamoDB()
+        if LEDGER_BACKEND == "dynamodb-local" or DYNAMODB_ENDPOINT:
+            ensure_table(client, LEDGER_TABLE)
+        _store = DynamoLedgerStore(client, LEDGER_TABLE, writers=LEDGER_WRITERS)
+    else:
+        raise RuntimeError(f"Unknown LEDGER_BACKEND {LEDGER_BACKEND!r}")
+    return _store
 
-from .core.requests import RunRequest
-from .core.models import Task
-from .sim.demo import DEFAULT_WEIGHTS  # or move weights to config
-from .agents.freelancer import FreelancerProfile, propose_bid
-from .core.report import pick_winner
-from .core.presenter import to_ui
+def run_store() -> Optional[LedgerStore]:
+    # The store for a new run. A store that has fallen behind (DynamoDB backlog) sheds the
+    # run here with a 503 before it logs anything, rather than failing it halfway.
+    store = get_store()
+    if store is not None and getattr(store, "saturated", False):
+        raise HTTPException(
+            status_code=503,
+            detail="The ledger is behind; retry shortly.",
+            headers={"Retry-After": str(LEDGER_RETRY_AFTER_S)},
+        )
+    return store
 
-app = FastAPI(title="TaskBounty DAO", version="0.1")
+def flush_ledger() -> None:
+    # For hosts that freeze the process between requests (Lambda), where background
+    # flushing can't be relied on.
+    if _store is not None:
+        _store.flush()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _store, _registry, _referee
+    yield
+    for llm in list(_llms.values()) + list(_retiring):
+        await llm.aclose()
+    _llms.clear()
+    _retiring.clear()
+    if _store is not None:
+        _store.close()
+        _store = None
+    if _registry is not None:
+        _registry.close()
+        _registry = None
+    if _referee is not None:
+        _referee.close()
+        _referee.index.close()
+        _referee = None
+
+app = FastAPI(title="TaskBounty DAO", version="0.1", lifespan=lifespan)
 
 # CORS for frontend later (React/Vite runs on :5173)
 app.add_middleware(
@@ -21,13 +193,81 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Outermost, so Server-Timing "total" and the request histogram cover everything.
+# Stage spans (bid.propose, llm.generate, negotiation.round, scoring.rank, pick_winner,
+# present, ...) are recorded where they happen; METRICS=0 turns all of it off.
+app.add_middleware(TimingMiddleware)
+
+async def _retire(llm: CachedLLM) -> None:
+    # Requests that got this client before it was evicted may still be using it: close it
+    # once their note budget has run out and no generation is in flight.
+    await asyncio.sleep(LLM_BUDGET_MS / 1000)
+    while llm.inflight:
+        await asyncio.sleep(0.1)
+    if llm in _retiring:
+        _retiring.discard(llm)
+        await llm.aclose()
 
-def get_llm():
+def get_llm(model: Optional[str] = None):
     if os.getenv("USE_LLM", "1") != "1":
         return None
-    model = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
-    return OllamaLLM(model=model, base_url="http://127.0.0.1:11434/api")
+    model = model or os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+    if OLLAMA_MODELS and model not in OLLAMA_MODELS:
+        raise HTTPException(400, f"model {model!r} is not enabled; choose from {', '.join(sorted(OLLAMA_MODELS))}")
+    if model in _llms:
+        _llms.move_to_end(model)
+        return _llms[model]
+    from .llm.ollama import OllamaLLM  # httpx
+    _llms[model] = CachedLLM(
+        OllamaLLM(model=model, base_url=OLLAMA_BASE_URL, max_connections=BID_CONCURRENCY, keep_alive=OLLAMA_KEEP_ALIVE),
+        max_entries=LLM_CACHE_SIZE,
+        path=LLM_CACHE_PATH,
+    )
+    while len(_llms) > max(LLM_MAX_MODELS, 1):
+        old_model, old = _llms.popitem(last=False)
+        _batchers.pop(old_model, None)
+        _breakers.pop(old_model, None)
+        _retiring.add(old)
+        asyncio.get_running_loop().create_task(_retire(old))
+    return _llms[model]
+
+def get_batcher(model: Optional[str] = None) -> Optional[BatchNoteGenerator]:
+    llm = get_llm(model)
+    if llm is None or not LLM_BATCH_NOTES:
+        return None
+    if llm.model not in _batchers:
+        _batchers[llm.model] = BatchNoteGenerator(llm, json_format=True)
+    return _batchers[llm.model]
+
+def get_guard(model: Optional[str] = None) -> NoteGuard:
+    # Per-request budget; the breaker is per model so it spans requests.
+    model = model or os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+    breaker = _breakers.setdefault(model, CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_S))
+    return NoteGuard(
+        Deadline(LLM_BUDGET_MS / 1000),
+        breaker,
+        call_timeout_s=float(LLM_CALL_TIMEOUT_MS) / 1000 if LLM_CALL_TIMEOUT_MS else None,
+        template_fallback=LLM_FALLBACK == "template",
+    )
+
+def llm_options(model: Optional[str] = None) -> Dict[str, object]:
+    llm = get_llm(model)
+    if llm is None:
+        return {"llm": None}
+    return {"llm": llm, "guard": get_guard(model), "batcher": get_batcher(model)}
+
+def warm_up() -> None:
+    # Pay the deferred imports and schema builds now, e.g. during a Lambda init phase that
+    # SnapStart snapshots, instead of on the first request that needs them.
+    from .sim import batch_auction, demo  # noqa: F401  (numpy, scipy)
+    from .core import ledger_store, report, sensitivity  # noqa: F401
+    if LEDGER_BACKEND.startswith("dynamodb"):
+        from .core import ledger_dynamo  # noqa: F401
+    from .agents import registry  # noqa: F401
+    from .llm import ollama  # noqa: F401  (httpx)
+    app.openapi()
 
 @app.get("/")
 def root():
@@ -37,31 +277,208 @@ def root():
 def health():
     return {"ok": True}
 
-@app.post("/demo/run")
-async def demo_run():
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/results")
+def result_cache_stats():
+    return _results.stats()
+
+@app.get("/llm/cache")
+def llm_cache_stats():
+    return {model: llm.stats() for model, llm in _llms.items()}
+
+@app.get("/llm/breakers")
+def llm_breakers():
+    return {model: {"state": b.state, "failures": b.failures} for model, b in _breakers.items()}
+
+@app.get("/runs/{run_id}/events")
+def run_events(run_id: str, type: Optional[EventType] = Query(None), round: Optional[int] = Query(None)):
+    store = get_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Ledger persistence is disabled (set LEDGER_DIR or LEDGER_BACKEND).")
+    events = store.query(run_id, type=type, round=round)
+    if not events:
+        raise HTTPException(status_code=404, detail=f"No events for run {run_id}")
+    return [e.model_dump() for e in events]
+
+def _json_bytes(payload) -> Response:
+    return Response(dumps(payload), media_type="application/json")
+
+# Pages of a run's events and score history after its /run-ui/summary response. Runs are
+# looked up among the last UI_KEEP_RUNS summaries; older runs' events come from the
+# ledger store when LEDGER_DIR is set (score history is only kept in memory).
+@app.get("/runs/{run_id}/ui/events")
+def run_ui_events(
+    run_id: str, after_seq: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=UI_PAGE_MAX),
+):
+    report = _reports.get(run_id)
+    if report is not None:
+        log = report.events
+    else:
+        store = get_store()
+        events = store.query(run_id) if store is not None else []
+        if not events:
+            raise HTTPException(status_code=404, detail=f"Run {run_id} is not held any more; run it again.")
+        log = EventLog.from_events(events)
+    rows, next_seq = log.page(after_seq, limit)
+    return _json_bytes({"runId": run_id, "events": rows, "next": next_seq})
+
+@app.get("/runs/{run_id}/ui/score-history")
+def run_ui_score_history(
+    run_id: str, after_round: int = Query(-1, ge=-1), limit: int = Query(100, ge=1, le=UI_PAGE_MAX),
+):
+    report = _reports.get(run_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} is not held any more; run it again.")
+    rows, next_round = history_page(report.score_history, after_round, limit)
+    return _json_bytes({"runId": run_id, "scoreHistory": rows, "next": next_round})
+
+async def _cached_json(request: Request, kind: str, params: Dict[str, object], compute) -> Response:
+    # Serves a deterministic run from the result cache; `compute` returns (payload, cacheable)
+    # or, for summaries, (payload, cacheable, report). The report is put back in _reports on
+    # every serve, so a cached summary's runId cursors never outlive it.
+    # If-None-Match with the current ETag gets an empty 304.
+    entry, how = await _results.get(cache_key(kind, **params), compute)
+    if entry.keep is not None:
+        _reports.put(entry.keep)
+    headers = {"ETag": entry.etag, "X-Cache": how}
+    inm = request.headers.get("if-none-match")
+    if inm and (inm.strip() == "*" or entry.etag in (t.strip() for t in inm.split(","))):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+def _demo_params(seed: int, rounds: int, adaptive: bool = False) -> Dict[str, object]:
+    from .sim.demo import DEFAULT_WEIGHTS
+
     llm = get_llm()
-    try:
-        report = await run_demo(llm=llm)
-        return report.model_dump()
-    except Exception:
-        report = await run_demo(llm=None)
-        data = report.model_dump()
-        data["rationale"].insert(0, "LLM unavailable; ran deterministic mode.")
-        return data
-
-#  frontend-friendly response
+    return {
+        "seed": seed, "rounds": rounds, "adaptive": adaptive,
+        "weights": DEFAULT_WEIGHTS, "model": llm.model if llm else None,
+    }
+
+def _stop_rule(rounds: int, adaptive: bool):
+    # Adaptive runs treat `rounds` as an upper bound and stop on convergence; fixed runs
+    # must fit under the hard cap.
+    from .sim.negotiation import StopRule
+
+    if rounds < 0:
+        raise HTTPException(status_code=422, detail="rounds must be >= 0")
+    if not adaptive:
+        if rounds > NEGOTIATION_MAX_ROUNDS:
+            raise HTTPException(
+                status_code=422,
+                detail=f"rounds > {NEGOTIATION_MAX_ROUNDS} needs adaptive=true (NEGOTIATION_MAX_ROUNDS)",
+            )
+        return None
+    return StopRule(
+        price_eps_usd=NEGOTIATION_PRICE_EPS,
+        patience=NEGOTIATION_PATIENCE,
+        max_rounds=NEGOTIATION_MAX_ROUNDS,
+        budget_s=NEGOTIATION_BUDGET_MS / 1000 if NEGOTIATION_BUDGET_MS > 0 else None,
+    )
+
+def _repeatable(report) -> bool:
+    # A run cut short by the wall-clock budget depends on timing, so it isn't cached.
+    if report.degraded_bids:
+        return False
+    return not any(e.type == "NEGOTIATION_STOPPED" and e.data.get("reason") == "time_budget" for e in report.events)
+
+@app.post("/demo/run")
+async def demo_run(request: Request):
+    from .sim.demo import run_demo
+
+    async def compute():
+        report = await run_demo(concurrency=BID_CONCURRENCY, store=run_store(), **llm_options())
+        return report.model_dump(), not report.degraded_bids
+
+    return await _cached_json(request, "demo", _demo_params(42, 2), compute)
+
+#  frontend-friendly response; GET so pollers can use ETag revalidation
+@app.get("/demo/run-ui")
 @app.post("/demo/run-ui")
-async def demo_run_ui(seed: int = Query(42), rounds: int = Query(2)):
-    llm = get_llm()
-    try:
-        report = await run_demo(llm=llm, seed=seed, rounds=rounds)
-    except Exception:
-        report = await run_demo(llm=None, seed=seed, rounds=rounds)
-    return to_ui(report)
+async def demo_run_ui(
+    request: Request, seed: int = Query(42), rounds: int = Query(2), adaptive: bool = Query(False),
+):
+    from .sim.demo import run_demo
 
+    stop = _stop_rule(rounds, adaptive)
+
+    async def compute():
+        report = await run_demo(
+            seed=seed, rounds=rounds, concurrency=BID_CONCURRENCY, store=run_store(), stop=stop, **llm_options()
+        )
+        return to_ui(report), _repeatable(report)
+
+    return await _cached_json(request, "demo-ui", _demo_params(seed, rounds, adaptive), compute)
+
+# The same run as /demo/run-ui, answered with the summary (winner, ranked bids) and only
+# the first events_limit events / history_limit scoreHistory rows; the cursors in the
+# response fetch the rest from /runs/{runId}/ui/events and /runs/{runId}/ui/score-history.
+@app.get("/demo/run-ui/summary")
+@app.post("/demo/run-ui/summary")
+async def demo_run_ui_summary(
+    request: Request,
+    seed: int = Query(42),
+    rounds: int = Query(2),
+    adaptive: bool = Query(False),
+    events_limit: int = Query(100, ge=0, le=UI_PAGE_MAX),
+    history_limit: int = Query(100, ge=0, le=UI_PAGE_MAX),
+):
+    from .sim.demo import run_demo
+
+    stop = _stop_rule(rounds, adaptive)
+
+    async def compute():
+        report = await run_demo(
+            seed=seed, rounds=rounds, concurrency=BID_CONCURRENCY, store=run_store(), stop=stop, **llm_options()
+        )
+        body = to_ui_page(report, events_limit=events_limit, history_limit=history_limit)
+        return body, _repeatable(report), report
+
+    params = {**_demo_params(seed, rounds, adaptive), "events_limit": events_limit, "history_limit": history_limit}
+    return await _cached_json(request, "demo-ui-summary", params, compute)
+
+def _streaming(produce, fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_frames(produce, fmt=fmt, max_pending=STREAM_MAX_PENDING),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Streams ledger events and score_history rows as they happen, then a final "result"
+# frame (the to_ui payload without the already-streamed events/scoreHistory).
+# GET is for EventSource clients (format=sse).
+@app.get("/demo/run-ui/stream")
+@app.post("/demo/run-ui/stream")
+async def demo_run_ui_stream(
+    seed: int = Query(42),
+    rounds: int = Query(2),
+    adaptive: bool = Query(False),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+):
+    from .sim.demo import run_demo
+
+    stop = _stop_rule(rounds, adaptive)
+    store = run_store()
+
+    async def produce(sink):
+        report = await run_demo(
+            seed=seed, rounds=rounds, concurrency=BID_CONCURRENCY, store=store, emit=sink, stop=stop,
+            **llm_options()
+        )
+        ui = to_ui(report)
+        ui.pop("events")
+        ui.pop("scoreHistory")
+        return "result", ui
+
+    return _streaming(produce, format)
+
+
+async def _run_ui_report(req: RunRequest, on_bid=None):
+    from .core.report import pick_winner
 
-@app.post("/run-ui")
-async def run_ui(req: RunRequest):
     task = Task(
         title=req.title,
         acceptance_criteria=req.acceptance_criteria,
@@ -70,18 +487,197 @@ async def run_ui(req: RunRequest):
 
     weights = req.weights or {"price": 0.9, "eta": 0.35, "quality": 1.2, "risk": 1.1}
 
-    llm = None
-    if req.use_llm and os.getenv("USE_LLM", "1") == "1":
-        llm = OllamaLLM(model=req.model, base_url="http://127.0.0.1:11434/api")
+    opts = llm_options(req.model) if req.use_llm else {"llm": None}
 
+    # With a registry, only profiles that can still reach the top REGISTRY_TOP_K are asked to bid;
+    # scoring keeps the full pool's max ETA so the winner matches an unpruned auction.
+    registry = get_registry()
+    max_eta = None
+    if registry is not None:
+        shortlist = await asyncio.to_thread(
+            registry.shortlist, task, weights, REGISTRY_TOP_K, exclude_flags=req.exclude_flags
+        )
+        if not shortlist.freelancers:
+            raise HTTPException(status_code=422, detail="No registered freelancer is eligible for this task.")
+        freelancers, max_eta = shortlist.freelancers, shortlist.max_eta_days
+    else:
+        freelancers = [p for p in DEFAULT_FREELANCERS if not set(p.risk_flags) & set(req.exclude_flags)]
+        if not freelancers:
+            raise HTTPException(status_code=422, detail="No freelancer is eligible for this task.")
+
+    bids = await collect_bids(task, freelancers, concurrency=BID_CONCURRENCY, on_bid=on_bid, **opts)
+    report = pick_winner(task, bids, weights, max_eta_days=max_eta)
+    if opts.get("guard") is not None:
+        opts["guard"].annotate(report)
+    if req.deliverables:
+        report = await _refereed(report, req.deliverables, weights, max_eta)
+    return report
+
+async def _refereed(report, deliverables, weights, max_eta):
+    # Referees the top REFEREE_TOP_K submitters. Near-duplicate submissions add the
+    # copy_paste_history risk flag, so the bids are re-ranked and the new leaders refereed
+    # until no one else is flagged (each pass flags at least one more bidder).
+    from .agents.referee import attach, flag_copies, top_deliverables
+    from .core.report import pick_winner
+
+    criteria = report.task.acceptance_criteria
+    results = {}
+    flagged = []
+    while True:
+        picked = [d for d in top_deliverables(report.scores, deliverables, REFEREE_TOP_K) if d.freelancer_id not in results]
+        if not picked:
+            break
+        results.update(await _referee_results(picked, criteria))
+        newly = flag_copies(report.bids, results)
+        if not newly:
+            break
+        flagged += newly
+        degraded = report.degraded_bids
+        report = pick_winner(report.task, report.bids, weights, max_eta_days=max_eta)
+        report.degraded_bids = degraded
+    if flagged:
+        report.rationale.append(
+            f"Referee found near-duplicate submissions from {', '.join(flagged)}; "
+            "copy_paste_history was added to their risk term before ranking."
+        )
+    if results:
+        attach(report, results)
+    return report
+
+async def _referee_results(deliverables, criteria):
+    try:
+        return await get_referee().evaluate_many(deliverables, criteria)
+    except ValueError as e:  # unsafe file path in a submission
+        raise HTTPException(status_code=422, detail=str(e))
+
+def _check_referee(deliverables) -> None:
+    if deliverables and not REFEREE_ENABLED:
+        raise HTTPException(
+            status_code=403,
+            detail="The referee is disabled on this server: it runs submitted code (REFEREE_ENABLED=1).",
+        )
+
+def _refereed_settled(report) -> bool:
+    return all(c["settled"] for c in report.referee_summary.get("candidates", {}).values())
+
+def _run_ui_params(req: RunRequest) -> Dict[str, object]:
+    registry = get_registry()
+    return {
+        "req": req.model_dump(),
+        "llm": req.use_llm and get_llm(req.model) is not None,
+        "registry": registry.version if registry is not None else None,
+    }
+
+@app.post("/run-ui")
+async def run_ui(req: RunRequest, request: Request):
+    _check_referee(req.deliverables)
+    async def compute():
+        report = await _run_ui_report(req)
+        return to_ui(report), not report.degraded_bids and _refereed_settled(report)
+
+    return await _cached_json(request, "run-ui", _run_ui_params(req), compute)
+
+@app.post("/run-ui/summary")
+async def run_ui_summary(
+    req: RunRequest,
+    request: Request,
+    events_limit: int = Query(100, ge=0, le=UI_PAGE_MAX),
+    history_limit: int = Query(100, ge=0, le=UI_PAGE_MAX),
+):
+    _check_referee(req.deliverables)
+
+    async def compute():
+        report = await _run_ui_report(req)
+        body = to_ui_page(report, events_limit=events_limit, history_limit=history_limit)
+        return body, not report.degraded_bids and _refereed_settled(report), report
+
+    params = {**_run_ui_params(req), "events_limit": events_limit, "history_limit": history_limit}
+    return await _cached_json(request, "run-ui-summary", params, compute)
+
+# Streams each bid as it is ready ("bid" frames, completion order), then the "result" frame.
+@app.post("/run-ui/stream")
+async def run_ui_stream(req: RunRequest, format: str = Query("ndjson", pattern="^(ndjson|sse)$")):
+    _check_referee(req.deliverables)
+
+    async def produce(sink):
+        report = await _run_ui_report(req, on_bid=lambda b: sink("bid", b))
+        return "result", to_ui(report)
+
+    return _streaming(produce, format)
+
+# Runs each submission's unit tests and style checks in the sandboxed worker pool; results
+# are cached by deliverable content + criteria, so re-refereeing (e.g. in a dispute) is free.
+@app.post("/referee/evaluate")
+async def referee_evaluate(req: RefereeRequest):
+    _check_referee(req.deliverables)
+    ids = [d.freelancer_id for d in req.deliverables]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=422, detail="freelancer_id values must be unique")
+    return await _referee_results(req.deliverables, req.acceptance_criteria)
+
+@app.get("/referee/cache")
+def referee_cache_stats():
+    return get_referee().stats()
+
+# Many tasks against one shared pool: each freelancer wins at most `capacity` tasks and
+# winners come from a global assignment. Tasks the pool cannot cover are listed in
+# "unassigned". Bid notes are skipped (no LLM calls per task x freelancer pair).
+@app.post("/batch/run-ui")
+def batch_run_ui(req: BatchRunRequest):
+    from .sim.batch_auction import run_batch_auction
+    from .sim.demo import DEFAULT_WEIGHTS
+
+    ids = [f.freelancer_id for f in req.freelancers]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=422, detail="freelancer_id values must be unique")
+    tasks = [Task(**t.model_dump(exclude_none=True)) for t in req.tasks]
     freelancers = [
-        FreelancerProfile("cheap_risky", 0.35, 2, 80,  ["low_test_coverage", "copy_paste_history"]),
-        FreelancerProfile("steady_mid",  0.70, 3, 140, []),
-        FreelancerProfile("fast_good",   0.78, 2, 165, ["tight_schedule"]),
-        FreelancerProfile("slow_safe",   0.82, 5, 150, []),
-        FreelancerProfile("premium",     0.92, 3, 210, []),
+        FreelancerProfile(f.freelancer_id, f.portfolio_score, f.base_speed, f.base_price, list(f.risk_flags))
+        for f in req.freelancers
     ]
+    result = run_batch_auction(
+        tasks,
+        freelancers,
+        req.weights or DEFAULT_WEIGHTS,
+        capacity=[f.capacity for f in req.freelancers],
+        top_k=req.top_k,
+    )
+    return {
+        "reports": [to_ui(r) for r in result.reports],
+        "unassigned": result.unassigned,
+        "totalScore": round(result.total_score, 4),
+    }
+
+# What-if over scoring weights for a fixed bid set: winner regions, the baseline winner's
+# rank across the sweep, and its stability margin. No bids or notes are regenerated.
+@app.post("/whatif")
+def whatif(req: WhatIfRequest):
+    from .core.scoring import WEIGHT_KEYS
+    from .core.sensitivity import analyze, weight_vectors
+    from .sim.demo import DEFAULT_WEIGHTS
+
+    if req.bids:
+        if req.budget_usd is None:
+            raise HTTPException(status_code=422, detail="budget_usd is required with bids")
+        terms = get_terms().build(req.bids, req.budget_usd, req.max_eta_days)
+    elif req.terms_key:
+        terms = get_terms().get(req.terms_key)
+        if terms is None:
+            raise HTTPException(status_code=404, detail="Unknown or evicted terms_key; send the bids again.")
+    else:
+        raise HTTPException(status_code=422, detail="Send bids + budget_usd, or a terms_key")
+
+    base = req.weights or DEFAULT_WEIGHTS
+    unknown = (set(base) | set(req.grid or {})) - set(WEIGHT_KEYS)
+    if unknown or set(WEIGHT_KEYS) - set(base):
+        raise HTTPException(status_code=422, detail=f"weights must use exactly the keys {list(WEIGHT_KEYS)}")
+    size = math.prod(len(v) for v in req.grid.values()) if req.grid else 0
+    if size + req.samples > WHATIF_MAX_VECTORS:
+        raise HTTPException(status_code=422, detail=f"At most {WHATIF_MAX_VECTORS} weight vectors per request")
+
+    vectors = weight_vectors(base, grid=req.grid, samples=req.samples, spread=req.spread, seed=req.seed)
+    return analyze(terms, base, vectors, include_vectors=req.include_vectors)
 
-    bids = [await propose_bid(task, f, llm=llm) for f in freelancers]
-    report = pick_winner(task, bids, weights)
-    return to_ui(report)
\ No newline at end of file
+@app.get("/whatif/cache")
+def whatif_cache_stats():
+    return get_terms().stats()
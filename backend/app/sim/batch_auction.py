@@ -0,0 +1,128 @@
+from __future__ import annotations
+# Batch auction: many tasks bid on by one shared pool with per-freelancer capacity.
+# The tasks x freelancers score matrix is built block by block with score_bids and
+# winners come from a global assignment instead of a greedy per-task argmax.
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..agents.freelancer import FreelancerProfile, quote_bid
+from ..core.assignment import Candidates, solve_assignment, top_candidates
+from ..core.models import DecisionReport, Task
+from ..core.report import stub_referee_summary
+from ..core.scoring import BidArrays, score_bids
+
+@dataclass
+class BatchResult:
+    reports: List[DecisionReport]
+    unassigned: List[str] = field(default_factory=list)  # task ids left without a freelancer
+    total_score: float = 0.0
+
+class PoolArrays:
+    # Freelancer columns; bid terms for a block of tasks follow bid_terms() elementwise.
+    def __init__(self, freelancers: Sequence[FreelancerProfile]):
+        self.base_price = np.array([p.base_price for p in freelancers], dtype=np.float64)
+        self.base_speed = np.array([p.base_speed for p in freelancers], dtype=np.int64)
+        self.portfolio = np.array([p.portfolio_score for p in freelancers], dtype=np.float64)
+        self.n_flags = np.array([len(p.risk_flags) for p in freelancers], dtype=np.int64)
+        self.confidence = np.maximum(0.35, np.minimum(0.95, 0.6 + 0.4 * self.portfolio - 0.08 * self.n_flags))
+
+    def bids(self, budget: np.ndarray, n_crit: np.ndarray) -> BidArrays:
+        # budget, n_crit: (B, 1) -> (B, F) price/eta, freelancer-only columns broadcast.
+        return BidArrays(
+            price_usd=np.minimum(budget, self.base_price + n_crit * 15),
+            eta_days=np.maximum(1, self.base_speed + n_crit // 2),
+            confidence=self.confidence,
+            portfolio_score=self.portfolio,
+            n_flags=self.n_flags,
+        )
+
+def score_blocks(
+    tasks: Sequence[Task],
+    pool: PoolArrays,
+    weights: Dict[str, float],
+    block: int = 128,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    # Yields (first task row, totals of shape (B, F)) so memory stays at block x F.
+    budget = np.array([t.budget_usd for t in tasks], dtype=np.float64)[:, None]
+    n_crit = np.array([len(t.acceptance_criteria) for t in tasks], dtype=np.int64)[:, None]
+    for lo in range(0, len(tasks), block):
+        b, n = budget[lo:lo + block], n_crit[lo:lo + block]
+        # Each task is its own auction over the whole pool, so max ETA is per row.
+        max_eta = np.maximum(1, pool.base_speed.max() + n // 2)
+        yield lo, score_bids(pool.bids(b, n), b, weights, max_eta_days=max_eta).total
+
+def _report(
+    task: Task,
+    freelancers: Sequence[FreelancerProfile],
+    weights: Dict[str, float],
+    cand: Candidates,
+    winner: int,
+    top_k: int,
+    max_eta: int,
+) -> DecisionReport:
+    shown = [int(f) for f in cand.idx[:top_k]]
+    if winner not in shown:
+        shown.append(winner)
+    bids = [quote_bid(task, freelancers[f]) for f in shown]
+    batch = score_bids(bids, task.budget_usd, weights, max_eta_days=max_eta)
+    scores = {b.freelancer_id: batch.breakdown(i) for i, b in enumerate(bids)}
+    winner_id = freelancers[winner].freelancer_id
+
+    rationale = [
+        "Winner chosen by multi-attribute scoring (price + ETA + expected quality − risk).",
+        f"Budget: ${task.budget_usd:.0f}. Bids evaluated deterministically.",
+        "Assigned by a batch-wide optimal assignment that respects freelancer capacity.",
+    ]
+    best = int(cand.idx[0])
+    if best != winner:
+        rationale.append(
+            f"'{freelancers[best].freelancer_id}' scored higher here "
+            f"({float(cand.total[0]):.3f} vs {scores[winner_id].total:.3f}) but was allocated to other tasks."
+        )
+    else:
+        rationale.append(f"Winner '{winner_id}' had the highest total score for this task.")
+
+    return DecisionReport(
+        task=task,
+        weights=weights,
+        bids=bids,
+        scores=scores,
+        winner_id=winner_id,
+        rationale=rationale,
+        referee_summary=stub_referee_summary(),
+    )
+
+def run_batch_auction(
+    tasks: Sequence[Task],
+    freelancers: Sequence[FreelancerProfile],
+    weights: Dict[str, float],
+    *,
+    capacity: Optional[Sequence[int]] = None,
+    top_k: int = 5,
+    block: int = 128,
+) -> BatchResult:
+    # capacity[f] = max tasks freelancer f may win in this batch (default 1).
+    cap = np.ones(len(freelancers), dtype=np.int64) if capacity is None else np.asarray(capacity, dtype=np.int64)
+    if len(tasks) == 0 or len(freelancers) == 0:
+        return BatchResult(reports=[], unassigned=[t.id for t in tasks])
+
+    pool = PoolArrays(freelancers)
+    cands: List[Candidates] = []
+    for _, totals in score_blocks(tasks, pool, weights, block):
+        cands.extend(top_candidates(totals, cap, len(tasks)))
+
+    assigned = solve_assignment(cands, cap)
+    max_speed = int(pool.base_speed.max())
+
+    result = BatchResult(reports=[])
+    for t, (task, cand, f) in enumerate(zip(tasks, cands, assigned)):
+        if f < 0:
+            result.unassigned.append(task.id)
+            continue
+        report = _report(task, freelancers, weights, cand, int(f), top_k,
+                         max(1, max_speed + len(task.acceptance_criteria) // 2))
+        result.total_score += report.scores[report.winner_id].total
+        result.reports.append(report)
+    return result
@@ -0,0 +1,122 @@
+from __future__ import annotations
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.models import Bid
+from ..core.scoring import BidArrays
+
+class FlagSets:
+    # Interns each distinct ordered risk-flag list once. Rows store a small combo id;
+    # `bits` gives the bitset per combo for cheap membership/count checks.
+    def __init__(self):
+        self.flag_bits: Dict[str, int] = {}
+        self.combos: List[Tuple[str, ...]] = []
+        self.bits: List[int] = []
+        self._ids: Dict[Tuple[str, ...], int] = {}
+        self._with: Dict[Tuple[int, str], int] = {}
+
+    def intern(self, flags: Sequence[str]) -> int:
+        key = tuple(flags)
+        cid = self._ids.get(key)
+        if cid is None:
+            mask = 0
+            for f in key:
+                bit = self.flag_bits.setdefault(sys.intern(f), len(self.flag_bits))
+                mask |= 1 << bit
+            cid = self._ids[key] = len(self.combos)
+            self.combos.append(tuple(sys.intern(f) for f in key))
+            self.bits.append(mask)
+        return cid
+
+    def has(self, cid: int, flag: str) -> bool:
+        bit = self.flag_bits.get(flag)
+        return bit is not None and bool(self.bits[cid] >> bit & 1)
+
+    def with_flag(self, cid: int, flag: str) -> int:
+        # Same as list(flags) + [flag] when absent; memoized per (combo, flag).
+        k = (cid, flag)
+        out = self._with.get(k)
+        if out is None:
+            out = self._with[k] = cid if self.has(cid, flag) else self.intern(self.combos[cid] + (flag,))
+        return out
+
+class BidBook:
+    # Struct-of-arrays bid book for negotiation; convert to Bid models only at the API edge.
+    __slots__ = ("ids", "price_usd", "eta_days", "confidence", "portfolio_score", "flags", "notes", "flagsets", "_rows")
+
+    def __init__(self, flagsets: Optional[FlagSets] = None):
+        self.ids: List[str] = []
+        self.price_usd = array("d")
+        self.eta_days = array("q")
+        self.confidence = array("d")
+        self.portfolio_score = array("d")
+        self.flags = array("I")  # FlagSets combo ids
+        self.notes: List[Optional[str]] = []
+        self.flagsets = flagsets or FlagSets()
+        self._rows: List[Optional[Dict[str, Any]]] = []  # row() cache; treat returned dicts as read-only
+
+    @classmethod
+    def from_bids(cls, bids: Sequence[Bid], flagsets: Optional[FlagSets] = None) -> "BidBook":
+        book = cls(flagsets)
+        for b in bids:
+            book.append(b)
+        return book
+
+    def append(self, b: Bid) -> None:
+        self.ids.append(sys.intern(b.freelancer_id))
+        self.price_usd.append(b.price_usd)
+        self.eta_days.append(b.eta_days)
+        self.confidence.append(b.confidence)
+        self.portfolio_score.append(b.portfolio_score)
+        self.flags.append(self.flagsets.intern(b.risk_flags))
+        self.notes.append(b.notes)
+        self._rows.append(None)
+
+    def set_terms(self, i: int, price_usd: float, eta_days: int, confidence: float, flags: int) -> None:
+        self.price_usd[i] = price_usd
+        self.eta_days[i] = eta_days
+        self.confidence[i] = confidence
+        self.flags[i] = flags
+        self._rows[i] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def risk_flags(self, i: int) -> List[str]:
+        return list(self.flagsets.combos[self.flags[i]])
+
+    def row(self, i: int) -> Dict[str, Any]:
+        # Same dict as bid(i).model_dump(), without building the model. Cached until
+        # the row changes, so a round's "before" is the previous round's "after".
+        r = self._rows[i]
+        if r is None:
+            r = self._rows[i] = {
+                "freelancer_id": self.ids[i],
+                "price_usd": self.price_usd[i],
+                "eta_days": self.eta_days[i],
+                "confidence": self.confidence[i],
+                "portfolio_score": self.portfolio_score[i],
+                "risk_flags": self.risk_flags(i),
+                "notes": self.notes[i],
+            }
+        return r
+
+    def bid(self, i: int) -> Bid:
+        return Bid.model_construct(**{**self.row(i), "risk_flags": self.risk_flags(i)})
+
+    def to_bids(self) -> List[Bid]:
+        return [self.bid(i) for i in range(len(self))]
+
+    def arrays(self) -> BidArrays:
+        # Copies, so later in-place updates to the book don't alias a ranking's snapshot.
+        combo_len = np.fromiter((len(c) for c in self.flagsets.combos), dtype=np.int64, count=len(self.flagsets.combos))
+        return BidArrays(
+            price_usd=np.array(self.price_usd, dtype=np.float64),
+            eta_days=np.array(self.eta_days, dtype=np.int64),
+            confidence=np.array(self.confidence, dtype=np.float64),
+            portfolio_score=np.array(self.portfolio_score, dtype=np.float64),
+            n_flags=combo_len[np.array(self.flags, dtype=np.int64)] if len(self) else np.empty(0, dtype=np.int64),
+        )
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
-from typing import Optional, Dict
+from typing import Any, Awaitable, Callable, Optional, Dict, List, Sequence
 import random
 
 from ..core.models import Task, DecisionReport
 from ..core.report import pick_winner
-from ..agents.freelancer import FreelancerProfile, propose_bid
+from ..agents.freelancer import DEFAULT_FREELANCERS, FreelancerProfile, collect_bids
 from ..llm.base import LLM
+from ..llm.batch import BatchNoteGenerator
+from ..llm.guard import NoteGuard
 from ..core.ledger import Ledger
-from ..core.scoring import score_bid
-from .negotiation import propose_counteroffers, apply_counteroffer
+from ..core.ledger_store import LedgerStore
+from ..core.metrics import span
+from .negotiation import Convergence, StopRule, propose_book_counteroffers, apply_book_counteroffers
+from .bidbook import BidBook
+from .ranking import RoundRanking
 
 DEFAULT_WEIGHTS = {"price": 0.9, "eta": 0.35, "quality": 1.2, "risk": 1.1}
 
+# Progress sink for streaming callers: ("bid", Bid) as each bid is ready, ("event", Event)
+# and ("score", score_history row). It is awaited, so a bounded consumer applies
+# backpressure to the negotiation.
+Emit = Callable[[str, Any], Awaitable[None]]
+
 
 async def run_demo(
     llm: Optional[LLM] = None,
@@ -20,12 +30,36 @@ async def run_demo(
     seed: int = 42,
     rounds: int = 2,
     weights: Optional[Dict[str, float]] = None,
+    concurrency: int = 8,
+    store: Optional[LedgerStore] = None,
+    task: Optional[Task] = None,
+    freelancers: Optional[Sequence[FreelancerProfile]] = None,
+    emit: Optional[Emit] = None,
+    guard: Optional[NoteGuard] = None,
+    batcher: Optional[BatchNoteGenerator] = None,
+    stop: Optional[StopRule] = None,
 ) -> DecisionReport:
+    # With `stop`, `rounds` is an upper bound: negotiation ends early once the market has
+    # converged (or at stop.max_rounds / stop.budget_s) and logs NEGOTIATION_STOPPED.
     rng = random.Random(seed)
-    ledger = Ledger()
+    ledger = Ledger(store=store)
     w = weights or DEFAULT_WEIGHTS
 
-    task = Task(
+    async def log(type: str, summary: str, **kw):
+        ev = ledger.add(type, summary, **kw)
+        if emit is not None:
+            await emit("event", ev)
+        return ev
+
+    history: List[Dict[str, Any]] = []
+
+    async def record(rows: List[Dict[str, Any]]) -> None:
+        history.extend(rows)
+        if emit is not None:
+            for row in rows:
+                await emit("score", row)
+
+    task = task or Task(
         title="Implement a FastAPI endpoint + unit tests",
         acceptance_criteria=[
             "POST /tasks creates a task",
@@ -36,103 +70,125 @@ async def run_demo(
         budget_usd=250,
     )
 
-    ledger.add(
+    await log(
         "TASK_POSTED",
         f"Task posted: {task.title}",
         round=0,
         data={"budget_usd": task.budget_usd, "criteria": task.acceptance_criteria},
     )
 
-    freelancers = [
-        FreelancerProfile("cheap_risky", 0.35, base_speed=2, base_price=80,  risk_flags=["low_test_coverage", "copy_paste_history"]),
-        FreelancerProfile("steady_mid",  0.70, base_speed=3, base_price=140, risk_flags=[]),
-        FreelancerProfile("fast_good",   0.78, base_speed=2, base_price=165, risk_flags=["tight_schedule"]),
-        FreelancerProfile("slow_safe",   0.82, base_speed=5, base_price=150, risk_flags=[]),
-        FreelancerProfile("premium",     0.92, base_speed=3, base_price=210, risk_flags=[]),
-    ]
-
-    bids = []
-    for f in freelancers:
-        b = await propose_bid(task, f, llm=llm)
-        bids.append(b)
-        ledger.add(
+    freelancers = freelancers or DEFAULT_FREELANCERS
+
+    # Each bid is streamed as soon as it is ready (completion order), so time-to-first-bid
+    # is one note, not the whole fan-out; the ledger still logs them in freelancer order,
+    # so `seq` doesn't depend on LLM timing.
+    async def ready(b) -> None:
+        await emit("bid", b)
+
+    bids = await collect_bids(
+        task, freelancers, llm=llm, concurrency=concurrency, on_bid=ready if emit is not None else None,
+        guard=guard, batcher=batcher,
+    )
+    for b in bids:
+        await log(
             "BID_SUBMITTED",
             f"Bid submitted by {b.freelancer_id}",
             round=0,
             data=b.model_dump(),
         )
 
-    def snapshot(round_num: int, bids_now):
-        max_eta = max(b.eta_days for b in bids_now) if bids_now else 1
+    # Negotiation runs on a columnar book; Bid models are rebuilt once for the report.
+    book = BidBook.from_bids(bids)
+
+    # One memoized ranking per round, shared by counteroffers, history, top-3 and the winner.
+    ranking = RoundRanking(task.budget_usd, w)
+
+    def snapshot(round_num: int):
         rows = []
-        for bid in bids_now:
-            sb = score_bid(bid, task.budget_usd, max_eta, w)
+        for i in ranking.order():
+            sb = ranking.breakdown(i)
             rows.append({
                 "round": round_num,
-                "freelancerId": bid.freelancer_id,
-                "total": float(sb.total),
-                "price": float(sb.price_term),
-                "eta": float(sb.eta_term),
-                "quality": float(sb.quality_term),
-                "risk": float(sb.risk_term),
+                "freelancerId": ranking.ids[i],
+                "total": sb.total,
+                "price": sb.price_term,
+                "eta": sb.eta_term,
+                "quality": sb.quality_term,
+                "risk": sb.risk_term,
             })
-        rows.sort(key=lambda x: x["total"], reverse=True)
         return rows
-    
-    history = []
-    history.extend(snapshot(0, bids))
 
+    ranking.update(book)
+    await record(snapshot(0))
 
-    # Negotiation rounds
-    for r in range(1, rounds + 1):
-        leader, offers = propose_counteroffers(task, bids, w, rng)
-
-        ledger.add(
-            "COUNTEROFFER_SENT",
-            f"Mediator sent counteroffers (leader: {leader})",
-            round=r,
-            data={"leader": leader, "offers": [o.__dict__ for o in offers]},
-        )
 
-        # Apply responses
-        new_bids = []
-        for b in bids:
-            offer = next(o for o in offers if o.freelancer_id == b.freelancer_id)
-            updated = apply_counteroffer(b, offer, rng)
-            new_bids.append(updated)
-
-            ledger.add(
-                "COUNTEROFFER_RESPONSE",
-                f"{b.freelancer_id} responded",
+    # Negotiation rounds
+    limit = rounds if stop is None else min(rounds, stop.max_rounds)
+    tracker = Convergence(stop, [fid for fid, _ in ranking.top(stop.top_k)]) if stop else None
+    reason: Optional[str] = None
+    last = 0
+    for r in range(1, limit + 1):
+        with span("negotiation.round"):
+            leader, offers = propose_book_counteroffers(task, book, ranking.order(), rng)
+
+            await log(
+                "COUNTEROFFER_SENT",
+                f"Mediator sent counteroffers (leader: {leader})",
                 round=r,
-                data={"before": b.model_dump(), "after": updated.model_dump()},
+                data={"leader": leader, "offers": [o.__dict__ for o in offers]},
             )
 
-        bids = new_bids
-        history.extend(snapshot(r, bids))
-
-
-        # Top-3 snapshot
-        max_eta = max(b.eta_days for b in bids) if bids else 1
-        ranked = []
-        for bid in bids:
-            sb = score_bid(bid, task.budget_usd, max_eta, w)
-            ranked.append((bid.freelancer_id, float(sb.total)))
-        ranked.sort(key=lambda x: x[1], reverse=True)
+            # Apply responses
+            changes = apply_book_counteroffers(book, offers, rng)
+            for before, after in changes:
+                await log(
+                    "COUNTEROFFER_RESPONSE",
+                    f"{before['freelancer_id']} responded",
+                    round=r,
+                    data={"before": before, "after": after},
+                )
+
+            ranking.update(book)
+            await record(snapshot(r))
+
+            await log(
+                "ROUND_COMPLETE",
+                f"Round {r} complete (leader: {leader})",
+                round=r,
+                data={"leader": leader, "top3": ranking.top(3)},
+            )
 
-        ledger.add(
-            "ROUND_COMPLETE",
-            f"Round {r} complete (leader: {leader})",
-            round=r,
-            data={"leader": leader, "top3": ranked[:3]},
+        last = r
+        if tracker is not None:
+            reason = tracker.update([fid for fid, _ in ranking.top(stop.top_k)], changes)
+            if reason is not None:
+                break
+
+    if tracker is not None:
+        if reason is None:
+            reason = "max_rounds" if rounds > stop.max_rounds else "rounds_exhausted"
+        await log(
+            "NEGOTIATION_STOPPED",
+            f"Negotiation stopped after {last} round(s): {reason}",
+            round=last,
+            data={
+                "reason": reason,
+                "rounds_run": last,
+                "rounds_requested": rounds,
+                "max_rounds": stop.max_rounds,
+                "stable_rounds": tracker.stable_rounds,
+                "max_price_delta": round(tracker.max_price_delta, 2),
+            },
         )
 
-    report = pick_winner(task, bids, w)
+    report = pick_winner(task, book.to_bids(), w, scores=ranking.breakdowns())
+    if guard is not None:
+        guard.annotate(report)
 
-    ledger.add(
+    await log(
         "WINNER_SELECTED",
         f"Winner selected: {report.winner_id}",
-        round=rounds,
+        round=last,
         data={"winner_id": report.winner_id},
     )
 
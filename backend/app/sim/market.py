@@ -0,0 +1,275 @@
+from __future__ import annotations
+# Monte-Carlo market simulator: shards (task, seed) auctions across processes.
+#   python -m app.sim.market --tasks 500 --seeds 20 --pool 25 --out runs.csv
+#   python -m app.sim.market --tasks 200 --seeds 10 --scaling 1,2,4,8
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..agents.freelancer import DEFAULT_FREELANCERS, FreelancerProfile
+from ..core.models import Task
+from .demo import DEFAULT_WEIGHTS, run_demo
+
+# Archetypes mirror the demo pool; synthetic freelancers jitter around them.
+ARCHETYPES: Dict[str, Tuple[float, int, float, List[str]]] = {
+    p.freelancer_id: (p.portfolio_score, p.base_speed, p.base_price, p.risk_flags) for p in DEFAULT_FREELANCERS
+}
+
+CRITERIA = [
+    "Endpoint returns 2xx on valid input",
+    "Validation errors return 422",
+    "Include basic unit tests",
+    "Document the API in README",
+    "Add structured logging",
+    "Handle pagination",
+    "Persist to a database",
+    "Add CI workflow",
+]
+
+RUN_FIELDS = [
+    "task_idx", "seed", "budget_usd", "n_bidders", "winner_id", "winner_profile",
+    "winner_price_usd", "winner_initial_price_usd", "avg_initial_price_usd", "avg_final_price_usd", "savings_usd",
+]
+
+def stream_seed(*parts) -> int:
+    # Stable across processes and PYTHONHASHSEED, unlike hash().
+    digest = hashlib.sha256(":".join(map(str, parts)).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+def synthetic_task(base_seed: int, task_idx: int) -> Task:
+    rng = random.Random(stream_seed(base_seed, "task", task_idx))
+    n = rng.randint(1, len(CRITERIA))
+    return Task(
+        id=f"task-{task_idx}",
+        title=f"Synthetic task #{task_idx}",
+        acceptance_criteria=rng.sample(CRITERIA, n),
+        budget_usd=float(rng.randrange(120, 600, 10)),
+    )
+
+def synthetic_pool(base_seed: int, task_idx: int, size: int) -> List[FreelancerProfile]:
+    rng = random.Random(stream_seed(base_seed, "pool", task_idx))
+    names = list(ARCHETYPES)
+    pool = []
+    for i in range(size):
+        kind = names[i % len(names)]
+        portfolio, speed, price, flags = ARCHETYPES[kind]
+        pool.append(FreelancerProfile(
+            f"{kind}#{i}",
+            portfolio_score=round(min(0.99, max(0.05, portfolio + rng.gauss(0, 0.06))), 3),
+            base_speed=max(1, speed + rng.choice((-1, 0, 0, 1))),
+            base_price=round(max(20.0, price * rng.uniform(0.8, 1.2)), 2),
+            risk_flags=list(flags),
+        ))
+    return pool
+
+def profile_of(freelancer_id: str) -> str:
+    return freelancer_id.split("#", 1)[0]
+
+@dataclass(frozen=True)
+class SimConfig:
+    base_seed: int = 0
+    pool_size: int = 5
+    rounds: int = 2
+    weights: Optional[Dict[str, float]] = None
+
+_cfg: Optional[SimConfig] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _init_worker(cfg: SimConfig) -> None:
+    global _cfg, _loop
+    _cfg = cfg
+    _loop = asyncio.new_event_loop()  # one loop per process instead of asyncio.run per job
+
+def run_job(job: Tuple[int, int]) -> Dict[str, object]:
+    task_idx, seed = job
+    cfg = _cfg
+    task = synthetic_task(cfg.base_seed, task_idx)
+    pool = synthetic_pool(cfg.base_seed, task_idx, cfg.pool_size)
+    report = _loop.run_until_complete(run_demo(
+        llm=None,
+        seed=stream_seed(cfg.base_seed, task_idx, seed),
+        rounds=cfg.rounds,
+        weights=cfg.weights,
+        task=task,
+        freelancers=pool,
+    ))
+    initial = {e.data["freelancer_id"]: e.data["price_usd"] for e in report.events if e.type == "BID_SUBMITTED"}
+    final = {b.freelancer_id: b.price_usd for b in report.bids}
+    winner_price = final[report.winner_id]
+    return {
+        "task_idx": task_idx,
+        "seed": seed,
+        "budget_usd": task.budget_usd,
+        "n_bidders": len(pool),
+        "winner_id": report.winner_id,
+        "winner_profile": profile_of(report.winner_id),
+        "winner_price_usd": winner_price,
+        "winner_initial_price_usd": initial[report.winner_id],
+        "avg_initial_price_usd": round(sum(initial.values()) / len(initial), 4),
+        "avg_final_price_usd": round(sum(final.values()) / len(final), 4),
+        "savings_usd": round(initial[report.winner_id] - winner_price, 4),
+    }
+
+class Aggregate:
+    # Running totals only; individual reports are never retained.
+    def __init__(self):
+        self.runs = 0
+        self.wins: Dict[str, int] = defaultdict(int)
+        self.price_sum: Dict[str, float] = defaultdict(float)
+        self.savings_sum: Dict[str, float] = defaultdict(float)
+
+    def add(self, row: Dict[str, object]) -> None:
+        p = row["winner_profile"]
+        self.runs += 1
+        self.wins[p] += 1
+        self.price_sum[p] += row["winner_price_usd"]
+        self.savings_sum[p] += row["savings_usd"]
+
+    def rows(self) -> List[Dict[str, object]]:
+        out = []
+        for p in sorted(set(ARCHETYPES) | set(self.wins)):
+            w = self.wins.get(p, 0)
+            out.append({
+                "profile": p,
+                "wins": w,
+                "win_rate": round(w / self.runs, 6) if self.runs else 0.0,
+                "avg_winning_price_usd": round(self.price_sum[p] / w, 4) if w else None,
+                "avg_savings_usd": round(self.savings_sum[p] / w, 4) if w else None,
+            })
+        return out
+
+class RowWriter:
+    def __init__(self, path: str, fields: List[str], batch: int = 4096):
+        self.path = path
+        self.fields = fields
+        self.batch = batch
+        self._buf: List[Dict[str, object]] = []
+        self._pq = None
+        if path.endswith(".parquet"):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise SystemExit("Parquet output needs pyarrow (pip install pyarrow); use a .csv path instead.") from e
+            self._pa, self._pq_mod = pa, pq
+        else:
+            self._fh = open(path, "w", newline="")
+            self._csv = csv.DictWriter(self._fh, fieldnames=fields)
+            self._csv.writeheader()
+
+    def write(self, row: Dict[str, object]) -> None:
+        self._buf.append(row)
+        if len(self._buf) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        if self.path.endswith(".parquet"):
+            table = self._pa.Table.from_pylist(self._buf)
+            if self._pq is None:
+                self._pq = self._pq_mod.ParquetWriter(self.path, table.schema)
+            self._pq.write_table(table)
+        else:
+            self._csv.writerows(self._buf)
+        self._buf.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._pq is not None:
+            self._pq.close()
+        elif not self.path.endswith(".parquet"):
+            self._fh.close()
+
+def iter_jobs(n_tasks: int, n_seeds: int) -> Iterator[Tuple[int, int]]:
+    for t in range(n_tasks):
+        for s in range(n_seeds):
+            yield (t, s)
+
+def simulate(
+    cfg: SimConfig,
+    n_tasks: int,
+    n_seeds: int,
+    *,
+    workers: int = 0,
+    out: Optional[str] = None,
+    chunksize: int = 64,
+) -> Tuple[Aggregate, float]:
+    workers = workers or os.cpu_count() or 1
+    agg = Aggregate()
+    writer = RowWriter(out, RUN_FIELDS) if out else None
+    t0 = time.perf_counter()
+    try:
+        if workers == 1:
+            _init_worker(cfg)
+            rows = map(run_job, iter_jobs(n_tasks, n_seeds))
+            for row in rows:
+                agg.add(row)
+                if writer:
+                    writer.write(row)
+        else:
+            ctx = mp.get_context("spawn" if os.name == "nt" else "fork")
+            with ctx.Pool(workers, initializer=_init_worker, initargs=(cfg,)) as pool:
+                for row in pool.imap_unordered(run_job, iter_jobs(n_tasks, n_seeds), chunksize=chunksize):
+                    agg.add(row)
+                    if writer:
+                        writer.write(row)
+    finally:
+        if writer:
+            writer.close()
+    return agg, time.perf_counter() - t0
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Run seeded synthetic auctions across a process pool.")
+    ap.add_argument("--tasks", type=int, default=100)
+    ap.add_argument("--seeds", type=int, default=10)
+    ap.add_argument("--pool", type=int, default=5, help="freelancers per task")
+    ap.add_argument("--rounds", type=int, default=2)
+    ap.add_argument("--base-seed", type=int, default=0)
+    ap.add_argument("--weights", type=str, default=None, help='JSON, e.g. \'{"price":0.9,"eta":0.35,"quality":1.2,"risk":1.1}\'')
+    ap.add_argument("--workers", type=int, default=0, help="0 = all cores")
+    ap.add_argument("--chunksize", type=int, default=64)
+    ap.add_argument("--out", type=str, default=None, help="per-run rows (.csv or .parquet)")
+    ap.add_argument("--summary", type=str, default=None, help="per-profile aggregates (.csv or .parquet)")
+    ap.add_argument("--scaling", type=str, default=None, help="comma-separated worker counts to time, e.g. 1,2,4,8")
+    args = ap.parse_args(argv)
+
+    cfg = SimConfig(
+        base_seed=args.base_seed,
+        pool_size=args.pool,
+        rounds=args.rounds,
+        weights=json.loads(args.weights) if args.weights else dict(DEFAULT_WEIGHTS),
+    )
+    n_runs = args.tasks * args.seeds
+
+    if args.scaling:
+        base = None
+        for w in (int(x) for x in args.scaling.split(",")):
+            _, dt = simulate(cfg, args.tasks, args.seeds, workers=w, chunksize=args.chunksize)
+            rate = n_runs / dt
+            base = base or rate
+            print(f"workers={w:>3}: {rate:10,.0f} runs/s  (x{rate / base:.2f})")
+        return
+
+    agg, dt = simulate(cfg, args.tasks, args.seeds, workers=args.workers, out=args.out, chunksize=args.chunksize)
+    print(f"{n_runs:,} runs in {dt:.2f}s ({n_runs / dt:,.0f} runs/s)")
+    summary = agg.rows()
+    for r in summary:
+        print(f"  {r['profile']:>12}: win_rate={r['win_rate']:.3f} avg_price={r['avg_winning_price_usd']} avg_savings={r['avg_savings_usd']}")
+    if args.summary:
+        w = RowWriter(args.summary, list(summary[0]))
+        for r in summary:
+            w.write(r)
+        w.close()
+
+if __name__ == "__main__":
+    main()
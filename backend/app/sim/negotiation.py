@@ -1,10 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import random
+import time
 
 from ..core.models import Bid, Task
-from ..core.scoring import score_bid
+from ..core.scoring import score_bids
+from .bidbook import BidBook
 
 @dataclass
 class CounterOffer:
@@ -12,74 +14,151 @@ class CounterOffer:
     target_price_usd: float
     target_eta_days: int
 
+def _counter_target(freelancer_id: str, price: float, eta: int, budget_usd: float, rng: random.Random) -> CounterOffer:
+    # Simple deterministic-ish improvement request:
+    # Ask expensive bids to move closer to budget, and very slow bids to shave ETA.
+    price_target = min(price, budget_usd * (0.92 + 0.03 * rng.random()))
+    eta_target = eta
+    if eta > 5:
+        eta_target = max(2, eta - 1)
+
+    return CounterOffer(
+        freelancer_id=freelancer_id,
+        target_price_usd=float(round(price_target, 2)),
+        target_eta_days=int(eta_target),
+    )
+
 def propose_counteroffers(
     task: Task,
     bids: List[Bid],
     weights: Dict[str, float],
     rng: random.Random,
+    *,
+    order: Optional[Sequence[int]] = None,
 ) -> Tuple[str, List[CounterOffer]]:
-    # Compute current best score
-    max_eta = max(b.eta_days for b in bids) if bids else 1
-    scored = []
-    for b in bids:
-        sb = score_bid(b, task.budget_usd, max_eta, weights)
-        scored.append((b, sb.total))
-    scored.sort(key=lambda x: x[1], reverse=True)
-    leader = scored[0][0].freelancer_id
+    # Compute current best score (callers that already ranked the book pass `order`)
+    if order is None:
+        order = score_bids(bids, task.budget_usd, weights).ranking()
+    scored = [bids[i] for i in order]
+    leader = scored[0].freelancer_id
 
     offers: List[CounterOffer] = []
-    for b, _ in scored:
-        # Simple deterministic-ish improvement request:
-        # Ask expensive bids to move closer to budget, and very slow bids to shave ETA.
-        price_target = min(b.price_usd, task.budget_usd * (0.92 + 0.03 * rng.random()))
-        eta_target = b.eta_days
-        if b.eta_days > 5:
-            eta_target = max(2, b.eta_days - 1)
-
-        offers.append(CounterOffer(
-            freelancer_id=b.freelancer_id,
-            target_price_usd=float(round(price_target, 2)),
-            target_eta_days=int(eta_target),
-        ))
+    for b in scored:
+        offers.append(_counter_target(b.freelancer_id, b.price_usd, b.eta_days, task.budget_usd, rng))
 
     return leader, offers
 
-def apply_counteroffer(
-    bid: Bid,
-    offer: CounterOffer,
+def propose_book_counteroffers(
+    task: Task,
+    book: BidBook,
+    order: Sequence[int],
     rng: random.Random,
-) -> Bid:
+) -> Tuple[str, List[CounterOffer]]:
+    # BidBook version of propose_counteroffers; consumes `rng` identically.
+    offers = [
+        _counter_target(book.ids[i], book.price_usd[i], book.eta_days[i], task.budget_usd, rng)
+        for i in order
+    ]
+    return book.ids[order[0]], offers
+
+def _respond(price: float, eta: int, conf: float, offer: CounterOffer, rng: random.Random) -> Tuple[float, int, float]:
     # Each freelancer responds with limited flexibility:
     # - may partially accept price reduction
     # - may reduce ETA if not already tight
-    new_price = bid.price_usd
-    new_eta = bid.eta_days
+    new_price = price
+    new_eta = eta
 
     # price move: accept 60%–100% of requested improvement
-    if offer.target_price_usd < bid.price_usd:
+    if offer.target_price_usd < price:
         alpha = 0.6 + 0.4 * rng.random()
-        new_price = bid.price_usd - alpha * (bid.price_usd - offer.target_price_usd)
+        new_price = price - alpha * (price - offer.target_price_usd)
 
     # eta move: accept 0 or 1 day improvement if possible
-    if offer.target_eta_days < bid.eta_days:
+    if offer.target_eta_days < eta:
         if rng.random() > 0.35:
-            new_eta = bid.eta_days - 1
+            new_eta = eta - 1
 
     # Confidence: if ETA gets tighter or price drops a lot, reduce confidence slightly
-    conf = bid.confidence
-    if new_eta < bid.eta_days:
-        conf -= 0.02
-    if new_price < bid.price_usd * 0.9:
-        conf -= 0.03
+    new_conf = conf
+    if new_eta < eta:
+        new_conf -= 0.02
+    if new_price < price * 0.9:
+        new_conf -= 0.03
+
+    return (
+        float(round(new_price, 2)),
+        int(new_eta),
+        max(0.3, min(0.95, float(round(new_conf, 3)))),
+    )
+
+def apply_counteroffer(
+    bid: Bid,
+    offer: CounterOffer,
+    rng: random.Random,
+) -> Bid:
+    price, eta, conf = _respond(bid.price_usd, bid.eta_days, bid.confidence, offer, rng)
 
     # Risk flags: if schedule tightens, add a flag (demo realism)
     risk = list(bid.risk_flags)
-    if new_eta <= 3 and "tight_schedule" not in risk:
+    if eta <= 3 and "tight_schedule" not in risk:
         risk.append("tight_schedule")
 
     return bid.model_copy(update={
-        "price_usd": float(round(new_price, 2)),
-        "eta_days": int(new_eta),
-        "confidence": max(0.3, min(0.95, float(round(conf, 3)))),
+        "price_usd": price,
+        "eta_days": eta,
+        "confidence": conf,
         "risk_flags": risk,
     })
+
+def apply_book_counteroffers(
+    book: BidBook,
+    offers: Sequence[CounterOffer],
+    rng: random.Random,
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    # In-place apply_counteroffer over the whole book, in book order (same rng draws).
+    # Returns (before, after) row dicts for the ledger.
+    offer_by_id = {o.freelancer_id: o for o in offers}
+    fs = book.flagsets
+    changes = []
+    for i, fid in enumerate(book.ids):
+        before = book.row(i)
+        price, eta, conf = _respond(book.price_usd[i], book.eta_days[i], book.confidence[i], offer_by_id[fid], rng)
+        flags = fs.with_flag(book.flags[i], "tight_schedule") if eta <= 3 else book.flags[i]
+        book.set_terms(i, price, eta, conf, flags)
+        changes.append((before, book.row(i)))
+    return changes
+
+
+@dataclass(frozen=True)
+class StopRule:
+    # Adaptive negotiation: stop once the top-k ids are unchanged and no price moved by more
+    # than price_eps_usd for `patience` consecutive rounds; never run past max_rounds or
+    # (when set) budget_s of wall time.
+    top_k: int = 3
+    price_eps_usd: float = 0.5
+    patience: int = 2
+    max_rounds: int = 50
+    budget_s: Optional[float] = None
+
+class Convergence:
+    def __init__(self, rule: StopRule, top_ids: Sequence[str]):
+        self.rule = rule
+        self.top_ids = list(top_ids)
+        self.stable_rounds = 0
+        self.max_price_delta = 0.0
+        self.started = time.monotonic()
+
+    def update(self, top_ids: Sequence[str], changes: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]) -> Optional[str]:
+        # Call after each round with its (before, after) rows; returns a stop reason or None.
+        self.max_price_delta = max((abs(a["price_usd"] - b["price_usd"]) for b, a in changes), default=0.0)
+        top_ids = list(top_ids)
+        if top_ids == self.top_ids and self.max_price_delta < self.rule.price_eps_usd:
+            self.stable_rounds += 1
+        else:
+            self.stable_rounds = 0
+        self.top_ids = top_ids
+        if self.stable_rounds >= self.rule.patience:
+            return "converged"
+        if self.rule.budget_s is not None and time.monotonic() - self.started >= self.rule.budget_s:
+            return "time_budget"
+        return None
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import heapq
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.metrics import timed
+from ..core.models import Bid, ScoreBreakdown
+from ..core.scoring import BidArrays, score_bids
+from .bidbook import BidBook
+
+class RoundRanking:
+    # Scores a bid book across negotiation rounds. Terms are kept per row and only
+    # rows whose score-relevant fields changed are rescored; the ETA term is redone
+    # for everyone only when the book's max ETA moves. Values stay bit-identical to
+    # a fresh score_bids() pass because the per-element arithmetic is the same.
+    def __init__(self, budget_usd: float, weights: Dict[str, float]):
+        self.budget_usd = budget_usd
+        self.weights = weights
+        self.ids: List[str] = []
+        self._cols: Optional[BidArrays] = None
+        self._eta_counts: Counter = Counter()
+        self.max_eta = 1
+        self.price_term = self.eta_term = self.quality_term = self.risk_term = self.total = np.empty(0)
+        self._order: Optional[List[int]] = None
+        self.rescored = 0  # rows rescored so far, for instrumentation
+
+    @timed("scoring.rank")
+    def update(self, bids: Union[Sequence[Bid], BidBook]) -> None:
+        if isinstance(bids, BidBook):
+            cols, ids = bids.arrays(), list(bids.ids)
+        else:
+            cols, ids = BidArrays.from_bids(bids), [b.freelancer_id for b in bids]
+        prev = self._cols
+        if prev is None or len(prev.price_usd) != len(cols.price_usd):
+            changed = np.arange(len(bids))
+            self._eta_counts = Counter(cols.eta_days.tolist())
+            self.price_term, self.quality_term, self.risk_term = (np.empty(len(bids)) for _ in range(3))
+            self.eta_term = np.empty(len(bids))
+            max_eta_moved = True
+        else:
+            mask = np.zeros(len(bids), dtype=bool)
+            for old, new in zip(prev, cols):
+                mask |= old != new
+            changed = np.flatnonzero(mask)
+            eta_moved = changed[prev.eta_days[changed] != cols.eta_days[changed]]
+            for old, new in zip(prev.eta_days[eta_moved].tolist(), cols.eta_days[eta_moved].tolist()):
+                self._eta_counts[old] -= 1
+                if not self._eta_counts[old]:
+                    del self._eta_counts[old]
+                self._eta_counts[new] += 1
+            max_eta_moved = (max(self._eta_counts) if self._eta_counts else 1) != self.max_eta
+        self.max_eta = max(self._eta_counts) if self._eta_counts else 1
+
+        if len(changed):
+            sub = BidArrays(*(c[changed] for c in cols))
+            batch = score_bids(sub, self.budget_usd, self.weights, self.max_eta)
+            self.price_term[changed] = batch.price_term
+            self.quality_term[changed] = batch.quality_term
+            self.risk_term[changed] = batch.risk_term
+            self.eta_term[changed] = batch.eta_term
+            self.rescored += len(changed)
+        if max_eta_moved:
+            self.eta_term = score_bids(cols, self.budget_usd, self.weights, self.max_eta).eta_term
+
+        self.total = self.price_term + self.eta_term + self.quality_term + self.risk_term
+        self.ids = ids
+        self._cols = cols
+        self._order = None
+
+    def breakdown(self, i: int) -> ScoreBreakdown:
+        return ScoreBreakdown(
+            price_term=float(self.price_term[i]),
+            eta_term=float(self.eta_term[i]),
+            quality_term=float(self.quality_term[i]),
+            risk_term=float(self.risk_term[i]),
+            total=float(self.total[i]),
+        )
+
+    def breakdowns(self) -> Dict[str, ScoreBreakdown]:
+        return {fid: self.breakdown(i) for i, fid in enumerate(self.ids)}
+
+    def order(self) -> List[int]:
+        # Descending by total; ties keep book order (same as list.sort(reverse=True)).
+        if self._order is None:
+            self._order = np.argsort(-self.total, kind="stable").tolist()
+        return self._order
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        if self._order is not None:
+            idx = self._order[:k]
+        else:
+            totals = self.total.tolist()
+            idx = heapq.nlargest(k, range(len(totals)), key=totals.__getitem__)
+        return [(self.ids[i], float(self.total[i])) for i in idx]
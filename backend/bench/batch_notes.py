@@ -0,0 +1,54 @@
+from __future__ import annotations
+# Per-bid vs. single batched note generation against the stub Ollama server.
+#   python -m bench.batch_notes --bidders 20 --latency-ms 200 --ms-per-token 2
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+from app.agents.freelancer import FreelancerProfile, collect_bids
+from app.core.models import Task
+from app.llm.batch import BatchNoteGenerator
+from app.llm.ollama import OllamaLLM
+from bench.bid_fanout import wait_ready
+
+async def main(args) -> None:
+    proc = subprocess.Popen([
+        sys.executable, "-m", "bench.stub_ollama", "--port", str(args.port),
+        "--latency-ms", str(args.latency_ms), "--ms-per-token", str(args.ms_per_token),
+    ])
+    try:
+        base = f"http://127.0.0.1:{args.port}/api"
+        await wait_ready(f"{base}/tags")
+        task = Task(
+            title="Implement a FastAPI endpoint + unit tests",
+            acceptance_criteria=[
+                "POST /tasks creates a task", "POST /tasks/{id}/run selects winner",
+                "Return a JSON decision report", "Include basic unit tests",
+            ],
+            budget_usd=250,
+        )
+        pool = [FreelancerProfile(f"f{i}", 0.5 + (i % 5) / 10, 2 + i % 4, 100 + 5 * i, []) for i in range(args.bidders)]
+
+        for label, batched in (("per-bid", False), ("batched", True)):
+            llm = OllamaLLM(model="stub", base_url=base, max_connections=args.concurrency)
+            batcher = BatchNoteGenerator(llm, json_format=True) if batched else None
+            t0 = time.perf_counter()
+            bids = await collect_bids(task, pool, llm=llm, concurrency=args.concurrency, batcher=batcher)
+            dt = time.perf_counter() - t0
+            await llm.aclose()
+            assert all(b.notes for b in bids)
+            print(f"{label:>8}: {dt * 1000:8.1f} ms, prompt tokens {llm.prompt_tokens:6d}, output tokens {llm.eval_tokens:5d}")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=11502)
+    ap.add_argument("--bidders", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--latency-ms", type=float, default=200.0)
+    ap.add_argument("--ms-per-token", type=float, default=2.0)
+    asyncio.run(main(ap.parse_args()))
@@ -0,0 +1,58 @@
+from __future__ import annotations
+# Sequential vs. concurrent bid collection against the stub Ollama server.
+#   python -m bench.bid_fanout --latency-ms 300 --bidders 20
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.agents.freelancer import FreelancerProfile, collect_bids
+from app.core.models import Task
+from app.llm.ollama import OllamaLLM
+
+async def wait_ready(url: str) -> None:
+    async with httpx.AsyncClient() as c:
+        for _ in range(100):
+            try:
+                await c.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"stub server not reachable at {url}")
+
+async def main(args) -> None:
+    proc = subprocess.Popen([
+        sys.executable, "-m", "bench.stub_ollama",
+        "--port", str(args.port), "--latency-ms", str(args.latency_ms),
+    ])
+    try:
+        base = f"http://127.0.0.1:{args.port}/api"
+        await wait_ready(f"{base}/tags")
+
+        task = Task(title="Benchmark task", acceptance_criteria=["a", "b", "c"], budget_usd=250)
+        pool = [FreelancerProfile(f"f{i}", 0.5 + (i % 5) / 10, 2 + i % 4, 100 + 5 * i, []) for i in range(args.bidders)]
+
+        llm = OllamaLLM(model="stub", base_url=base, max_connections=args.concurrency)
+        try:
+            for label, conc in (("sequential", 1), (f"concurrent({args.concurrency})", args.concurrency)):
+                t0 = time.perf_counter()
+                bids = await collect_bids(task, pool, llm=llm, concurrency=conc)
+                dt = time.perf_counter() - t0
+                assert [b.freelancer_id for b in bids] == [p.freelancer_id for p in pool]
+                print(f"{label:>16}: {dt * 1000:8.1f} ms for {len(bids)} bids")
+        finally:
+            await llm.aclose()
+    finally:
+        proc.terminate()
+        proc.wait()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=11500)
+    ap.add_argument("--latency-ms", type=float, default=300.0)
+    ap.add_argument("--bidders", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main(ap.parse_args()))
@@ -0,0 +1,97 @@
+from __future__ import annotations
+# Negotiation rounds on pydantic Bid copies vs. the columnar BidBook.
+#   python -m bench.bidbook --bidders 20000 --rounds 3
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from app.core.models import Bid, Task
+from app.sim.bidbook import BidBook
+from app.sim.negotiation import (
+    apply_book_counteroffers, apply_counteroffer, propose_book_counteroffers, propose_counteroffers,
+)
+from app.sim.ranking import RoundRanking
+
+W = {"price": 0.9, "eta": 0.35, "quality": 1.2, "risk": 1.1}
+
+def make_bids(n: int):
+    rng = random.Random(0)
+    flags = [[], [], ["tight_schedule"], ["low_test_coverage", "copy_paste_history"]]
+    return [
+        Bid(freelancer_id=f"f{i}", price_usd=round(rng.uniform(80, 300), 2), eta_days=rng.randint(2, 9),
+            confidence=round(rng.uniform(0.4, 0.95), 3), portfolio_score=round(rng.random(), 3),
+            risk_flags=list(rng.choice(flags)))
+        for i in range(n)
+    ]
+
+def models_path(task, bids, rounds):
+    rng = random.Random(1)
+    payloads = []
+    ranking = RoundRanking(task.budget_usd, W)
+    for _ in range(rounds):
+        ranking.update(bids)
+        _, offers = propose_counteroffers(task, bids, W, rng, order=ranking.order())
+        by_id = {o.freelancer_id: o for o in offers}
+        new = []
+        for b in bids:
+            u = apply_counteroffer(b, by_id[b.freelancer_id], rng)
+            payloads.append({"before": b.model_dump(), "after": u.model_dump()})
+            new.append(u)
+        bids = new
+    return bids, payloads
+
+def book_path(task, bids, rounds):
+    rng = random.Random(1)
+    payloads = []
+    book = BidBook.from_bids(bids)
+    ranking = RoundRanking(task.budget_usd, W)
+    for _ in range(rounds):
+        ranking.update(book)
+        _, offers = propose_book_counteroffers(task, book, ranking.order(), rng)
+        for before, after in apply_book_counteroffers(book, offers, rng):
+            payloads.append({"before": before, "after": after})
+    return book.to_bids(), payloads
+
+def measure(fn, *args):
+    # Best of 3 untraced runs, then one traced run for peak allocation.
+    dt = float("inf")
+    for _ in range(3):
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn(*args)
+        dt = min(dt, time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, dt, peak
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bidders", type=int, default=20_000)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    task = Task(title="bench", acceptance_criteria=["a", "b"], budget_usd=250)
+    bids = make_bids(args.bidders)
+    (m_bids, m_pay), m_dt, m_peak = measure(models_path, task, bids, args.rounds)
+    (b_bids, b_pay), b_dt, b_peak = measure(book_path, task, bids, args.rounds)
+    assert [b.model_dump() for b in m_bids] == [b.model_dump() for b in b_bids]
+    assert m_pay == b_pay
+    print(f"{args.bidders:,} bidders x {args.rounds} rounds (incl. ledger payload dicts)")
+    print(f"  model_copy path: {m_dt * 1000:8.1f} ms, peak {m_peak / 1e6:7.1f} MB")
+    print(f"  BidBook path:    {b_dt * 1000:8.1f} ms, peak {b_peak / 1e6:7.1f} MB")
+
+    # Steady-state footprint of the book itself vs. a list of Bid models.
+    tracemalloc.start()
+    models = [b.model_copy() for b in bids]
+    m_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    book = BidBook.from_bids(bids)
+    k_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  resident: list[Bid] {m_size / 1e6:.1f} MB vs BidBook {k_size / 1e6:.1f} MB")
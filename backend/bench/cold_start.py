@@ -0,0 +1,63 @@
+# Cold start: module import time and first-request latency through the Lambda handler,
+# each measured in a fresh interpreter. "eager" sets PREWARM=1, which imports everything
+# up front like app.main did before imports were deferred.
+#   cd backend && python -m bench.cold_start --runs 5
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+from app.lambda_handler import handler
+t1 = time.perf_counter()
+def ev(method, path, body=None):
+    return {"version": "2.0", "rawPath": path, "rawQueryString": "", "headers": {"content-type": "application/json"},
+            "requestContext": {"http": {"method": method}}, "body": json.dumps(body) if body else None}
+assert handler(ev("GET", "/health"))["statusCode"] == 200
+t2 = time.perf_counter()
+r = handler(ev("POST", "/run-ui", {"title": "t", "acceptance_criteria": ["a", "b"], "budget_usd": 250, "use_llm": False}))
+assert r["statusCode"] == 200, r
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "health": t2 - t1, "run_ui": t3 - t2}))
+"""
+
+def importtime_us(env) -> int:
+    # Cumulative microseconds of app.lambda_handler from `python -X importtime`.
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.lambda_handler"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    for line in res.stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \| app\.lambda_handler$", line)
+        if m:
+            return int(m.group(1))
+    raise RuntimeError("app.lambda_handler not in importtime output")
+
+def probe(env):
+    res = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True)
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    base = {**os.environ, "USE_LLM": "0", "PYTHONDONTWRITEBYTECODE": "0"}
+    base.pop("PREWARM", None)
+    for mode, extra in (("lazy", {}), ("eager", {"PREWARM": "1"})):
+        env = {**base, **extra}
+        probe(env)  # compile .pyc once so every measured run starts from the same cache state
+        imports = [importtime_us(env) / 1000 for _ in range(args.runs)]
+        runs = [probe(env) for _ in range(args.runs)]
+        med = lambda k: statistics.median(r[k] for r in runs) * 1000
+        print(f"{mode:>5}: importtime {statistics.median(imports):.0f} ms | import {med('import'):.0f} ms, "
+              f"first /health {med('health'):.0f} ms, first /run-ui {med('run_ui'):.0f} ms "
+              f"(median of {args.runs})")
+
+if __name__ == "__main__":
+    main()
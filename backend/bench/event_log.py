@@ -0,0 +1,69 @@
+# Ledger events kept as Event models (the previous Ledger) vs the compact EventLog:
+# retained memory after a run, and time to produce the `events` array for to_ui.
+#   cd backend && python -m bench.event_log --freelancers 200 --rounds 20
+import argparse
+import asyncio
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.core import ledger as ledger_mod
+from app.core.models import Event
+from app.sim import demo
+from app.sim.market import synthetic_pool, synthetic_task
+
+class ModelLedger:
+    # The ledger as it was: one validated Event model per add().
+    def __init__(self, run_id=None, *, store=None):
+        self.run_id = run_id or str(uuid4())
+        self._seq = 0
+        self.events = []
+        self.store = store
+
+    def add(self, type, summary, *, round=0, data=None):
+        self._seq += 1
+        ev = Event(
+            run_id=self.run_id, seq=self._seq, type=type, ts=datetime.now(timezone.utc).isoformat(),
+            round=round, summary=summary, data=data or {},
+        )
+        self.events.append(ev)
+        return ev
+
+def measure(ledger_cls, task, pool, rounds):
+    demo.Ledger = ledger_cls
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    report = asyncio.run(demo.run_demo(task=task, freelancers=pool, rounds=rounds))
+    run_s = time.perf_counter() - t0
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    events = report.events
+    t0 = time.perf_counter()
+    rows = events.dump() if hasattr(events, "dump") else [e.model_dump() for e in events]
+    dump_s = time.perf_counter() - t0
+    return report, rows, retained, run_s, dump_s
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--freelancers", type=int, default=200)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+    task, pool = synthetic_task(0, 3), synthetic_pool(0, 0, args.freelancers)
+
+    old = measure(ModelLedger, task, pool, args.rounds)
+    new = measure(ledger_mod.Ledger, task, pool, args.rounds)
+    strip = lambda rows: [{**r, "run_id": None, "ts": None} for r in rows]
+    assert json.dumps(strip(old[1])) == json.dumps(strip(new[1])), "expanded events differ"
+    n = len(new[1])
+    print(f"{n:,} events ({args.freelancers} bidders x {args.rounds} rounds)")
+    for label, (_, _, retained, run_s, dump_s) in (("Event models", old), ("EventLog", new)):
+        print(f"{label:>13}: retained after run {retained / 2**20:7.1f} MiB | run {run_s * 1000:6.0f} ms | "
+              f"events array for to_ui {dump_s * 1000:6.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# DynamoDB ledger writes: one synchronous PutItem per event (what writing from
+# Ledger.add would cost) vs DynamoLedgerStore's queued 25-item BatchWriteItem batches.
+# Runs against the in-process stand-in with a simulated round trip, or against DynamoDB
+# Local / AWS with --endpoint (needs boto3).
+#   cd backend && python -m bench.ledger_dynamo --events 20000 --latency-ms 5 --unprocessed 0.05
+#   cd backend && python -m bench.ledger_dynamo --endpoint http://localhost:8000
+import argparse
+import time
+from uuid import uuid4
+
+from app.core.dynamo_local import LocalDynamoDB
+from app.core.ledger import Ledger
+from app.core.ledger_dynamo import DynamoLedgerStore, dynamodb_client, ensure_table, to_item
+
+PAYLOAD = {"before": {"freelancer_id": "steady_mid", "price_usd": 150.0, "eta_days": 5},
+           "after": {"freelancer_id": "steady_mid", "price_usd": 140.0, "eta_days": 5}}
+
+class PutItemStore:
+    # The per-event baseline: each append is one blocking PutItem.
+    def __init__(self, client, table):
+        self.client, self.table = client, table
+
+    def append(self, event):
+        self.client.put_item(TableName=self.table, Item=to_item(event))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+def run(label, store, events, runs):
+    ledgers = [Ledger(run_id=str(uuid4()), store=store) for _ in range(runs)]
+    t0 = time.perf_counter()
+    for i in range(events):
+        ledgers[i % runs].add("COUNTEROFFER_RESPONSE", "steady_mid responded", round=i % 10, data=PAYLOAD)
+    path_s = time.perf_counter() - t0
+    store.flush()
+    total_s = time.perf_counter() - t0
+    print(f"{label:>30}: request path {path_s / events * 1e6:8.1f} us/event | "
+          f"{events / total_s:10,.0f} events/s until durable")
+    return store
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=20_000)
+    ap.add_argument("--runs", type=int, default=50, help="ledgers (partition keys) written concurrently")
+    ap.add_argument("--latency-ms", type=float, default=5.0, help="simulated round trip (stand-in only)")
+    ap.add_argument("--unprocessed", type=float, default=0.05, help="throttled item fraction (stand-in only)")
+    ap.add_argument("--endpoint", help="DynamoDB endpoint, e.g. http://localhost:8000; default: stand-in")
+    ap.add_argument("--table", default="bench-ledger")
+    args = ap.parse_args()
+
+    if args.endpoint:
+        client = dynamodb_client(args.endpoint, max_connections=16)
+    else:
+        client = LocalDynamoDB(latency_s=args.latency_ms / 1000, unprocessed_rate=args.unprocessed)
+    ensure_table(client, args.table)
+
+    per_event = min(args.events, 2_000)  # one round trip each; keep the baseline short
+    run("PutItem per event", PutItemStore(client, args.table), per_event, args.runs)
+    for writers in (1, 4, 8):
+        store = run(f"BatchWriteItem x25, {writers} writer(s)",
+                    DynamoLedgerStore(client, args.table, writers=writers), args.events, args.runs)
+        store.close()
+        s = store.stats()
+        print(f"{'':>30}  {s['batches']:,} batch calls, {s['retried_items']:,} items retried, {s['errors']} errors")
+
+if __name__ == "__main__":
+    main()
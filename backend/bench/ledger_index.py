@@ -0,0 +1,67 @@
+from __future__ import annotations
+# Indexed lookup vs. full scan over a large on-disk ledger.
+#   python -m bench.ledger_index --events 2000000 --runs 20000
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.ledger_store import JsonlLedgerStore
+from app.core.models import Event
+
+TYPES = ["BID_SUBMITTED", "COUNTEROFFER_SENT", "COUNTEROFFER_RESPONSE", "ROUND_COMPLETE"]
+
+def main(args) -> None:
+    rng = random.Random(0)
+    run_ids = [f"run-{i:07d}" for i in range(args.runs)]
+    with tempfile.TemporaryDirectory() as d:
+        store = JsonlLedgerStore(d, durable=False, segment_bytes=args.segment_mb * 1024 * 1024)
+        t0 = time.perf_counter()
+        for i in range(args.events):
+            store.append(Event.model_construct(
+                run_id=run_ids[i % args.runs], seq=i // args.runs + 1, type=TYPES[i % 4],
+                ts="2026-01-01T00:00:00+00:00", round=(i // args.runs) % 3,
+                summary="x responded", data={"price_usd": 140.0, "eta_days": 5},
+            ))
+        store.close()
+        dt = time.perf_counter() - t0
+        size = sum(p.stat().st_size for p in Path(d).glob("*.jsonl"))
+        idx_size = sum(p.stat().st_size for p in Path(d).glob("*.idx"))
+        print(f"wrote {args.events:,} events in {dt:.1f}s ({args.events / dt:,.0f}/s); "
+              f"log {size / 1e6:.1f} MB, index {idx_size / 1e6:.1f} MB")
+
+        # Cold open: sidecars are loaded, not rebuilt.
+        t0 = time.perf_counter()
+        store = JsonlLedgerStore(d, durable=False)
+        store.query(run_ids[0], "COUNTEROFFER_RESPONSE", 1)
+        print(f"open + first query (cold): {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+        samples = [rng.choice(run_ids) for _ in range(args.queries)]
+        t0 = time.perf_counter()
+        hits = sum(len(store.query(r, "COUNTEROFFER_RESPONSE", 1)) for r in samples)
+        dt = time.perf_counter() - t0
+        print(f"indexed query: {dt / args.queries * 1e3:.3f} ms/query ({hits} hits over {args.queries} queries)")
+
+        t0 = time.perf_counter()
+        n = sum(1 for e in store.iter_events(samples[0]) if e.type == "COUNTEROFFER_RESPONSE" and e.round == 1)
+        print(f"full scan query: {(time.perf_counter() - t0) * 1e3:.1f} ms/query ({n} hits)")
+        store.close()
+
+        # Rebuild from the raw log when sidecars are missing.
+        for p in Path(d).glob("*.idx"):
+            os.remove(p)
+        t0 = time.perf_counter()
+        store = JsonlLedgerStore(d, durable=False)
+        store.query(run_ids[0])
+        print(f"index rebuild from raw log: {time.perf_counter() - t0:.1f}s")
+        store.close()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=1_000_000)
+    ap.add_argument("--runs", type=int, default=10_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--segment-mb", type=int, default=64)
+    main(ap.parse_args())
@@ -0,0 +1,45 @@
+from __future__ import annotations
+# Events/sec for the JSONL ledger store with durability on and off.
+#   python -m bench.ledger_throughput --events 200000
+import argparse
+import tempfile
+import time
+
+from app.core.ledger import Ledger
+from app.core.ledger_store import JsonlLedgerStore
+
+def run(n: int, **store_kw) -> float:
+    with tempfile.TemporaryDirectory() as d:
+        store = JsonlLedgerStore(d, **store_kw)
+        ledger = Ledger(store=store)
+        payload = {"freelancer_id": "steady_mid", "price_usd": 140.0, "eta_days": 5, "confidence": 0.88}
+        t0 = time.perf_counter()
+        for i in range(n):
+            ledger.add("COUNTEROFFER_RESPONSE", "steady_mid responded", round=i % 4, data=payload)
+        store.close()
+        dt = time.perf_counter() - t0
+        assert len(store.replay(ledger.run_id)) == n
+        return n / dt
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=100_000)
+    args = ap.parse_args()
+
+    cases = [
+        ("in-memory only", None),
+        ("durable=False", dict(durable=False)),
+        ("durable, group commit 50ms", dict(durable=True, fsync_interval_s=0.05)),
+        ("durable, fsync per event", dict(durable=True, fsync_batch=1, background=False)),
+    ]
+    for label, kw in cases:
+        n = args.events if kw is None or kw.get("fsync_batch") != 1 else min(args.events, 5_000)
+        if kw is None:
+            ledger = Ledger()
+            t0 = time.perf_counter()
+            for i in range(n):
+                ledger.add("COUNTEROFFER_RESPONSE", "steady_mid responded", round=i % 4, data={"x": i})
+            rate = n / (time.perf_counter() - t0)
+        else:
+            rate = run(n, **kw)
+        print(f"{label:>28}: {rate:12,.0f} events/s  ({n:,} events)")
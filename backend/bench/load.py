@@ -0,0 +1,155 @@
+# HTTP load test: starts the stub Ollama server (bench.stub_ollama) and the API under
+# uvicorn, then drives /run-ui and /demo/run-ui with a closed loop of concurrent clients
+# and reports p50/p95/p99 latency and req/s per endpoint. Every request is a distinct
+# task (or seed), and the result and note caches are off, so each one runs an auction
+# with real LLM round trips to the stub.
+#   cd backend && python -m bench.load --latency-ms 200 --concurrency 16 --duration 20
+#   cd backend && python -m bench.load --url http://127.0.0.1:8000   # an already-running API
+# --out writes bench.suite's results format, so runs compare against a baseline with
+#   python -m bench.suite compare bench/baselines/load.json /tmp/load.json
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from bench.bid_fanout import wait_ready
+from bench.suite import calibration_ms, environment, save
+
+ENDPOINTS = ("run-ui", "demo-run-ui")
+
+def request_for(endpoint: str, i: int, rounds: int) -> Tuple[str, str, Dict[str, Any]]:
+    if endpoint == "run-ui":
+        return "POST", "/run-ui", {"json": {
+            "title": f"Load test task #{i}",
+            "acceptance_criteria": ["POST /tasks creates a task", "Include basic unit tests"],
+            "budget_usd": 250,
+            "use_llm": True,
+        }}
+    return "GET", "/demo/run-ui", {"params": {"seed": i, "rounds": rounds, "adaptive": "false"}}
+
+def percentile(sorted_ms: List[float], q: float) -> float:
+    if not sorted_ms:
+        return float("nan")
+    k = (len(sorted_ms) - 1) * q / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_ms) - 1)
+    return sorted_ms[lo] + (sorted_ms[hi] - sorted_ms[lo]) * (k - lo)
+
+async def drive(
+    client: httpx.AsyncClient, make: Callable[[int], Tuple[str, str, Dict[str, Any]]], *,
+    concurrency: int, duration_s: float, max_requests: int,
+) -> Tuple[List[float], int, float]:
+    # Closed loop: each worker sends its next request as soon as the previous one finishes.
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration_s
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            if max_requests and i >= max_requests:
+                return
+            method, url, kw = make(i)
+            t0 = time.perf_counter()
+            try:
+                r = await client.request(method, url, **kw)
+                ok = r.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append((time.perf_counter() - t0) * 1000)
+            else:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - t0
+
+def spawn(args) -> List[subprocess.Popen]:
+    stub = subprocess.Popen([
+        sys.executable, "-m", "bench.stub_ollama", "--port", str(args.stub_port), "--latency-ms", str(args.latency_ms),
+    ])
+    env = {
+        **os.environ,
+        "USE_LLM": "1",
+        "OLLAMA_BASE_URL": f"http://127.0.0.1:{args.stub_port}/api",
+        "OLLAMA_MODEL": "stub",
+        "RESULT_CACHE_TTL_S": "0",
+        "LLM_CACHE_SIZE": "0",
+    }
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    return [stub, api]
+
+async def run(args) -> Dict[str, Any]:
+    procs = [] if args.url else spawn(args)
+    base = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        if procs:
+            await wait_ready(f"http://127.0.0.1:{args.stub_port}/api/tags")
+        await wait_ready(f"{base}/health")
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        results: Dict[str, Any] = {}
+        seed = itertools.count(10_000)
+        async with httpx.AsyncClient(base_url=base, limits=limits, timeout=args.timeout) as client:
+            for endpoint in args.endpoints.split(","):
+                endpoint = endpoint.strip()
+                if endpoint not in ENDPOINTS:
+                    raise SystemExit(f"unknown endpoint {endpoint!r}; choose from {', '.join(ENDPOINTS)}")
+                make = lambda _: request_for(endpoint, next(seed), args.rounds)
+                if args.warmup:
+                    await drive(client, make, concurrency=args.concurrency, duration_s=60, max_requests=args.warmup)
+                latencies, errors, elapsed = await drive(
+                    client, make, concurrency=args.concurrency, duration_s=args.duration, max_requests=args.requests,
+                )
+                ms = sorted(latencies)
+                rps = len(ms) / elapsed if elapsed else 0.0
+                print(f"{endpoint:>12}: {len(ms):5d} ok, {errors} errors in {elapsed:5.1f} s | {rps:7.1f} req/s | "
+                      f"p50 {percentile(ms, 50):7.1f}  p95 {percentile(ms, 95):7.1f}  p99 {percentile(ms, 99):7.1f}  "
+                      f"max {ms[-1] if ms else float('nan'):7.1f} ms")
+                name = f"load {endpoint}[c={args.concurrency},llm={args.latency_ms:g}ms]"
+                for q in (50, 95, 99):
+                    results[f"{name} p{q}"] = {"value": round(percentile(ms, q), 3), "unit": "ms", "better": "lower"}
+                results[f"{name} req/s"] = {"value": round(rps, 3), "unit": "req/s", "better": "higher"}
+                results[f"{name} errors"] = {"value": errors, "unit": "count", "better": "lower"}
+        return results
+    finally:
+        for p in procs:
+            p.terminate()
+            p.wait()
+
+def main() -> None:
+    ap = argparse.ArgumentParser(prog="python -m bench.load")
+    ap.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--duration", type=float, default=20.0, help="seconds per endpoint")
+    ap.add_argument("--requests", type=int, default=0, help="stop after this many per endpoint (0 = duration only)")
+    ap.add_argument("--warmup", type=int, default=20, help="untimed requests per endpoint first (0 = none)")
+    ap.add_argument("--rounds", type=int, default=2, help="negotiation rounds for /demo/run-ui")
+    ap.add_argument("--latency-ms", type=float, default=200.0, help="stub Ollama latency per call")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--stub-port", type=int, default=11500)
+    ap.add_argument("--url", help="target this API instead of starting one (and the stub)")
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--out", type=Path, help="write results JSON (bench.suite format)")
+    args = ap.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.out:
+        meta = {**environment(), "profile": "load", "calibration_ms": calibration_ms(),
+                "concurrency": args.concurrency, "latency_ms": args.latency_ms}
+        save({"meta": meta, "results": results}, args.out)
+
+if __name__ == "__main__":
+    main()
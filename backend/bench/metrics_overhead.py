@@ -0,0 +1,40 @@
+# Cost of the stage spans: per-call micro numbers and a large-pool demo run, on vs. off.
+#   cd backend && python -m bench.metrics_overhead --pool 5000
+import argparse
+import asyncio
+import gc
+import time
+import timeit
+
+from app.core import metrics
+from app.sim.demo import run_demo
+from app.sim.market import synthetic_pool, synthetic_task
+
+def per_call_ns(stmt: str, n: int = 200_000) -> float:
+    return min(timeit.repeat(stmt, globals={"span": metrics.span}, number=n, repeat=5)) / n * 1e9
+
+def demo_s(pool, task, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        gc.collect()
+        t0 = time.perf_counter()
+        asyncio.run(run_demo(task=task, freelancers=pool, rounds=3))
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pool", type=int, default=5000)
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    pool, task = synthetic_pool(0, 0, args.pool), synthetic_task(0, 0)
+    for on in (False, True):
+        metrics.set_enabled(on)
+        ns = per_call_ns("with span('x'):\n    pass")
+        with metrics.collect():
+            secs = demo_s(pool, task, args.runs)
+        print(f"metrics {'on ' if on else 'off'}: span {ns:.0f} ns/call; demo with {args.pool} bidders x 3 rounds {secs * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
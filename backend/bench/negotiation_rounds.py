@@ -0,0 +1,38 @@
+# Fixed-round vs adaptive negotiation on a synthetic market: with StopRule the run pays
+# for the rounds it needs to converge, not the rounds it was asked for.
+#   cd backend && python -m bench.negotiation_rounds --freelancers 200 --rounds 50
+import argparse
+import asyncio
+import time
+
+from app.sim.demo import run_demo
+from app.sim.market import synthetic_pool, synthetic_task
+from app.sim.negotiation import StopRule
+
+async def one(task, pool, rounds: int, stop) -> tuple:
+    t0 = time.perf_counter()
+    report = await run_demo(task=task, freelancers=pool, rounds=rounds, stop=stop)
+    ms = (time.perf_counter() - t0) * 1000
+    stopped = next((e for e in report.events if e.type == "NEGOTIATION_STOPPED"), None)
+    ran = stopped.data["rounds_run"] if stopped else rounds
+    return ms, ran, stopped.data["reason"] if stopped else "fixed", report.winner_id
+
+async def run(args) -> None:
+    rule = StopRule(max_rounds=args.rounds)
+    for seed in range(args.seeds):
+        pool = synthetic_pool(seed, 0, args.freelancers)
+        task = synthetic_task(seed, 3)
+        f_ms, _, _, f_win = await one(task, pool, args.rounds, None)
+        a_ms, ran, reason, a_win = await one(task, pool, args.rounds, rule)
+        print(f"seed {seed}: fixed {args.rounds} rounds {f_ms:.0f} ms | adaptive {ran} rounds ({reason}) "
+              f"{a_ms:.0f} ms | same winner: {f_win == a_win}")
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--freelancers", type=int, default=200)
+    ap.add_argument("--rounds", type=int, default=50)
+    ap.add_argument("--seeds", type=int, default=5)
+    asyncio.run(run(ap.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Referee throughput: N distinct deliverables (each with a small CPU-bound test suite)
+# evaluated with 1 worker vs the worker pool, then re-evaluated from the result cache.
+#   cd backend && python -m bench.referee_pool --deliverables 16 --workers 4
+import argparse
+import asyncio
+import os
+import time
+
+from app.agents.referee import Referee
+from app.core.models import Deliverable
+
+CRITERIA = ["Parse ISO dates", "Reject invalid input with ValueError"]
+
+def deliverable(i: int) -> Deliverable:
+    code = (
+        "from datetime import date\n\n\n"
+        "def parse_iso(s):\n"
+        f"    # variant {i}\n"
+        "    y, m, d = (int(p) for p in s.split('-'))\n"
+        "    return date(y, m, d)\n"
+    )
+    tests = (
+        "import unittest\n\nfrom dates import parse_iso\n\n\n"
+        "class ParseIso(unittest.TestCase):\n"
+        "    def test_parse(self):\n"
+        "        for n in range(20000):\n"
+        "            self.assertEqual(parse_iso('2024-01-%02d' % (n % 28 + 1)).day, n % 28 + 1)\n\n"
+        "    def test_invalid(self):\n"
+        "        with self.assertRaises(ValueError):\n"
+        "            parse_iso('2024-13-01')\n"
+    )
+    return Deliverable(freelancer_id=f"fl_{i}", files={"dates.py": code, "tests/test_dates.py": tests})
+
+async def timed(referee: Referee, items) -> float:
+    t0 = time.perf_counter()
+    res = await referee.evaluate_many(items, CRITERIA)
+    assert all(r["tests_passing"] for r in res.values()), res
+    return time.perf_counter() - t0
+
+async def run(args) -> None:
+    items = [deliverable(i) for i in range(args.deliverables)]
+    serial = await timed(Referee(workers=1), items)
+    pool = Referee(workers=args.workers)
+    parallel = await timed(pool, items)
+    cached = await timed(pool, items)
+    print(f"{args.deliverables} deliverables: 1 worker {serial:.2f} s | {args.workers} workers {parallel:.2f} s "
+          f"| re-evaluated from cache {cached * 1000:.2f} ms ({pool.stats()['jobs']} subprocess jobs total)")
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--deliverables", type=int, default=16)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    asyncio.run(run(ap.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Registry shortlist vs. quoting and scoring the whole pool for every task.
+#   cd backend && python -m bench.registry_shortlist --pool 100000 --tasks 50
+import argparse
+import os
+import tempfile
+import time
+
+from app.agents.freelancer import quote_bid
+from app.agents.registry import FreelancerRegistry
+from app.core.report import pick_winner
+from app.sim.demo import DEFAULT_WEIGHTS
+from app.sim.market import synthetic_pool, synthetic_task
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pool", type=int, default=100_000)
+    ap.add_argument("--tasks", type=int, default=50)
+    ap.add_argument("--top-k", type=int, default=20)
+    ap.add_argument("--full-sample", type=int, default=5, help="tasks also run against the full pool")
+    args = ap.parse_args()
+
+    pool = synthetic_pool(0, 0, args.pool)
+    with tempfile.TemporaryDirectory() as tmp:
+        reg = FreelancerRegistry(os.path.join(tmp, "freelancers.sqlite"))
+        t0 = time.perf_counter()
+        reg.upsert(pool)
+        print(f"upsert {args.pool} profiles: {time.perf_counter() - t0:.2f}s")
+
+        tasks = [synthetic_task(1, i) for i in range(args.tasks)]
+        t0 = time.perf_counter()
+        lists = [reg.shortlist(t, DEFAULT_WEIGHTS, args.top_k) for t in tasks]
+        per = (time.perf_counter() - t0) / len(tasks)
+        scanned = sum(s.scanned for s in lists) / len(lists)
+        invited = sum(len(s.freelancers) for s in lists) / len(lists)
+        print(f"shortlist: {per * 1000:.2f} ms/task, {scanned:.0f} profiles scored, {invited:.1f} invited to bid")
+
+        n = min(args.full_sample, len(tasks))
+        t0 = time.perf_counter()
+        for t, s in zip(tasks[:n], lists):
+            full = pick_winner(t, [quote_bid(t, p) for p in pool], DEFAULT_WEIGHTS)
+            short = pick_winner(t, [quote_bid(t, p) for p in s.freelancers], DEFAULT_WEIGHTS, max_eta_days=s.max_eta_days)
+            assert full.winner_id == short.winner_id, (full.winner_id, short.winner_id)
+        print(f"full pool: {(time.perf_counter() - t0) / n * 1000:.0f} ms/task, {args.pool} bids each (same winners)")
+        reg.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# /demo/run-ui served cold, from the result cache, and as a 304 revalidation; plus a
+# burst of identical concurrent requests (single-flight). In-process ASGI, LLM off.
+#   cd backend && python -m bench.result_cache --requests 200 --burst 50
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("USE_LLM", "0")
+
+import httpx
+
+from app import main as api
+
+async def timed(c: httpx.AsyncClient, n: int, url: str, **kw) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await c.get(url, **kw)
+    return (time.perf_counter() - t0) / n * 1000
+
+async def run(args) -> None:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench") as c:
+        await c.get("/health")
+        cold = []
+        for seed in range(args.requests // 10 or 1):
+            t0 = time.perf_counter()
+            r = await c.get(f"/demo/run-ui?seed={1000 + seed}&rounds={args.rounds}")
+            cold.append((time.perf_counter() - t0) * 1000)
+        url = f"/demo/run-ui?seed=1000&rounds={args.rounds}"
+        hit = await timed(c, args.requests, url)
+        etag = (await c.get(url)).headers["etag"]
+        revalidate = await timed(c, args.requests, url, headers={"If-None-Match": etag})
+
+        before = api._results.stats()["misses"]
+        rs = await asyncio.gather(*(c.get(f"/demo/run-ui?seed=99999&rounds={args.rounds}") for _ in range(args.burst)))
+        computed = api._results.stats()["misses"] - before
+        print(f"cold {sum(cold) / len(cold):.1f} ms | cached {hit:.2f} ms | 304 {revalidate:.2f} ms "
+              f"({len(r.content)} B body); burst of {args.burst} identical -> {computed} run(s), "
+              f"{sum(x.headers['x-cache'] == 'shared' for x in rs)} shared")
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--burst", type=int, default=50)
+    ap.add_argument("--rounds", type=int, default=2)
+    asyncio.run(run(ap.parse_args()))
+
+if __name__ == "__main__":
+    main()
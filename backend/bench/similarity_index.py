@@ -0,0 +1,85 @@
+# MinHash/LSH index at scale: bulk-load N synthetic documents (random shingle sets), then
+# look up planted near-duplicates at several Jaccard levels plus unrelated documents, and
+# compare with scanning every stored signature (the pairwise approach, vectorized).
+#   cd backend && python -m bench.similarity_index --docs 1000000 --path /tmp/sim.sqlite
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.core.similarity import NUM_PERM, SimilarityIndex, minhash
+
+SHINGLES = 200
+
+def shingle_sets(rng: np.random.Generator, n: int) -> np.ndarray:
+    return rng.integers(0, 1 << 32, size=(n, SHINGLES), dtype=np.uint64)
+
+def mutate(rng: np.random.Generator, sets: np.ndarray, jaccard: float) -> np.ndarray:
+    # Replace r of s shingles so that |A&B| / |A|B| = (s - r) / (s + r) = jaccard.
+    r = round(SHINGLES * (1 - jaccard) / (1 + jaccard))
+    out = sets.copy()
+    for row in out:
+        row[rng.choice(SHINGLES, r, replace=False)] = rng.integers(0, 1 << 32, size=r, dtype=np.uint64)
+    return out
+
+def signatures(sets: np.ndarray, batch: int = 256) -> np.ndarray:
+    return np.vstack([minhash(sets[i:i + batch]) for i in range(0, len(sets), batch)])
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=1_000_000)
+    ap.add_argument("--queries", type=int, default=200, help="per similarity level")
+    ap.add_argument("--chunk", type=int, default=50_000)
+    ap.add_argument("--path", default=":memory:")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    if args.path != ":memory:" and os.path.exists(args.path):
+        os.remove(args.path)
+    index = SimilarityIndex(args.path)
+    all_sigs = np.empty((args.docs, NUM_PERM), dtype=np.uint32)
+    planted = None
+
+    t_sig = t_ins = 0.0
+    for lo in range(0, args.docs, args.chunk):
+        n = min(args.chunk, args.docs - lo)
+        sets = shingle_sets(rng, n)
+        if planted is None:
+            planted = sets[:args.queries].copy()  # originals for the near-duplicate queries
+        t0 = time.perf_counter()
+        sigs = signatures(sets)
+        t1 = time.perf_counter()
+        index.add_many([f"doc{lo + i}" for i in range(n)], [f"fl{(lo + i) % 5000}" for i in range(n)], sigs)
+        t_ins += time.perf_counter() - t1
+        t_sig += t1 - t0
+        all_sigs[lo:lo + n] = sigs
+        if (lo // args.chunk) % 5 == 4:
+            print(f"  {lo + n} indexed ({(lo + n) / t_ins:,.0f} docs/s insert)")
+    print(f"indexed {len(index):,} docs: signatures {t_sig:.1f} s, inserts {t_ins:.1f} s "
+          f"({args.docs / t_ins:,.0f} docs/s)")
+
+    for label, queries in [(f"J={j}", mutate(rng, planted, j)) for j in (0.9, 0.7, 0.5)] + [
+        ("unrelated", shingle_sets(rng, args.queries)),
+    ]:
+        qs = signatures(queries)
+        lat, found, cands = [], 0, index.candidates
+        for i, q in enumerate(qs):
+            t0 = time.perf_counter()
+            best = index.query(q, exclude_freelancer="nobody", limit=1)
+            lat.append(time.perf_counter() - t0)
+            # planted: the original is the top hit; unrelated: anything at all is a false flag
+            hit = bool(best) and best[0].similarity >= 0.5
+            found += hit and (label == "unrelated" or best[0].doc_key == f"doc{i}")
+        t0 = time.perf_counter()
+        for q in qs[:20]:
+            int(np.argmax((all_sigs == q).mean(axis=1)))
+        scan = (time.perf_counter() - t0) / 20
+        lat_ms = np.array(lat) * 1000
+        print(f"{label:>9}: LSH {lat_ms.mean():.3f} ms mean / {np.percentile(lat_ms, 99):.3f} ms p99, "
+              f"{(index.candidates - cands) / len(qs):.1f} candidates/query, flagged >=0.5 {found}/{len(qs)} | "
+              f"full scan {scan * 1000:.1f} ms/query")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+# Local stand-in for Ollama's /api/generate with configurable latency.
+#   python -m bench.stub_ollama --port 11500 --latency-ms 300 --ms-per-token 2
+# Latency = fixed per call + per prompt token (whitespace tokens), so repeated
+# prompt prefixes cost what they would on a real model. Batched note prompts
+# ("- id=..." lines) get a JSON object back, like Ollama with format="json".
+import argparse
+import asyncio
+import json
+from fastapi import FastAPI, Request
+
+def make_app(latency_ms: float = 300.0, ms_per_token: float = 0.0) -> FastAPI:
+    app = FastAPI(title="stub-ollama")
+    app.state.calls = 0
+    app.state.prompt_tokens = 0
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        prompt = body.get("prompt", "")
+        n_tokens = len(prompt.split()) + len((body.get("system") or "").split())
+        app.state.prompt_tokens += n_tokens
+        await asyncio.sleep((latency_ms + ms_per_token * n_tokens) / 1000.0)
+
+        ids = [line[len("- id="):].split()[0] for line in prompt.splitlines() if line.startswith("- id=")]
+        if ids:
+            text = json.dumps({i: f"Stub note for {i}: on time, tested, documented." for i in ids})
+        else:
+            text = f"Stub note #{app.state.calls} ({len(prompt)} prompt chars)."
+        return {
+            "model": body.get("model"),
+            "response": text,
+            "done": True,
+            "prompt_eval_count": n_tokens,
+            "eval_count": len(text.split()),
+        }
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": "stub"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return {"calls": app.state.calls, "prompt_tokens": app.state.prompt_tokens}
+
+    return app
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=11500)
+    ap.add_argument("--latency-ms", type=float, default=300.0)
+    ap.add_argument("--ms-per-token", type=float, default=0.0)
+    args = ap.parse_args()
+
+    import uvicorn
+    uvicorn.run(make_app(args.latency_ms, args.ms_per_token), host=args.host, port=args.port, log_level="warning")
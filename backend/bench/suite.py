@@ -0,0 +1,298 @@
+# Regression suite: micro-benchmarks of scoring, negotiation, the ledger, serialization
+# and in-process HTTP routes over bidder counts and rounds, saved as JSON and compared
+# against a baseline kept in bench/baselines/ (see bench.load for the HTTP load test).
+#   cd backend && python -m bench.suite run --profile quick --out /tmp/now.json
+#   cd backend && python -m bench.suite compare bench/baselines/quick.json /tmp/now.json --threshold 0.25
+#   cd backend && python -m bench.suite run --profile quick --save-baseline   # after an intended change
+# Baselines are only comparable on the machine (and Python/numpy) that produced them;
+# compare prints both environments. Exit status 1 means a metric regressed.
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+os.environ.setdefault("USE_LLM", "0")
+os.environ.setdefault("RESULT_CACHE_TTL_S", "0")  # routes measure the run, not a cache hit
+
+BASELINES = Path(__file__).parent / "baselines"
+
+# Sizes per profile: bidder counts per benchmark group and negotiation rounds.
+PROFILES: Dict[str, Dict[str, List[int]]] = {
+    "quick": {
+        "scoring": [5, 100, 1_000, 10_000],
+        "demo_bidders": [5, 100],
+        "rounds": [2, 10],
+        "ledger": [10_000],
+        "http_rounds": [2],
+    },
+    "full": {
+        "scoring": [5, 100, 1_000, 10_000, 100_000],
+        "demo_bidders": [5, 100, 1_000, 10_000],
+        "rounds": [2, 10],
+        "ledger": [10_000, 100_000],
+        "http_rounds": [2, 10],
+    },
+}
+
+Result = Dict[str, Any]  # {"value": float, "unit": str, "better": "lower"|"higher", ...}
+
+def measure(fn: Callable[[], Any], *, repeat: int = 5, min_s: float = 0.05, items: int = 1) -> Result:
+    # Best (and median) wall time per call over `repeat` samples; the best is what gets
+    # compared, as it is the least disturbed by other load on the machine. Calls shorter
+    # than min_s are looped so timer resolution doesn't dominate.
+    fn()
+    number, t0 = 1, time.perf_counter()
+    fn()
+    once = time.perf_counter() - t0
+    if once < min_s:
+        number = max(1, int(min_s / max(once, 1e-9)))
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return _result(samples, items)
+
+def _result(samples: List[float], items: int = 1) -> Result:
+    best = min(samples)
+    out = {"value": round(best * 1000, 4), "unit": "ms", "better": "lower",
+           "median_ms": round(statistics.median(samples) * 1000, 4), "samples": len(samples)}
+    if items > 1:
+        out["per_item_us"] = round(best / items * 1e6, 4)
+    return out
+
+# ---- benchmark groups ----
+
+def bench_scoring(sizes: List[int], repeat: int) -> Dict[str, Result]:
+    from app.agents.freelancer import quote_bid
+    from app.core.report import pick_winner
+    from app.core.scoring import score_bid, score_bids
+    from app.sim.demo import DEFAULT_WEIGHTS
+    from app.sim.market import synthetic_pool, synthetic_task
+
+    out = {}
+    task = synthetic_task(0, 3)
+    for n in sizes:
+        bids = [quote_bid(task, p) for p in synthetic_pool(0, 3, n)]
+        max_eta = max(b.eta_days for b in bids)
+        out[f"score_bid[n={n}]"] = measure(
+            lambda: [score_bid(b, task.budget_usd, max_eta, DEFAULT_WEIGHTS) for b in bids], repeat=repeat, items=n,
+        )
+        out[f"score_bids[n={n}]"] = measure(
+            lambda: score_bids(bids, task.budget_usd, DEFAULT_WEIGHTS), repeat=repeat, items=n,
+        )
+        out[f"pick_winner[n={n}]"] = measure(
+            lambda: pick_winner(task, bids, DEFAULT_WEIGHTS), repeat=repeat, items=n,
+        )
+    return out
+
+def _demo(n: int, rounds: int):
+    from app.sim import demo
+    from app.sim.market import synthetic_pool, synthetic_task
+
+    return asyncio.run(demo.run_demo(
+        task=synthetic_task(0, 3), freelancers=synthetic_pool(0, 3, n), rounds=rounds,
+    ))
+
+def bench_negotiation(bidders: List[int], rounds: List[int], repeat: int) -> Dict[str, Result]:
+    from app.core.presenter import to_ui, to_ui_page
+    from app.core.response_cache import encode_json
+
+    out = {}
+    for n in bidders:
+        for r in rounds:
+            reps = repeat if n <= 1_000 else 3
+            out[f"run_demo[n={n},rounds={r}]"] = measure(lambda: _demo(n, r), repeat=reps, items=n * r)
+            report = _demo(n, r)
+            out[f"to_ui+encode[n={n},rounds={r}]"] = measure(lambda: encode_json(to_ui(report)), repeat=reps)
+            out[f"to_ui_page[n={n},rounds={r}]"] = measure(lambda: to_ui_page(report), repeat=reps)
+    return out
+
+def bench_ledger(sizes: List[int], repeat: int) -> Dict[str, Result]:
+    from app.core.ledger import Ledger
+
+    row = {"freelancer_id": "steady_mid", "price_usd": 150.0, "eta_days": 5, "confidence": 0.8}
+    change = {"before": row, "after": {**row, "price_usd": 140.0}}
+
+    def fill(n: int):
+        ledger = Ledger()
+        for i in range(n):
+            if i % 2:
+                ledger.add("COUNTEROFFER_RESPONSE", "steady_mid responded", round=i % 10, data=change)
+            else:
+                ledger.add("BID_SUBMITTED", "Bid submitted by steady_mid", data=row)
+        return ledger
+
+    out = {}
+    for n in sizes:
+        out[f"Ledger.add[events={n}]"] = measure(lambda: fill(n), repeat=repeat, min_s=0, items=n)
+        ledger = fill(n)
+        out[f"EventLog.dump[events={n}]"] = measure(ledger.events.dump, repeat=repeat, items=n)
+    return out
+
+def bench_http(rounds: List[int], repeat: int) -> Dict[str, Result]:
+    # In-process ASGI (no sockets): routing, validation, the run and response encoding.
+    import httpx
+
+    from app import main as api
+
+    body = {"title": "Suite task", "acceptance_criteria": ["a", "b", "c"], "budget_usd": 250, "use_llm": False}
+
+    async def go() -> Dict[str, Result]:
+        out = {}
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench") as c:
+            async def timed(method: str, url: str, **kw) -> Result:
+                samples = []
+                for _ in range(max(repeat, 10)):
+                    t0 = time.perf_counter()
+                    r = await c.request(method, url, **kw)
+                    samples.append(time.perf_counter() - t0)
+                    r.raise_for_status()
+                return _result(samples)
+
+            await c.get("/health")
+            out["GET /health"] = await timed("GET", "/health")
+            out["POST /run-ui"] = await timed("POST", "/run-ui", json=body)
+            for r in rounds:
+                out[f"GET /demo/run-ui[rounds={r}]"] = await timed("GET", f"/demo/run-ui?rounds={r}&adaptive=false")
+                out[f"GET /demo/run-ui/summary[rounds={r}]"] = await timed(
+                    "GET", f"/demo/run-ui/summary?rounds={r}&adaptive=false",
+                )
+        return out
+
+    return asyncio.run(go())
+
+GROUPS = ("scoring", "negotiation", "ledger", "http")
+
+def _spin(n: int = 200_000) -> int:
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+def calibration_ms() -> float:
+    # A fixed pure-Python loop: how fast this machine/interpreter is right now.
+    return measure(_spin, repeat=15)["value"]
+
+def run(profile: str, groups: List[str], repeat: int) -> Dict[str, Any]:
+    sizes = PROFILES[profile]
+    results: Dict[str, Result] = {}
+    for group in groups:
+        t0 = time.perf_counter()
+        if group == "scoring":
+            results.update(bench_scoring(sizes["scoring"], repeat))
+        elif group == "negotiation":
+            results.update(bench_negotiation(sizes["demo_bidders"], sizes["rounds"], repeat))
+        elif group == "ledger":
+            results.update(bench_ledger(sizes["ledger"], repeat))
+        elif group == "http":
+            results.update(bench_http(sizes["http_rounds"], repeat))
+        print(f"[{group}] done in {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+    meta = {**environment(), "profile": profile, "groups": groups, "calibration_ms": calibration_ms()}
+    return {"meta": meta, "results": results}
+
+def environment() -> Dict[str, Any]:
+    import numpy
+    import pydantic
+
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pydantic": pydantic.VERSION,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+# ---- results files ----
+
+def save(doc: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(doc, indent=2, sort_keys=True) + "\n")
+
+def load(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float, *, normalize: bool = False) -> List[str]:
+    # Prints one line per metric present in both files; returns the regressed names.
+    # A metric regresses when it is worse than the baseline by more than `threshold`
+    # (0.25 = 25% slower, or 25% fewer req/s). `normalize` first scales the new times by
+    # the two runs' calibration loops, for baselines recorded on a different machine.
+    for key in ("python", "numpy", "machine", "cpus"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"note: {key} differs (baseline {base['meta'].get(key)}, now {new['meta'].get(key)})")
+    b_cal, n_cal = base["meta"].get("calibration_ms"), new["meta"].get("calibration_ms")
+    speed = b_cal / n_cal if b_cal and n_cal else 1.0
+    print(f"calibration loop: baseline {b_cal} ms, now {n_cal} ms"
+          + (f" (new times scaled by x{speed:.2f})" if normalize else ""))
+    if not normalize:
+        speed = 1.0
+    regressed = []
+    b_res, n_res = base["results"], new["results"]
+    width = max((len(k) for k in n_res), default=10)
+    for name in sorted(set(b_res) & set(n_res)):
+        b, n = b_res[name]["value"], n_res[name]["value"]
+        if not b:
+            continue
+        n = n * speed if n_res[name].get("unit") == "ms" else n / speed
+        # > 1 means worse, whichever direction is better for this metric
+        ratio = (n / b) if n_res[name].get("better", "lower") == "lower" else (b / n if n else float("inf"))
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "REGRESSION"
+            regressed.append(name)
+        elif ratio < 1 / (1 + threshold):
+            flag = "faster"
+        unit = n_res[name].get("unit", "")
+        print(f"{name:<{width}}  {b:12.3f} -> {n:12.3f} {unit:<5} x{ratio:5.2f}  {flag}")
+    for name in sorted(set(b_res) - set(n_res)):
+        print(f"{name:<{width}}  missing from the new results")
+    for name in sorted(set(n_res) - set(b_res)):
+        print(f"{name:<{width}}  new (no baseline)")
+    print(f"{len(regressed)} regression(s) beyond {threshold:.0%}")
+    return regressed
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m bench.suite")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("run", help="run the micro-benchmarks")
+    r.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    r.add_argument("--only", default=",".join(GROUPS), help=f"comma-separated subset of {','.join(GROUPS)}")
+    r.add_argument("--repeat", type=int, default=7)
+    r.add_argument("--out", type=Path, help="write results JSON here (default: print)")
+    r.add_argument("--save-baseline", action="store_true", help="write bench/baselines/<profile>.json")
+
+    c = sub.add_parser("compare", help="compare results against a baseline")
+    c.add_argument("baseline", type=Path)
+    c.add_argument("results", type=Path)
+    c.add_argument("--threshold", type=float, default=0.25)
+    c.add_argument("--normalize", action="store_true", help="scale by the calibration loops (other machine)")
+
+    args = ap.parse_args(argv)
+    if args.cmd == "compare":
+        regressed = compare(load(args.baseline), load(args.results), args.threshold, normalize=args.normalize)
+        sys.exit(1 if regressed else 0)
+
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        ap.error(f"unknown group(s): {', '.join(sorted(unknown))}")
+    doc = run(args.profile, groups, args.repeat)
+    if args.save_baseline:
+        save(doc, BASELINES / f"{args.profile}.json")
+    if args.out:
+        save(doc, args.out)
+    if not (args.out or args.save_baseline):
+        print(json.dumps(doc, indent=2, sort_keys=True))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# The /demo/run-ui response path (to_ui + FastAPI-equivalent JSON encoding of the whole
+# history) vs the summary path (to_ui_page: ranked bids plus the first page, fast-encoded),
+# and the cost of then paging through every event and scoreHistory row.
+#   cd backend && python -m bench.ui_page --freelancers 200 --rounds 20
+import argparse
+import asyncio
+import time
+
+from app.core import fast_json
+from app.core.presenter import history_page, to_ui, to_ui_page
+from app.core.response_cache import encode_json
+from app.sim import demo
+from app.sim.market import synthetic_pool, synthetic_task
+
+def best_of(fn, repeat):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def page_all(report, limit):
+    n, cur = 0, 0
+    while cur is not None:
+        rows, cur = report.events.page(cur, limit)
+        n += len(fast_json.dumps(rows))
+    cur = -1
+    while cur is not None:
+        rows, cur = history_page(report.score_history, cur, limit)
+        n += len(fast_json.dumps(rows))
+    return n
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--freelancers", type=int, default=200)
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--page", type=int, default=100, help="events / scoreHistory rows in the summary")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    report = asyncio.run(demo.run_demo(
+        task=synthetic_task(0, 3), freelancers=synthetic_pool(0, 0, args.freelancers), rounds=args.rounds,
+    ))
+    run_s = time.perf_counter() - t0
+    print(f"{len(report.events):,} events, {len(report.score_history):,} scoreHistory rows; "
+          f"auction {run_s * 1000:.0f} ms")
+
+    full_s, body = best_of(lambda: encode_json(to_ui(report)), args.repeat)
+    print(f"   to_ui + encode_json: {full_s * 1000:7.1f} ms  {len(body) / 2**20:6.2f} MiB")
+    lean_s, body = best_of(lambda: fast_json.dumps(to_ui(report)), args.repeat)
+    print(f"     to_ui + fast_json: {lean_s * 1000:7.1f} ms  {len(body) / 2**20:6.2f} MiB")
+    page_s, body = best_of(
+        lambda: to_ui_page(report, events_limit=args.page, history_limit=args.page), args.repeat,
+    )
+    print(f"{f'summary (page {args.page})':>22}: {page_s * 1000:7.1f} ms  {len(body) / 2**10:6.1f} KiB")
+    for limit in (100, 1000):
+        rest_s, n = best_of(lambda: page_all(report, limit), args.repeat)
+        print(f"{f'all pages of {limit} rows':>22}: {rest_s * 1000:7.1f} ms  {n / 2**20:6.2f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Weight what-if: one matrix multiply over all vectors vs. re-scoring per vector.
+#   cd backend && python -m bench.weight_sweep --vectors 100000 --bids 5,50,500
+import argparse
+import random
+import time
+
+from app.core.models import Bid, Task
+from app.core.report import pick_winner
+from app.core.sensitivity import TermCache, analyze, weight_vectors
+from app.core.scoring import WEIGHT_KEYS
+from app.sim.demo import DEFAULT_WEIGHTS
+
+def make_bids(n: int):
+    rng = random.Random(0)
+    flags = [[], [], ["tight_schedule"], ["low_test_coverage", "copy_paste_history"]]
+    return [
+        Bid(freelancer_id=f"f{i}", price_usd=round(rng.uniform(80, 300), 2), eta_days=rng.randint(2, 9),
+            confidence=round(rng.uniform(0.4, 0.95), 3), portfolio_score=round(rng.random(), 3),
+            risk_flags=list(rng.choice(flags)))
+        for i in range(n)
+    ]
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--vectors", type=int, default=100_000)
+    ap.add_argument("--bids", default="5,50,500")
+    ap.add_argument("--rescore-sample", type=int, default=200, help="vectors timed through pick_winner")
+    args = ap.parse_args()
+
+    task = Task(title="bench", acceptance_criteria=["a", "b", "c"], budget_usd=250)
+    for n in map(int, args.bids.split(",")):
+        bids = make_bids(n)
+        cache = TermCache()
+        vectors = weight_vectors(DEFAULT_WEIGHTS, samples=args.vectors, seed=1)
+
+        t0 = time.perf_counter()
+        out = analyze(cache.build(bids, task.budget_usd), DEFAULT_WEIGHTS, vectors)
+        cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        analyze(cache.build(bids, task.budget_usd), DEFAULT_WEIGHTS, vectors)
+        warm = time.perf_counter() - t0
+
+        k = min(args.rescore_sample, len(vectors))
+        t0 = time.perf_counter()
+        agree = 0
+        sweep = analyze(cache.build(bids, task.budget_usd), DEFAULT_WEIGHTS, vectors[:k], include_vectors=True)
+        for row, won in zip(vectors[:k], sweep["winners"]):
+            w = dict(zip(WEIGHT_KEYS, row.tolist()))
+            agree += pick_winner(task, bids, w).winner_id == sweep["ids"][won]
+        per = (time.perf_counter() - t0) / k
+        print(f"{n:>4} bids x {len(vectors)} vectors: sweep {cold * 1000:.0f} ms cold / {warm * 1000:.0f} ms cached; "
+              f"pick_winner {per * 1000:.2f} ms/vector (~{per * len(vectors):.1f}s); "
+              f"{len(out['regions'])} winner regions; {agree}/{k} winners agree")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+# Endpoint tests run the app in-process without an LLM and against fresh caches.
+import os
+
+os.environ.setdefault("USE_LLM", "0")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.core.response_cache import RecentReports, ResponseCache
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "_results", ResponseCache(ttl_s=60))
+    monkeypatch.setattr(main, "_reports", RecentReports(main.UI_KEEP_RUNS))
+    with TestClient(main.app) as c:
+        yield c
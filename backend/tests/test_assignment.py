@@ -0,0 +1,108 @@
+# Batch auction assignment: the sparse matching must find the same best (assigned count,
+# total score) as brute force, with or without the top-candidate pruning, and respect
+# every freelancer's capacity.
+import itertools
+
+import numpy as np
+import pytest
+
+from app.agents.freelancer import quote_bid
+from app.core.assignment import Candidates, solve_assignment, top_candidates
+from app.core.scoring import score_bids
+from app.sim.batch_auction import PoolArrays, run_batch_auction, score_blocks
+from app.sim.demo import DEFAULT_WEIGHTS
+from app.sim.market import synthetic_pool, synthetic_task
+
+def brute_force(totals, capacity):
+    # Best (number assigned, total) over every assignment within capacity; -1 = unassigned.
+    n_tasks, n_free = totals.shape
+    best = (-1, -np.inf)
+    for pick in itertools.product(range(-1, n_free), repeat=n_tasks):
+        used = np.bincount([f for f in pick if f >= 0], minlength=n_free)
+        if (used > capacity).any():
+            continue
+        got = [totals[t, f] for t, f in enumerate(pick) if f >= 0]
+        best = max(best, (len(got), sum(got)))
+    return best
+
+def outcome(totals, assigned, capacity):
+    hit = assigned >= 0
+    assert (np.bincount(assigned[hit], minlength=len(capacity)) <= capacity).all()
+    return int(hit.sum()), float(totals[np.arange(len(assigned))[hit], assigned[hit]].sum())
+
+def full_candidates(totals):
+    return [Candidates(np.arange(totals.shape[1]), row.copy()) for row in totals]
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n_tasks, n_free = rng.integers(1, 6), rng.integers(1, 5)
+    totals = rng.normal(size=(n_tasks, n_free))
+    capacity = rng.integers(1, 3, size=n_free)
+    want = brute_force(totals, capacity)
+    for cands in (full_candidates(totals), top_candidates(totals, capacity, n_tasks)):
+        got = outcome(totals, solve_assignment(cands, capacity), capacity)
+        assert got[0] == want[0]
+        assert got[1] == pytest.approx(want[1])
+
+def test_beats_greedy_per_task_argmax():
+    # Both tasks prefer freelancer 0; greedy gives it to task 0 and leaves task 1 with 0.1.
+    totals = np.array([[1.0, 0.9], [1.0, 0.1]])
+    capacity = np.array([1, 1])
+    assert solve_assignment(full_candidates(totals), capacity).tolist() == [1, 0]
+
+def test_pruned_candidates_cover_the_capacity_needed():
+    totals = np.array([[5.0, 4.0, 3.0, 2.0, 1.0]] * 3)
+    cands = top_candidates(totals, np.array([2, 1, 1, 1, 1]), 3)
+    assert [c.idx.tolist() for c in cands] == [[0, 1]] * 3  # capacity 2 + 1 >= 3 tasks
+    ties = top_candidates(np.zeros((1, 4)), np.ones(4, dtype=np.int64), 2)
+    assert ties[0].idx.tolist() == [0, 1]  # ties by index
+
+def test_no_tasks():
+    assert solve_assignment([], np.array([1])).tolist() == []
+
+def test_score_blocks_match_per_task_scoring():
+    tasks = [synthetic_task(3, i) for i in range(7)]
+    pool = synthetic_pool(3, 0, 9)
+    rows = {}
+    for lo, totals in score_blocks(tasks, PoolArrays(pool), DEFAULT_WEIGHTS, block=3):
+        for i, row in enumerate(totals):
+            rows[lo + i] = row
+    for i, task in enumerate(tasks):
+        want = score_bids([quote_bid(task, p) for p in pool], task.budget_usd, DEFAULT_WEIGHTS).total
+        np.testing.assert_allclose(rows[i], want, rtol=0, atol=1e-12)
+
+@pytest.mark.parametrize("capacity", [None, [2, 1, 1, 1], [1, 1]])
+def test_batch_auction_is_optimal_within_capacity(capacity):
+    tasks = [synthetic_task(8, i) for i in range(5)]
+    pool = synthetic_pool(8, 0, 4 if capacity != [1, 1] else 2)
+    cap = np.ones(len(pool), dtype=np.int64) if capacity is None else np.array(capacity)
+    (_, totals), = score_blocks(tasks, PoolArrays(pool), DEFAULT_WEIGHTS)
+    want = brute_force(totals, cap)
+
+    result = run_batch_auction(tasks, pool, DEFAULT_WEIGHTS, capacity=capacity, top_k=2)
+    assert len(result.reports) == want[0]
+    assert len(result.unassigned) == len(tasks) - want[0]
+    assert result.total_score == pytest.approx(want[1])
+    wins = [r.winner_id for r in result.reports]
+    for p, c in zip(pool, cap):
+        assert wins.count(p.freelancer_id) <= c
+    for r in result.reports:
+        assert r.winner_id in {b.freelancer_id for b in r.bids}
+
+def test_batch_endpoint(client):
+    body = {
+        "tasks": [{"title": f"t{i}", "acceptance_criteria": ["a"], "budget_usd": 300} for i in range(3)],
+        "freelancers": [
+            {"freelancer_id": "x", "portfolio_score": 0.9, "base_speed": 2, "base_price": 100, "capacity": 2},
+            {"freelancer_id": "y", "portfolio_score": 0.5, "base_speed": 3, "base_price": 90},
+        ],
+    }
+    r = client.post("/batch/run-ui", json=body)
+    assert r.status_code == 200
+    data = r.json()
+    assert len(data["reports"]) == 3 and data["unassigned"] == []
+    body["freelancers"][0]["capacity"] = 1
+    assert len(client.post("/batch/run-ui", json=body).json()["unassigned"]) == 1
+    body["freelancers"][1]["freelancer_id"] = "x"
+    assert client.post("/batch/run-ui", json=body).status_code == 422
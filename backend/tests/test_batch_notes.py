@@ -0,0 +1,94 @@
+# Batched bid notes: one structured call per auction (JSON mode when asked), lenient
+# parsing, and per-bid notes for whatever the batch reply misses.
+import asyncio
+import json
+import re
+
+import pytest
+
+from app.agents.freelancer import DEFAULT_FREELANCERS, NOTE_SYSTEM, collect_bids
+from app.llm.batch import BATCH_SYSTEM, BatchNoteGenerator, batch_prompt, parse_notes
+from app.llm.cache import CachedLLM
+from app.sim.market import synthetic_task
+
+IDS = ["a", "b", "c"]
+
+@pytest.mark.parametrize("raw, want", [
+    ('{"a": "note a", "b": " note b "}', {"a": "note a", "b": "note b"}),
+    ('```json\n{"a": "x"}\n```', {"a": "x"}),
+    ('Sure! Here you go: {"c": "y"} Hope that helps.', {"c": "y"}),
+    ('{"a": "", "b": 3, "c": null, "zz": "not a bid"}', {}),
+    ('["a", "b"]', {}),
+    ('{"a": "unterminated', {}),
+    ("no json at all", {}),
+])
+def test_parse_notes(raw, want):
+    assert parse_notes(raw, IDS) == want
+
+class BatchLLM:
+    # Answers batch prompts with notes for every bid id except `skip`; per-bid prompts
+    # get a plain note.
+    model = "batch"
+
+    def __init__(self, skip=(), raw=None):
+        self.skip = set(skip)
+        self.raw = raw
+        self.calls = []
+
+    async def generate(self, prompt, *, system=None, format=None):
+        self.calls.append((system, format))
+        if system == BATCH_SYSTEM:
+            if self.raw is not None:
+                return self.raw
+            ids = re.findall(r"^- id=(\S+)", prompt, re.MULTILINE)
+            return json.dumps({i: f"batched {i}" for i in ids if i not in self.skip})
+        return "single"
+
+def quotes(n):
+    return [(f"f{i}", 100.0 + i, 1 + i % 3, 0.7) for i in range(n)]
+
+def test_batches_are_chunked_and_json_mode_is_passed_through():
+    llm = BatchLLM()
+    gen = BatchNoteGenerator(llm, max_batch=4, json_format=True)
+    got = asyncio.run(gen.notes("T", ["c1"], quotes(10)))
+    assert got == {f"f{i}": f"batched f{i}" for i in range(10)}
+    assert gen.batches == 3 and gen.parse_misses == 0
+    assert llm.calls == [(BATCH_SYSTEM, "json")] * 3
+
+def test_free_text_mode_sends_no_format():
+    llm = BatchLLM()
+    asyncio.run(BatchNoteGenerator(llm).notes("T", [], quotes(2)))
+    assert llm.calls == [(BATCH_SYSTEM, None)]
+
+def test_prompt_shares_the_task_prefix_once():
+    prompt = batch_prompt("Build API", ["tests", "docs"], quotes(3))
+    assert prompt.count("Build API") == 1
+    assert prompt.count("- id=") == 3
+
+def test_format_reaches_the_model_through_the_cache():
+    llm = BatchLLM()
+    cached = CachedLLM(llm)
+    gen = BatchNoteGenerator(cached, json_format=True)
+    asyncio.run(gen.notes("T", [], quotes(2)))
+    asyncio.run(gen.notes("T", [], quotes(2)))
+    assert llm.calls == [(BATCH_SYSTEM, "json")]
+    assert cached.stats()["hits"] == 1
+
+def test_missed_bids_get_per_bid_notes_in_order():
+    task = synthetic_task(0, 2)
+    skip = {DEFAULT_FREELANCERS[1].freelancer_id, DEFAULT_FREELANCERS[3].freelancer_id}
+    llm = BatchLLM(skip=skip)
+    gen = BatchNoteGenerator(llm)
+    bids = asyncio.run(collect_bids(task, DEFAULT_FREELANCERS, llm, batcher=gen))
+    assert [b.freelancer_id for b in bids] == [p.freelancer_id for p in DEFAULT_FREELANCERS]
+    for b in bids:
+        assert b.notes == ("single" if b.freelancer_id in skip else f"batched {b.freelancer_id}")
+    assert [c[0] for c in llm.calls] == [BATCH_SYSTEM, NOTE_SYSTEM, NOTE_SYSTEM]
+    assert gen.parse_misses == 2
+
+def test_unparseable_batch_falls_back_for_every_bid():
+    llm = BatchLLM(raw="I cannot do that.")
+    gen = BatchNoteGenerator(llm)
+    bids = asyncio.run(collect_bids(synthetic_task(0, 2), DEFAULT_FREELANCERS, llm, batcher=gen))
+    assert all(b.notes == "single" for b in bids)
+    assert gen.parse_misses == len(DEFAULT_FREELANCERS)
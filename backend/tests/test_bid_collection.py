@@ -0,0 +1,126 @@
+# Concurrent bid collection keeps freelancer order within its concurrency limit; LLM
+# clients are pooled per model, bounded, and restricted to OLLAMA_MODELS when set.
+import asyncio
+import json
+from collections import OrderedDict
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.agents.freelancer import DEFAULT_FREELANCERS, FreelancerProfile, collect_bids, quote_bid
+from app.llm.ollama import OllamaLLM
+from app.sim.market import synthetic_task
+
+class SlowLLM:
+    # Later freelancers answer first, so completion order is the reverse of input order.
+    model = "slow"
+
+    def __init__(self, n):
+        self.n = n
+        self.active = 0
+        self.peak = 0
+        self.seen = 0
+
+    async def generate(self, prompt, *, system=None, format=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        i = self.seen
+        self.seen += 1
+        await asyncio.sleep(0.002 * (self.n - i))
+        self.active -= 1
+        return f"note {prompt.splitlines()[-1]}"
+
+def pool(n):
+    return [FreelancerProfile(f"f{i:02d}", 0.5 + i / (4 * n), 1 + i % 4, 90 + 7 * i, []) for i in range(n)]
+
+@pytest.mark.parametrize("concurrency", [1, 3, 8])
+def test_bids_keep_freelancer_order_within_the_limit(concurrency):
+    task = synthetic_task(0, 0)
+    freelancers = pool(12)
+    llm = SlowLLM(12)
+    seen = []
+
+    async def on_bid(b):
+        seen.append(b.freelancer_id)
+
+    bids = asyncio.run(collect_bids(task, freelancers, llm, concurrency=concurrency, on_bid=on_bid))
+    assert [b.freelancer_id for b in bids] == [p.freelancer_id for p in freelancers]
+    assert llm.peak == concurrency
+    assert sorted(seen) == [p.freelancer_id for p in freelancers]
+    if concurrency > 1:
+        assert seen != [p.freelancer_id for p in freelancers]  # callbacks run in completion order
+    for p, b in zip(freelancers, bids):
+        want = quote_bid(task, p)
+        assert (b.price_usd, b.eta_days, b.confidence) == (want.price_usd, want.eta_days, want.confidence)
+        assert b.notes and b.notes.startswith("note ")
+
+def test_bids_without_llm_have_no_notes():
+    task = synthetic_task(0, 1)
+    bids = asyncio.run(collect_bids(task, DEFAULT_FREELANCERS, None))
+    assert [b.model_dump() for b in bids] == [quote_bid(task, p).model_dump() for p in DEFAULT_FREELANCERS]
+
+def test_ollama_client_is_pooled_and_sends_options():
+    sent = []
+
+    def handler(request):
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, json={"response": " ok \n", "prompt_eval_count": 5, "eval_count": 3})
+
+    async def go():
+        llm = OllamaLLM("m", keep_alive="10m")
+        assert llm.client is llm.client
+        await llm.aclose()
+        llm._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = llm.client
+        out = [await llm.generate("p", system="s", format="json"), await llm.generate("q")]
+        assert llm.client is client
+        await llm.aclose()
+        assert llm._client is None
+        return llm, out
+
+    llm, out = asyncio.run(go())
+    assert out == ["ok", "ok"]
+    assert sent[0] == {"model": "m", "prompt": "p", "stream": False, "system": "s", "format": "json", "keep_alive": "10m"}
+    assert sent[1] == {"model": "m", "prompt": "q", "stream": False, "keep_alive": "10m"}
+    assert (llm.prompt_tokens, llm.eval_tokens) == (10, 6)
+
+@pytest.fixture
+def llm_pool(monkeypatch):
+    monkeypatch.setenv("USE_LLM", "1")
+    monkeypatch.setattr(main, "_llms", OrderedDict())
+    monkeypatch.setattr(main, "_retiring", set())
+    monkeypatch.setattr(main, "_batchers", {})
+    monkeypatch.setattr(main, "_breakers", {})
+    monkeypatch.setattr(main, "LLM_MAX_MODELS", 2)
+    monkeypatch.setattr(main, "LLM_BUDGET_MS", 0.0)
+    monkeypatch.setattr(main, "LLM_CACHE_PATH", None)
+    return main
+
+def test_llm_clients_are_bounded_and_evicted_least_recently_used(llm_pool):
+    async def go():
+        a = main.get_llm("a")
+        b = main.get_llm("b")
+        b.llm.client  # open its pool
+        main.get_guard("b")
+        main.get_batcher("b")
+        assert main.get_llm("a") is a  # "b" is now the least recently used
+        c = main.get_llm("c")
+        assert list(main._llms) == ["a", "c"]
+        assert main._retiring == {b}
+        assert "b" not in main._breakers and "b" not in main._batchers
+        await asyncio.sleep(0.05)
+        assert not main._retiring
+        assert b.llm._client is None  # closed once retired
+        assert main.get_llm("c") is c
+
+    asyncio.run(go())
+
+def test_unlisted_model_is_rejected(llm_pool, monkeypatch):
+    monkeypatch.setattr(main, "OLLAMA_MODELS", {"allowed"})
+    assert main.get_llm("allowed").model == "allowed"
+    with pytest.raises(HTTPException) as e:
+        main.get_llm("other")
+    assert e.value.status_code == 400
+    assert list(main._llms) == ["allowed"]
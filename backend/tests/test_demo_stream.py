@@ -0,0 +1,79 @@
+# run_demo streams bids in completion order but logs BID_SUBMITTED in freelancer order,
+# so the ledger's seq numbering doesn't depend on LLM timing.
+import asyncio
+import json
+import warnings
+
+from app import main
+from app.agents.freelancer import DEFAULT_FREELANCERS
+from app.sim.demo import run_demo
+
+class ReversedLLM:
+    # Later calls finish first: the first freelancer's note is the slowest.
+    model = "reversed"
+
+    def __init__(self, step_s=0.02):
+        self.step_s = step_s
+        self.calls = 0
+
+    async def generate(self, prompt, *, system=None, format=None):
+        self.calls += 1
+        await asyncio.sleep(self.step_s * (len(DEFAULT_FREELANCERS) - self.calls + 1))
+        return "note"
+
+def run(llm=None, **kw):
+    frames = []
+
+    async def emit(kind, payload):
+        frames.append((kind, payload))
+
+    report = asyncio.run(run_demo(llm, emit=emit, **kw))
+    return report, frames
+
+def bid_rows(report):
+    return [(e.seq, e.data["freelancer_id"]) for e in report.events if e.type == "BID_SUBMITTED"]
+
+def test_bid_frames_come_first_in_completion_order():
+    report, frames = run(ReversedLLM(), seed=7, rounds=1)
+    bids = [b.freelancer_id for kind, b in frames if kind == "bid"]
+    order = [p.freelancer_id for p in DEFAULT_FREELANCERS]
+    assert bids == order[::-1]
+    first_event = next(i for i, (kind, e) in enumerate(frames) if kind == "event" and e.type == "BID_SUBMITTED")
+    assert all(kind == "bid" for kind, _ in frames[first_event - len(bids):first_event])
+
+def test_bid_submitted_seq_is_freelancer_order():
+    report, frames = run(ReversedLLM(), seed=7, rounds=1)
+    order = [p.freelancer_id for p in DEFAULT_FREELANCERS]
+    assert bid_rows(report) == list(zip(range(2, 2 + len(order)), order))
+    streamed = [(e.seq, e.data["freelancer_id"]) for kind, e in frames if kind == "event" and e.type == "BID_SUBMITTED"]
+    assert streamed == bid_rows(report)
+
+def test_llm_timing_does_not_change_the_ledger():
+    slow, _ = run(ReversedLLM(), seed=42, rounds=3)
+    fast, _ = run(ReversedLLM(step_s=0), seed=42, rounds=3)
+    rows = lambda r: [(e.seq, e.type, e.round, e.data) for e in r.events]
+    assert rows(slow) == rows(fast)
+    assert slow.winner_id == fast.winner_id and slow.score_history == fast.score_history
+
+def test_no_bid_frames_without_emit():
+    llm = ReversedLLM(step_s=0)
+    report = asyncio.run(run_demo(llm, seed=1, rounds=0))
+    assert len(bid_rows(report)) == len(DEFAULT_FREELANCERS) == llm.calls
+
+def test_stream_endpoint_answers_get_and_post(client):
+    bodies = []
+    for method in ("GET", "POST"):
+        r = client.request(method, "/demo/run-ui/stream", params={"seed": 3, "rounds": 1})
+        assert r.status_code == 200
+        kinds = [json.loads(line)["kind"] for line in r.text.splitlines()]
+        assert kinds[-1] == "result" and "event" in kinds
+        bodies.append(kinds)
+    assert bodies[0] == bodies[1]
+
+def test_demo_routes_have_distinct_operation_ids(monkeypatch):
+    monkeypatch.setattr(main.app, "openapi_schema", None)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # FastAPI warns on duplicate operation ids
+        paths = main.app.openapi()["paths"]
+    for path in ("/demo/run-ui", "/demo/run-ui/summary", "/demo/run-ui/stream"):
+        assert set(paths[path]) == {"get", "post"}
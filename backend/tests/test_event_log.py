@@ -0,0 +1,80 @@
+# EventLog's compact records must expand to exactly the Event dumps they were built from,
+# however they are read: dump(), iteration, page() cursors or indexing.
+import asyncio
+import copy
+import pickle
+import threading
+
+import pytest
+
+from app.core.event_log import MAX_MARKS, EventLog
+from app.sim.demo import run_demo
+
+@pytest.fixture(scope="module")
+def log():
+    report = asyncio.run(run_demo(seed=7, rounds=12))
+    return report.events
+
+def pages(log, limit):
+    rows, cursor = [], 0
+    while cursor is not None:
+        page, cursor = log.page(cursor, limit)
+        rows += page
+    return rows
+
+def test_log_has_deltas(log):
+    assert any(rec[-1] is not None for rec in log._records)
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50, 10_000])
+def test_pages_concatenate_to_dump(log, limit):
+    assert pages(log, limit) == log.dump()
+
+def test_page_from_any_cursor(log):
+    dump = log.dump()
+    for i in range(0, len(dump), 5):
+        rows, _ = log.page(dump[i]["seq"], 4)
+        assert rows == dump[i + 1:i + 5]
+    assert log.page(dump[-1]["seq"], 10) == ([], None)
+    assert log.page(0, 0) == ([], 0)
+
+def test_indexing_matches_dump(log):
+    dump = log.dump()
+    n = len(dump)
+    for i in list(range(n)) + [-1, -n]:
+        assert log[i].model_dump() == dump[i]
+    for sl in (slice(3, 9), slice(None, None, 4), slice(-5, None), slice(10, 2), slice(n - 2, n + 5)):
+        assert [e.model_dump() for e in log[sl]] == dump[sl]
+    with pytest.raises(IndexError):
+        log[n]
+
+def test_growing_log_last_event(log):
+    grown = EventLog()
+    for row in log.dump():
+        grown.append(row["run_id"], row["seq"], row["type"], row["ts"], row["round"], row["summary"], row["data"])
+        assert grown[-1].model_dump() == row
+    assert grown == log
+
+def test_round_trips(log):
+    assert EventLog.from_events(list(log)) == log
+    assert pickle.loads(pickle.dumps(log)) == log
+    assert copy.deepcopy(log) == log
+
+def test_concurrent_pagers(log):
+    # Threadpool endpoints page one run at once; more cursors than MAX_MARKS keep the
+    # checkpoint table evicting while others read it.
+    dump = log.dump()
+    errors = []
+
+    def pager(limit):
+        try:
+            for _ in range(20):
+                assert pages(log, limit) == dump
+        except Exception as e:  # surfaced below; a thread's exception is otherwise lost
+            errors.append(e)
+
+    threads = [threading.Thread(target=pager, args=(1 + i % (MAX_MARKS + 3),)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
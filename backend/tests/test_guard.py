@@ -0,0 +1,109 @@
+# NoteGuard bounds note latency per request and falls back per bid; the circuit breaker
+# only learns from the LLM's own errors and per-call timeouts.
+import asyncio
+import time
+
+import pytest
+
+from app.agents.freelancer import DEFAULT_FREELANCERS
+from app.llm.guard import CircuitBreaker, Deadline, NoteGuard
+from app.sim.demo import run_demo
+
+class ScriptedLLM:
+    model = "scripted"
+
+    def __init__(self, delay_s=0.0, fail=False):
+        self.delay_s = delay_s
+        self.fail = fail
+        self.calls = 0
+
+    async def generate(self, prompt, *, system=None, format=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        if self.fail:
+            raise RuntimeError("model down")
+        return "llm note"
+
+def attempt(guard, llm):
+    return asyncio.run(guard.attempt(llm, "p"))
+
+def test_breaker_opens_then_probes_once():
+    b = CircuitBreaker(failure_threshold=2, reset_after_s=0.05)
+    b.record_failure()
+    assert b.state == "closed" and b.allow()
+    b.record_failure()
+    assert b.state == "open" and not b.allow()
+    time.sleep(0.06)
+    assert b.state == "half_open"
+    assert b.allow() and not b.allow()  # one probe at a time
+    b.record_failure()
+    assert b.state == "open"  # a failed probe re-opens at once
+    time.sleep(0.06)
+    assert b.allow()
+    b.record_success()
+    assert b.state == "closed" and b.failures == 0 and b.allow()
+
+def test_released_probe_lets_the_next_one_through():
+    b = CircuitBreaker(failure_threshold=1, reset_after_s=0.0)
+    b.record_failure()
+    assert b.allow() and not b.allow()
+    b.release()
+    assert b.allow()
+
+def test_success_and_errors():
+    guard = NoteGuard(Deadline(5), CircuitBreaker(failure_threshold=2))
+    assert attempt(guard, ScriptedLLM()) == ("llm note", None)
+    down = ScriptedLLM(fail=True)
+    assert attempt(guard, down) == (None, "error")
+    assert attempt(guard, down) == (None, "error")
+    assert attempt(guard, down) == (None, "circuit_open")
+    assert down.calls == 2
+
+def test_per_call_timeout_counts_against_the_breaker():
+    guard = NoteGuard(Deadline(5), CircuitBreaker(failure_threshold=1), call_timeout_s=0.01)
+    assert attempt(guard, ScriptedLLM(delay_s=1)) == (None, "timeout")
+    assert guard.breaker.state == "open"
+
+def test_running_out_of_budget_does_not():
+    guard = NoteGuard(Deadline(0.02), CircuitBreaker(failure_threshold=1), call_timeout_s=1.0)
+    assert attempt(guard, ScriptedLLM(delay_s=1)) == (None, "deadline")  # budget < per-call cap
+    assert guard.breaker.state == "closed" and guard.breaker.failures == 0
+    assert attempt(guard, ScriptedLLM()) == (None, "deadline")  # nothing left: not even tried
+
+def test_budget_cut_releases_the_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_after_s=0.0)
+    breaker.record_failure()
+    assert attempt(NoteGuard(Deadline(0.02), breaker), ScriptedLLM(delay_s=1)) == (None, "deadline")
+    assert attempt(NoteGuard(Deadline(5), breaker), ScriptedLLM()) == ("llm note", None)
+    assert breaker.state == "closed"
+
+def test_cancellation_releases_the_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_after_s=0.0)
+    breaker.record_failure()
+    guard = NoteGuard(Deadline(5), breaker)
+
+    async def go():
+        task = asyncio.ensure_future(guard.attempt(ScriptedLLM(delay_s=1), "p"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(go())
+    assert breaker.allow()  # a new probe, not stuck half-open forever
+
+def test_degraded_bids_fall_back_to_templates():
+    llm = ScriptedLLM(fail=True)
+    guard = NoteGuard(Deadline(5), CircuitBreaker(failure_threshold=2))
+    report = asyncio.run(run_demo(llm, seed=1, rounds=1, concurrency=1, guard=guard))
+    assert llm.calls == 2
+    assert set(report.degraded_bids.values()) == {"error", "circuit_open"}
+    assert len(report.degraded_bids) == len(DEFAULT_FREELANCERS)
+    assert report.rationale[0].startswith(f"LLM notes degraded for {len(DEFAULT_FREELANCERS)}/")
+    assert all(b.notes.startswith("Can deliver") for b in report.bids)
+
+def test_degraded_bids_without_template_have_no_notes():
+    guard = NoteGuard(Deadline(0), template_fallback=False)
+    report = asyncio.run(run_demo(ScriptedLLM(), seed=1, rounds=1, guard=guard))
+    assert set(report.degraded_bids.values()) == {"deadline"}
+    assert "used no notes" in report.rationale[0]
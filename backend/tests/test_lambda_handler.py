@@ -0,0 +1,88 @@
+# The Lambda handler maps API Gateway events onto one ASGI call, and importing it (or
+# serving /health) must not pull in the heavy modules deferred to first use.
+import base64
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app import lambda_handler
+from app.lambda_handler import _response, handler
+
+BACKEND = str(Path(__file__).resolve().parents[1])
+HEAVY = ["httpx", "numpy", "scipy", "app.sim.demo", "app.llm.ollama", "app.core.ledger_store",
+         "app.core.sensitivity", "app.agents.registry"]
+
+def loaded_after(code):
+    # Heavy modules present in a fresh interpreter after running `code`.
+    probe = f"import sys\n{code}\nprint(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    env = {**os.environ, "USE_LLM": "0", "PYTHONPATH": BACKEND}
+    env.pop("PREWARM", None)
+    out = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True, check=True)
+    return out.stdout.split()
+
+def test_import_and_health_defer_heavy_modules():
+    assert loaded_after(
+        "from app.lambda_handler import handler\n"
+        "r = handler({'version': '2.0', 'rawPath': '/health', 'requestContext': {'http': {'method': 'GET'}}})\n"
+        "assert r['statusCode'] == 200, r"
+    ) == []
+
+def test_warm_up_loads_them_up_front():
+    assert set(loaded_after("from app.main import warm_up; warm_up()")) == set(HEAVY)
+
+@pytest.fixture(autouse=True)
+def flushes(monkeypatch):
+    calls = []
+    monkeypatch.setattr(lambda_handler, "flush_ledger", lambda: calls.append(1))
+    return calls
+
+def v2(method, path, body=None, query="", b64=False, **extra):
+    raw = json.dumps(body) if body is not None else None
+    if b64 and raw is not None:
+        raw = base64.b64encode(raw.encode()).decode()
+    return {"version": "2.0", "rawPath": path, "rawQueryString": query, "isBase64Encoded": b64,
+            "headers": {"Content-Type": "application/json"}, "requestContext": {"http": {"method": method}},
+            "body": raw, **extra}
+
+def test_http_api_event(flushes):
+    r = handler(v2("GET", "/health"))
+    assert r["statusCode"] == 200 and json.loads(r["body"]) == {"ok": True}
+    assert r["isBase64Encoded"] is False and r["cookies"] == []
+    assert flushes == [1]
+
+def test_query_string_and_base64_body():
+    r = handler(v2("GET", "/demo/run-ui/summary", query="seed=3&rounds=1&events_limit=2"))
+    assert r["statusCode"] == 200
+    assert len(json.loads(r["body"])["events"]) == 2
+    body = {"tasks": [{"title": "t", "acceptance_criteria": ["a"], "budget_usd": 200}],
+            "freelancers": [{"freelancer_id": "x", "portfolio_score": 0.5, "base_speed": 2, "base_price": 90}]}
+    r = handler(v2("POST", "/batch/run-ui", body, b64=True))
+    assert r["statusCode"] == 200 and json.loads(r["body"])["unassigned"] == []
+
+def test_rest_api_event_with_multi_value_query():
+    event = {"httpMethod": "GET", "path": "/demo/run-ui/summary", "headers": {"Accept": "application/json"},
+             "multiValueQueryStringParameters": {"seed": ["5"], "history_limit": ["1"]}, "body": None}
+    r = handler(event)
+    assert r["statusCode"] == 200 and "cookies" not in r
+    page = json.loads(r["body"])
+    assert {row["round"] for row in page["scoreHistory"]} == {0}  # whole rounds only
+    assert page["scoreHistoryNext"] == 0
+
+def test_errors_come_back_as_responses(flushes):
+    assert handler(v2("GET", "/nope"))["statusCode"] == 404
+    assert handler(v2("POST", "/whatif", {}))["statusCode"] == 422
+    assert flushes == [1, 1]
+
+def test_response_headers_cookies_and_binary_bodies():
+    headers = [(b"Content-Type", b"image/png"), (b"Vary", b"a"), (b"vary", b"b"),
+               (b"set-cookie", b"x=1"), (b"Set-Cookie", b"y=2")]
+    rest = _response({}, 200, headers, b"\x89PNG")
+    assert rest["headers"] == {"content-type": "image/png", "vary": "a,b"}
+    assert rest["isBase64Encoded"] and base64.b64decode(rest["body"]) == b"\x89PNG"
+    assert rest["multiValueHeaders"] == {"set-cookie": ["x=1", "y=2"]}
+    http = _response({"version": "2.0"}, 200, [(b"content-type", b"application/x-ndjson")], b"{}\n")
+    assert http["body"] == "{}\n" and not http["isBase64Encoded"] and http["cookies"] == []
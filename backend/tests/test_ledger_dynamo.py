@@ -0,0 +1,150 @@
+# DynamoLedgerStore against the in-process DynamoDB stand-in: batching, retries, requeue
+# on errors, draining on flush/close, paginated reads, and shedding runs while saturated.
+import pytest
+
+from app import main
+from app.core.dynamo_local import LocalDynamoDB
+from app.core.ledger import Ledger
+from app.core.ledger_dynamo import BATCH_LIMIT, DynamoLedgerStore, ensure_table
+
+TABLE = "test-ledger"
+
+def dynamo(**kw):
+    c = LocalDynamoDB(**kw)
+    ensure_table(c, TABLE)
+    return c
+
+def store(c, **kw):
+    kw.setdefault("background", False)
+    return DynamoLedgerStore(c, TABLE, base_backoff_s=0, max_backoff_s=0, **kw)
+
+def fill(s, n, run_id="run-1"):
+    ledger = Ledger(run_id=run_id, store=s)
+    for i in range(n):
+        ledger.add("COUNTEROFFER_RESPONSE", f"response {i}", round=i % 3, data={"i": i})
+    return ledger
+
+def test_append_only_queues():
+    c = dynamo()
+    s = store(c)
+    fill(s, 10)
+    assert c.calls.get("BatchWriteItem", 0) == 0
+    assert s.stats()["pending"] == 10
+
+def test_flush_writes_25_item_batches_in_order():
+    c = dynamo()
+    s = store(c)
+    fill(s, 2 * BATCH_LIMIT + 10)
+    s.flush()
+    assert c.calls["BatchWriteItem"] == 3
+    assert s.stats()["pending"] == 0
+    assert s.written == 60
+    assert [e.seq for e in s.query("run-1")] == list(range(1, 61))
+
+def test_unprocessed_items_are_retried():
+    c = dynamo(unprocessed_rate=0.3, seed=7)
+    s = store(c, max_attempts=50)
+    fill(s, 100)
+    s.flush()
+    assert s.retried > 0
+    assert c.calls["BatchWriteItem"] > 4
+    assert [e.seq for e in s.query("run-1")] == list(range(1, 101))
+
+def test_retries_give_up_after_max_attempts():
+    c = dynamo(unprocessed_rate=1.0)
+    s = store(c, max_attempts=3)
+    fill(s, 5)
+    with pytest.raises(RuntimeError, match="not written"):
+        s.flush()
+    assert c.calls["BatchWriteItem"] == 3
+    assert s.stats()["pending"] == 5
+
+def test_non_retryable_error_requeues_until_fixed():
+    c = LocalDynamoDB()  # no table yet
+    s = store(c)
+    fill(s, 30)
+    with pytest.raises(RuntimeError, match="ResourceNotFoundException"):
+        s.flush()
+    assert c.calls["BatchWriteItem"] == 1  # not retried at once
+    assert s.stats()["pending"] == 30
+    assert s.errors == 1
+    ensure_table(c, TABLE)
+    s.flush()
+    assert s.stats()["pending"] == 0
+    assert [e.seq for e in s.query("run-1")] == list(range(1, 31))
+
+def test_saturated_store_still_queues_appends():
+    s = store(dynamo(), max_pending=5)
+    fill(s, 4)
+    assert not s.saturated
+    ledger = fill(s, 1, run_id="run-2")
+    assert s.saturated
+    ledger.add("COUNTEROFFER_RESPONSE", "past max_pending")  # never raises mid-run
+    assert s.stats()["pending"] == 6
+    s.flush()
+    assert not s.saturated
+
+def test_writer_threads_and_close_drain_everything():
+    c = dynamo(latency_s=0.001)
+    s = store(c, background=True, writers=3, flush_interval_s=0.01)
+    for r in range(4):
+        fill(s, 40, run_id=f"run-{r}")
+    s.close()
+    assert s.stats()["pending"] == 0
+    assert s.written == 160
+    for r in range(4):
+        assert [e.seq for e in s.query(f"run-{r}")] == list(range(1, 41))
+    with pytest.raises(RuntimeError, match="closed"):
+        fill(s, 1)
+
+def test_query_follows_pages_and_filters():
+    c = dynamo(page_items=7)
+    s = store(c)
+    fill(s, 30)
+    fill(s, 5, run_id="other")
+    before = c.calls.get("Query", 0)
+    events = s.query("run-1")
+    assert c.calls["Query"] - before == 5  # ceil(30 / 7)
+    assert [e.seq for e in events] == list(range(1, 31))
+    assert events[3].data == {"i": 3}
+    assert [e.seq for e in s.query("run-1", round=1)] == list(range(2, 31, 3))
+    assert s.query("run-1", type="BID_SUBMITTED") == []
+    assert s.replay("other") == s.query("other")
+
+# ---- through the API ----
+
+TASK = {"title": "Ledger test", "acceptance_criteria": ["POST /tasks creates a task"], "budget_usd": 250}
+
+def test_api_sheds_new_runs_while_saturated(client, monkeypatch):
+    c = LocalDynamoDB()  # no table: nothing drains
+    s = store(c, max_pending=3)
+    monkeypatch.setattr(main, "_store", s)
+    fill(s, 3)
+    for r in (
+        client.get("/demo/run-ui", params={"seed": 5}),
+        client.get("/demo/run-ui/summary", params={"seed": 5}),
+        client.get("/demo/run-ui/stream", params={"seed": 5}),
+        client.post("/demo/run"),
+    ):
+        assert r.status_code == 503
+        assert r.headers["retry-after"] == str(main.LEDGER_RETRY_AFTER_S)
+    assert s.stats()["pending"] == 3  # shed before logging anything
+    assert client.post("/run-ui", json=TASK).status_code == 200  # doesn't write the ledger
+    ensure_table(c, TABLE)
+    s.flush()
+    assert client.get("/demo/run-ui", params={"seed": 5}).status_code == 200
+
+def test_api_run_finishes_past_max_pending(client, monkeypatch):
+    c = LocalDynamoDB()  # no table until the run is over
+    s = store(c, max_pending=5)
+    monkeypatch.setattr(main, "_store", s)
+    r = client.get("/demo/run-ui", params={"seed": 5, "rounds": 3})
+    assert r.status_code == 200
+    events = r.json()["events"]
+    assert s.stats()["pending"] == len(events) > 5
+    assert client.get("/demo/run-ui", params={"seed": 6}).status_code == 503
+    ensure_table(c, TABLE)
+    s.flush()
+    run_id = events[0]["run_id"]
+    assert [e.seq for e in s.query(run_id)] == [e["seq"] for e in events]
+    assert client.get("/demo/run-ui", params={"seed": 6}).status_code == 200
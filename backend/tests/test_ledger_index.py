@@ -0,0 +1,116 @@
+# The JSONL ledger's sidecar offset index: lookups by run/type/round, and recovery when
+# a crash leaves the sidecar behind, ahead of, or torn against its segment.
+import pytest
+
+from app.core.ledger import Ledger
+from app.core.ledger_index import RECORD, SegmentIndex
+from app.core.ledger_store import JsonlLedgerStore
+
+def open_store(tmp_path, **kw):
+    return JsonlLedgerStore(tmp_path, durable=False, background=False, **kw)
+
+def fill(store, run_id, n, start=0):
+    ledger = Ledger(run_id=run_id, store=store)
+    ledger._seq = start
+    return [ledger.add("COUNTEROFFER_RESPONSE", f"{run_id} {i}", round=i % 4, data={"i": i}) for i in range(start, start + n)]
+
+def seqs(events):
+    return [e.seq for e in events]
+
+def only_segment(tmp_path):
+    (seg,) = sorted(tmp_path.glob("ledger-*.jsonl"))
+    return seg, seg.with_suffix(".idx")
+
+def line_ends(seg):
+    ends, pos = [], 0
+    for line in seg.read_bytes().splitlines(keepends=True):
+        pos += len(line)
+        ends.append(pos)
+    return ends
+
+def test_lookups_match_a_full_scan(tmp_path):
+    store = open_store(tmp_path, segment_bytes=4096)  # several segments
+    for r in range(5):
+        fill(store, f"run-{r}", 30)
+    assert len(store.segments()) > 2
+    for run_id in ("run-0", "run-3"):
+        scan = sorted(store.iter_events(run_id), key=lambda e: e.seq)
+        assert store.query(run_id) == scan
+        assert store.query(run_id, round=2) == [e for e in scan if e.round == 2]
+        assert store.query(run_id, type="COUNTEROFFER_RESPONSE", round=1) == [e for e in scan if e.round == 1]
+        assert store.query(run_id, type="BID_SUBMITTED") == []
+    assert store.query("missing") == []
+    store.close()
+
+def test_index_survives_reopen(tmp_path):
+    store = open_store(tmp_path)
+    fill(store, "a", 20)
+    store.close()
+    store = open_store(tmp_path)
+    assert seqs(store.query("a")) == list(range(1, 21))
+    store.close()
+
+def test_sidecar_behind_segment_catches_up(tmp_path):
+    store = open_store(tmp_path)
+    fill(store, "a", 20)
+    store.close()
+    seg, idx = only_segment(tmp_path)
+    idx.write_bytes(idx.read_bytes()[: 5 * RECORD.size])  # fsync'd events missing from the index
+    store = open_store(tmp_path)
+    assert seqs(store.query("a")) == list(range(1, 21))
+    store.close()
+    assert idx.stat().st_size == 20 * RECORD.size
+
+def test_sidecar_missing_is_rebuilt(tmp_path):
+    store = open_store(tmp_path)
+    fill(store, "a", 10)
+    store.close()
+    only_segment(tmp_path)[1].unlink()
+    store = open_store(tmp_path)
+    assert seqs(store.query("a", round=3)) == [4, 8]
+    store.close()
+
+@pytest.mark.parametrize("keep", [0, 7, 12])
+def test_sidecar_ahead_of_segment_is_cut_back(tmp_path, keep):
+    # The segment lost its unsynced tail but the sidecar's records for it survived.
+    store = open_store(tmp_path)
+    fill(store, "a", 15)
+    store.close()
+    seg, idx = only_segment(tmp_path)
+    with open(seg, "r+b") as fh:
+        fh.truncate(line_ends(seg)[keep - 1] if keep else 0)
+    store = open_store(tmp_path)
+    assert seqs(store.query("a")) == list(range(1, keep + 1))
+    fill(store, "b", 6)  # new events land where the lost ones were
+    assert seqs(store.query("b")) == list(range(1, 7))
+    assert seqs(store.query("a")) == list(range(1, keep + 1))
+    store.close()
+    store = open_store(tmp_path)
+    assert [e.summary for e in store.query("b")] == [f"b {i}" for i in range(6)]
+    assert seqs(store.query("a")) == list(range(1, keep + 1))
+    store.close()
+
+def test_torn_sidecar_record_is_dropped(tmp_path):
+    store = open_store(tmp_path)
+    fill(store, "a", 8)
+    store.close()
+    seg, idx = only_segment(tmp_path)
+    idx.write_bytes(idx.read_bytes()[: 3 * RECORD.size + 5])
+    store = open_store(tmp_path)
+    fill(store, "a", 4, start=8)
+    assert seqs(store.query("a")) == list(range(1, 13))
+    store.close()
+    assert idx.stat().st_size % RECORD.size == 0
+
+def test_segment_index_on_torn_segment_line(tmp_path):
+    store = open_store(tmp_path)
+    fill(store, "a", 3)
+    store.close()
+    seg, idx = only_segment(tmp_path)
+    idx.unlink()
+    with open(seg, "ab") as fh:
+        fh.write(b'{"run_id": "a", "seq"')  # crash mid-write
+    index = SegmentIndex(seg)
+    assert index.catch_up() == 3
+    assert index.covered == line_ends(seg)[2]
+    index.close()
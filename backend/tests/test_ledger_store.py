@@ -0,0 +1,140 @@
+# JsonlLedgerStore: replay equals what the ledger recorded, across segment rotation,
+# reopen and a torn tail; fsyncs are grouped and, with the flusher, off the caller's thread.
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.ledger import Ledger
+from app.core.ledger_store import JsonlLedgerStore, MemoryLedgerStore, segment_name
+from app.sim.demo import run_demo
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    # Thread names of every os.fsync call.
+    calls = []
+    real = os.fsync
+
+    def fsync(fd):
+        calls.append(threading.current_thread().name)
+        real(fd)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    return calls
+
+def fill(store, run_id, n):
+    ledger = Ledger(run_id=run_id, store=store)
+    return [ledger.add("COUNTEROFFER_RESPONSE", f"{run_id} {i}", round=i % 3, data={"i": i}) for i in range(n)]
+
+def replayed(path, run_id):
+    store = JsonlLedgerStore(path, durable=False, background=False)
+    events = store.replay(run_id)
+    store.close()
+    return events
+
+def dumps(events):
+    return [e.model_dump() for e in events]
+
+@pytest.mark.parametrize("index", [True, False])
+def test_replay_matches_the_ledger(tmp_path, index):
+    store = JsonlLedgerStore(tmp_path, background=False, index=index)
+    report = asyncio.run(run_demo(seed=3, rounds=2, store=store))
+    fill(store, "other", 5)
+    stored = store.replay(report.events[0].run_id)
+    assert [e.model_dump_json() for e in stored] == [e.model_dump_json() for e in report.events]
+    assert [e.summary for e in store.replay("other")] == [f"other {i}" for i in range(5)]
+    store.close()
+
+def test_append_reports_where_the_line_landed(tmp_path):
+    store = JsonlLedgerStore(tmp_path, durable=False, background=False)
+    ledger = Ledger(run_id="a")
+    positions = [store.append(ledger.add("COUNTEROFFER_RESPONSE", f"e{i}")) for i in range(3)]
+    store.close()
+    data = (tmp_path / segment_name(1)).read_bytes()
+    assert [p[0] for p in positions] == [segment_name(1)] * 3
+    assert positions[0][1] == 0
+    assert positions[1][1] == positions[0][2] and positions[2][1] == positions[1][1] + positions[1][2]
+    assert sum(p[2] for p in positions) == len(data)
+
+def test_segments_rotate_and_replay_across_them(tmp_path):
+    store = JsonlLedgerStore(tmp_path, segment_bytes=2048, background=False)
+    events = fill(store, "a", 60)
+    store.close()
+    segs = sorted(tmp_path.glob("ledger-*.jsonl"))
+    assert len(segs) > 3
+    assert all(s.stat().st_size <= 2048 for s in segs)
+    store = JsonlLedgerStore(tmp_path, segment_bytes=2048, background=False)
+    assert dumps(store.replay("a")) == dumps(events)
+    assert dumps(store.iter_events("a")) == dumps(events)
+    store.close()
+
+def test_reopen_appends_to_the_last_segment(tmp_path):
+    store = JsonlLedgerStore(tmp_path, background=False)
+    fill(store, "a", 3)
+    store.close()
+    store = JsonlLedgerStore(tmp_path, background=False)
+    fill(store, "b", 2)
+    store.close()
+    assert [s.name for s in tmp_path.glob("ledger-*.jsonl")] == [segment_name(1)]
+    store = JsonlLedgerStore(tmp_path, background=False)
+    assert len(store.replay("a")) == 3 and len(store.replay("b")) == 2
+    store.close()
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    store = JsonlLedgerStore(tmp_path, background=False)
+    fill(store, "a", 4)
+    store.close()
+    seg = tmp_path / segment_name(1)
+    whole = seg.stat().st_size
+    with open(seg, "ab") as fh:
+        fh.write(b'{"run_id": "a", "seq": 5, "ty')  # crash mid-write
+    store = JsonlLedgerStore(tmp_path, background=False)
+    assert seg.stat().st_size == whole
+    fill(store, "b", 2)
+    assert [e.seq for e in store.replay("a")] == [1, 2, 3, 4]
+    assert [e.seq for e in store.iter_events("b")] == [1, 2]
+    store.close()
+
+def test_fsyncs_are_grouped(tmp_path, fsyncs):
+    store = JsonlLedgerStore(tmp_path, background=False, fsync_batch=4, fsync_interval_s=3600)
+    fill(store, "a", 10)
+    assert len(fsyncs) == 2
+    store.flush()
+    assert len(fsyncs) == 3
+    store.flush()  # nothing pending
+    assert len(fsyncs) == 3
+    store.close()
+
+def test_rotation_syncs_the_finished_segment(tmp_path, fsyncs):
+    store = JsonlLedgerStore(tmp_path, segment_bytes=1024, background=False, fsync_interval_s=3600)
+    fill(store, "a", 20)
+    rotations = len(list(tmp_path.glob("ledger-*.jsonl"))) - 1
+    assert rotations and len(fsyncs) == rotations
+    store.close()
+
+def test_not_durable_never_fsyncs(tmp_path, fsyncs):
+    store = JsonlLedgerStore(tmp_path, durable=False, fsync_batch=1)
+    fill(store, "a", 10)
+    store.close()
+    assert fsyncs == []
+    assert len(replayed(tmp_path, "a")) == 10
+
+def test_background_flusher_syncs_off_the_appending_thread(tmp_path, fsyncs):
+    store = JsonlLedgerStore(tmp_path, segment_bytes=4096, fsync_batch=8, fsync_interval_s=0.01)
+    fill(store, "a", 40)  # several full batches and rotations
+    deadline = time.monotonic() + 5
+    while not fsyncs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fsyncs and set(fsyncs) == {"ledger-fsync"}
+    store.close()
+    assert len(replayed(tmp_path, "a")) == 40
+
+def test_memory_store_queries():
+    store = MemoryLedgerStore()
+    events = fill(store, "a", 9)
+    assert dumps(store.replay("a")) == dumps(events)
+    assert [e.seq for e in store.query("a", round=1)] == [2, 5, 8]
+    assert store.query("a", type="BID_SUBMITTED") == []
+    assert store.query("missing") == []
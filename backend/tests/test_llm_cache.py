@@ -0,0 +1,98 @@
+# CachedLLM: memory and SQLite tiers, single-flight generation, and the disk tier under
+# concurrent to_thread workers.
+import asyncio
+import threading
+
+import pytest
+
+from app.llm.cache import CachedLLM, _DiskTier
+
+class CountingLLM:
+    model = "counting"
+
+    def __init__(self, delay_s=0.0, fail=False):
+        self.delay_s = delay_s
+        self.fail = fail
+        self.calls = []
+
+    async def generate(self, prompt, *, system=None, format=None):
+        self.calls.append((prompt, system, format))
+        await asyncio.sleep(self.delay_s)
+        if self.fail:
+            raise RuntimeError("model down")
+        return f"note for {prompt}"
+
+def test_memory_hits_and_lru_bound():
+    llm = CountingLLM()
+    cached = CachedLLM(llm, max_entries=2)
+
+    async def go():
+        for p in ("a", "b", "a", "c", "b"):
+            await cached.generate(p, system="s")
+
+    asyncio.run(go())
+    assert [c[0] for c in llm.calls] == ["a", "b", "c", "b"]  # "b" was evicted by "c"
+    s = cached.stats()
+    assert (s["hits"], s["misses"], s["entries"]) == (1, 4, 2)
+
+def test_key_covers_model_system_and_format():
+    k = CachedLLM.key("m", "p", "s")
+    assert k != CachedLLM.key("m2", "p", "s")
+    assert k != CachedLLM.key("m", "p", "other")
+    assert k != CachedLLM.key("m", "p", "s", "json")
+    assert k == CachedLLM.key("m", "p", "s", None)
+
+def test_concurrent_misses_share_one_generation():
+    llm = CountingLLM(delay_s=0.01)
+    cached = CachedLLM(llm)
+
+    async def go():
+        return await asyncio.gather(*(cached.generate("same") for _ in range(10)))
+
+    assert set(asyncio.run(go())) == {"note for same"}
+    assert len(llm.calls) == 1
+    assert cached.stats()["shared_inflight"] == 9
+    assert cached.inflight == 0
+
+def test_failures_are_not_cached():
+    llm = CountingLLM(fail=True)
+    cached = CachedLLM(llm)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(cached.generate("x"))
+    assert len(llm.calls) == 2
+    assert cached.stats()["entries"] == 0
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "notes.sqlite")
+    first = CachedLLM(CountingLLM(), path=path)
+    asyncio.run(first.generate("p", system="s"))
+    asyncio.run(first.aclose())
+
+    llm = CountingLLM()
+    second = CachedLLM(llm, path=path)
+    assert asyncio.run(second.generate("p", system="s")) == "note for p"
+    assert llm.calls == []
+    assert second.stats()["disk_hits"] == 1
+    asyncio.run(second.aclose())
+
+def test_disk_tier_under_concurrent_threads(tmp_path):
+    tier = _DiskTier(str(tmp_path / "notes.sqlite"))
+    errors = []
+
+    def worker(w):
+        try:
+            for i in range(200):
+                tier.put(f"{w}-{i}", f"v{i}")
+                assert tier.get(f"{w}-{i}") == f"v{i}"
+        except Exception as e:  # surfaced below; a thread's exception is otherwise lost
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert tier.get("7-199") == "v199"
+    tier.close()
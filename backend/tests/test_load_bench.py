@@ -0,0 +1,110 @@
+# The load generator's closed loop, its percentiles and warm-up, and the suite's baseline
+# comparison that decides whether a run regressed.
+import argparse
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+from bench import load
+from bench.load import drive, percentile, request_for
+from bench.suite import compare
+
+@pytest.mark.parametrize("q", [0, 50, 95, 99, 100])
+def test_percentile_interpolates_like_numpy(q):
+    ms = sorted(np.random.default_rng(3).exponential(40, 101).tolist())
+    assert percentile(ms, q) == pytest.approx(float(np.percentile(ms, q)))
+    assert percentile([7.0], q) == 7.0
+
+def test_percentile_of_nothing_is_nan():
+    assert np.isnan(percentile([], 50))
+
+def test_requests_are_distinct_tasks_and_seeds():
+    method, url, kw = request_for("run-ui", 3, 2)
+    assert (method, url) == ("POST", "/run-ui") and kw["json"]["title"].endswith("#3") and kw["json"]["use_llm"]
+    assert request_for("demo-run-ui", 4, 6) == ("GET", "/demo/run-ui", {"params": {"seed": 4, "rounds": 6, "adaptive": "false"}})
+
+def serve(status=lambda request: 200):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.params["seed"])
+        return httpx.Response(status(request))
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://load"), seen
+
+def test_drive_stops_at_max_requests_and_counts_errors():
+    client, seen = serve(lambda r: 500 if int(r.url.params["seed"]) % 3 == 0 else 200)
+
+    async def go():
+        async with client:
+            return await drive(client, lambda i: request_for("demo-run-ui", i, 1),
+                               concurrency=4, duration_s=30, max_requests=10)
+
+    latencies, errors, elapsed = asyncio.run(go())
+    assert sorted(seen, key=int) == [str(i) for i in range(10)]
+    assert (len(latencies), errors) == (6, 4) and elapsed < 30
+
+def test_transport_errors_count_as_errors():
+    def broken(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(broken), base_url="http://load") as client:
+            return await drive(client, lambda i: request_for("run-ui", i, 1), concurrency=2, duration_s=30, max_requests=5)
+
+    latencies, errors, _ = asyncio.run(go())
+    assert (latencies, errors) == ([], 5)
+
+@pytest.fixture
+def drives(monkeypatch):
+    calls = []
+
+    async def fake_drive(client, make, *, concurrency, duration_s, max_requests):
+        calls.append((make(0)[1], duration_s, max_requests))
+        return [1.0, 3.0], 1, 2.0
+
+    async def ready(url):
+        pass
+
+    monkeypatch.setattr(load, "drive", fake_drive)
+    monkeypatch.setattr(load, "wait_ready", ready)
+    return calls
+
+def args(**kw):
+    base = dict(url="http://load", endpoints="run-ui,demo-run-ui", concurrency=2, duration=5.0, requests=0,
+                warmup=0, rounds=2, latency_ms=200.0, timeout=5.0, port=0, stub_port=0)
+    return argparse.Namespace(**{**base, **kw})
+
+def test_no_warm_up_when_warmup_is_zero(drives):
+    results = asyncio.run(load.run(args(warmup=0)))
+    assert drives == [("/run-ui", 5.0, 0), ("/demo/run-ui", 5.0, 0)]
+    name = "load run-ui[c=2,llm=200ms]"
+    assert results[f"{name} p50"]["value"] == 2.0 and results[f"{name} req/s"]["value"] == 1.0
+    assert results[f"{name} errors"] == {"value": 1, "unit": "count", "better": "lower"}
+
+def test_warm_up_is_capped_by_count_before_each_timed_run(drives):
+    asyncio.run(load.run(args(warmup=3, requests=50)))
+    assert drives == [("/run-ui", 60, 3), ("/run-ui", 5.0, 50), ("/demo/run-ui", 60, 3), ("/demo/run-ui", 5.0, 50)]
+
+def test_unknown_endpoint(drives):
+    with pytest.raises(SystemExit):
+        asyncio.run(load.run(args(endpoints="run-ui,nope")))
+
+def doc(calibration, **values):
+    results = {name: {"value": v, "unit": "req/s" if name.endswith("rps") else "ms",
+                      "better": "higher" if name.endswith("rps") else "lower"} for name, v in values.items()}
+    return {"meta": {"calibration_ms": calibration}, "results": results}
+
+def test_compare_flags_regressions_in_either_direction(capsys):
+    base = doc(10.0, fast_ms=10.0, slow_ms=10.0, rps=100.0, gone_ms=1.0)
+    new = doc(10.0, fast_ms=7.0, slow_ms=13.0, rps=70.0, added_ms=1.0)
+    assert compare(base, new, 0.25) == ["rps", "slow_ms"]
+    out = capsys.readouterr().out
+    assert "missing from the new results" in out and "new (no baseline)" in out
+
+def test_compare_can_normalize_by_calibration():
+    base, new = doc(10.0, t_ms=10.0, rps=100.0), doc(20.0, t_ms=19.0, rps=52.0)  # a machine half as fast
+    assert compare(base, new, 0.25) == ["rps", "t_ms"]
+    assert compare(base, new, 0.25, normalize=True) == []
@@ -0,0 +1,72 @@
+# The market simulator is a pure function of its config: the same seeds give the same
+# rows and aggregates whatever the worker count or output format.
+import csv
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.sim.market import (
+    ARCHETYPES, RUN_FIELDS, Aggregate, SimConfig, main, simulate, stream_seed, synthetic_pool, synthetic_task,
+)
+
+def read_rows(path):
+    with open(path, newline="") as fh:
+        return sorted(csv.DictReader(fh), key=lambda r: (int(r["task_idx"]), int(r["seed"])))
+
+def test_stream_seed_ignores_hash_randomization():
+    code = "from app.sim.market import stream_seed; print(stream_seed(0, 'task', 3))"
+    outs = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": h, "PYTHONPATH": str(Path(__file__).resolve().parents[1])},
+        ).stdout.strip()
+        for h in ("0", "1", "random")
+    }
+    assert outs == {str(stream_seed(0, "task", 3))}
+
+def test_synthetic_inputs_are_seeded():
+    assert synthetic_task(1, 4) == synthetic_task(1, 4)
+    assert synthetic_task(1, 4) != synthetic_task(2, 4)
+    assert synthetic_pool(1, 4, 12) == synthetic_pool(1, 4, 12)
+    pool = synthetic_pool(1, 4, 12)
+    assert [p.freelancer_id.split("#")[0] for p in pool[:len(ARCHETYPES)]] == list(ARCHETYPES)
+    assert len({p.freelancer_id for p in pool}) == 12
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_worker_count_does_not_change_results(tmp_path, workers):
+    cfg = SimConfig(base_seed=5, pool_size=7, rounds=2)
+    one, _ = simulate(cfg, 6, 4, workers=1, out=str(tmp_path / "one.csv"))
+    many, _ = simulate(cfg, 6, 4, workers=workers, out=str(tmp_path / "many.csv"), chunksize=3)
+    assert read_rows(tmp_path / "one.csv") == read_rows(tmp_path / "many.csv")
+    assert one.rows() == many.rows()
+    assert one.runs == 24
+
+def test_rows_and_aggregate_agree(tmp_path):
+    out = str(tmp_path / "runs.csv")
+    agg, _ = simulate(SimConfig(base_seed=2, pool_size=5), 5, 3, workers=1, out=out)
+    rows = read_rows(out)
+    assert list(rows[0]) == RUN_FIELDS
+    assert [(int(r["task_idx"]), int(r["seed"])) for r in rows] == [(t, s) for t in range(5) for s in range(3)]
+    summary = {r["profile"]: r for r in agg.rows()}
+    assert sum(r["wins"] for r in summary.values()) == agg.runs == len(rows)
+    for p, r in summary.items():
+        won = [x for x in rows if x["winner_profile"] == p]
+        assert r["wins"] == len(won)
+        if won:
+            assert r["avg_winning_price_usd"] == pytest.approx(sum(float(x["winner_price_usd"]) for x in won) / len(won), abs=1e-4)
+        for x in won:
+            assert float(x["savings_usd"]) == pytest.approx(float(x["winner_initial_price_usd"]) - float(x["winner_price_usd"]))
+
+def test_empty_aggregate():
+    assert all(r["wins"] == 0 and r["win_rate"] == 0.0 and r["avg_winning_price_usd"] is None for r in Aggregate().rows())
+
+def test_cli_writes_runs_and_summary(tmp_path, capsys):
+    runs, summary = tmp_path / "runs.csv", tmp_path / "summary.csv"
+    main(["--tasks", "3", "--seeds", "2", "--workers", "1", "--out", str(runs), "--summary", str(summary)])
+    assert "6 runs in" in capsys.readouterr().out
+    assert len(read_rows(runs)) == 6
+    with open(summary, newline="") as fh:
+        assert sum(int(r["wins"]) for r in csv.DictReader(fh)) == 6
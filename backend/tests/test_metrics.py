@@ -0,0 +1,85 @@
+# Stage spans feed both the Prometheus histograms behind /metrics and the per-request
+# Server-Timing header; METRICS=0 turns all of it off.
+import asyncio
+import re
+
+import pytest
+
+from app.core import metrics
+from app.core.metrics import BUCKETS, Registry, collect, server_timing, span, timed
+
+@pytest.fixture
+def disabled():
+    metrics.set_enabled(False)
+    yield
+    metrics.set_enabled(True)
+
+def test_histogram_buckets_render_cumulatively():
+    reg = Registry()
+    h = reg.histogram("x_seconds", stage='a"b')
+    for s in (0.0001, 0.0005, 0.003, 99.0):
+        h.observe(s)
+    assert reg.histogram("x_seconds", stage='a"b') is h
+    text = reg.render()
+    assert text.startswith("# TYPE x_seconds histogram\n")
+    assert 'x_seconds_bucket{stage="a\\"b",le="0.0005"} 2' in text
+    assert 'x_seconds_bucket{stage="a\\"b",le="0.005"} 3' in text
+    assert 'x_seconds_bucket{stage="a\\"b",le="+Inf"} 4' in text
+    assert 'x_seconds_count{stage="a\\"b"} 4' in text
+    assert len(re.findall(r"_bucket\{", text)) == len(BUCKETS) + 1
+
+def test_spans_accumulate_per_request_scope():
+    @timed("t.sync")
+    def work():
+        return 1
+
+    @timed("t.async")
+    async def awork():
+        await asyncio.sleep(0)
+        return 2
+
+    async def request():
+        with collect() as acc:
+            with span("t.outer"):
+                await asyncio.gather(awork(), awork())  # child tasks share the request's dict
+                work()
+            return acc
+
+    acc = asyncio.run(request())
+    assert {k: v[1] for k, v in acc.items()} == {"t.async": 2, "t.sync": 1, "t.outer": 1}
+    assert acc["t.outer"][0] >= acc["t.sync"][0]
+    with span("t.outside"):  # no scope: histogram only
+        pass
+    assert metrics._stage_hists["t.outside"].count >= 1
+
+def test_disabled_spans_are_noops(disabled):
+    with collect() as acc:
+        with span("t.off") as s:
+            pass
+        assert timed("t.off")(lambda: 3)() == 3
+    assert acc == {} and s is metrics._NOOP
+
+def test_server_timing_header():
+    header = server_timing({"llm.generate": [0.0123, 3], "bids_collect": [0.5, 1]}, 0.75)
+    assert header == (
+        'llm-generate;dur=12.30;desc="llm.generate x3", '
+        'bids-collect;dur=500.00;desc="bids_collect x1", total;dur=750.00'
+    )
+
+def test_responses_carry_server_timing(client):
+    r = client.get("/demo/run-ui", params={"seed": 11})
+    tokens = {part.split(";")[0].strip() for part in r.headers["server-timing"].split(",")}
+    assert {"total", "bids-collect"} <= tokens
+    assert client.get("/health").headers["server-timing"].startswith("total;dur=")
+
+def test_metrics_endpoint(client):
+    client.get("/health")
+    client.get("/no-such-route")
+    client.get("/demo/run-ui", params={"seed": 12})
+    text = client.get("/metrics").text
+    assert re.search(r'taskbounty_request_seconds_count\{method="GET",route="/health"\} [1-9]', text)
+    assert 'route="unmatched"' in text
+    assert re.search(r'taskbounty_stage_seconds_count\{stage="bids.collect"\} [1-9]', text)
+
+def test_no_header_when_disabled(client, disabled):
+    assert "server-timing" not in client.get("/health").headers
@@ -0,0 +1,75 @@
+# Adaptive negotiation is opt-in: without a StopRule every requested round runs; with
+# one, negotiation ends once the top-k and prices settle, and never past max_rounds.
+import asyncio
+
+import pytest
+
+from app import main
+from app.sim.demo import run_demo
+from app.sim.negotiation import Convergence, StopRule
+
+def row(fid, price):
+    return {"freelancer_id": fid, "price_usd": price}
+
+def moved(*deltas):
+    return [(row("a", 100.0), row("a", 100.0 - d)) for d in deltas]
+
+def test_convergence_needs_patience_stable_rounds():
+    c = Convergence(StopRule(top_k=2, price_eps_usd=0.5, patience=2), ["a", "b"])
+    assert c.update(["a", "b"], moved(0.1, 0.4)) is None
+    assert c.stable_rounds == 1 and c.max_price_delta == pytest.approx(0.4)
+    assert c.update(["a", "b"], moved(0.0)) == "converged"
+
+def test_top_change_or_price_move_resets_the_count():
+    c = Convergence(StopRule(patience=2), ["a", "b"])
+    c.update(["a", "b"], moved(0.1))
+    assert c.update(["b", "a"], moved(0.1)) is None and c.stable_rounds == 0
+    c.update(["b", "a"], moved(0.1))
+    assert c.update(["b", "a"], moved(0.1, 3.0)) is None and c.stable_rounds == 0
+    assert c.update(["b", "a"], []) is None  # no responses: nothing moved
+    assert c.update(["b", "a"], []) == "converged"
+
+def test_time_budget():
+    c = Convergence(StopRule(patience=5, budget_s=0.0), ["a"])
+    assert c.update(["b"], moved(5.0)) == "time_budget"
+
+def events_of(report, type):
+    return [e for e in report.events if e.type == type]
+
+def test_fixed_runs_every_round_without_a_stop_event():
+    report = asyncio.run(run_demo(seed=42, rounds=12))
+    assert len(events_of(report, "ROUND_COMPLETE")) == 12
+    assert events_of(report, "NEGOTIATION_STOPPED") == []
+
+@pytest.mark.parametrize("seed", [1, 42, 99])
+def test_adaptive_stops_on_convergence_with_the_fixed_prefix(seed):
+    rule = StopRule(patience=2, max_rounds=40)
+    adaptive = asyncio.run(run_demo(seed=seed, rounds=40, stop=rule))
+    (stopped,) = events_of(adaptive, "NEGOTIATION_STOPPED")
+    assert stopped.data["reason"] == "converged"
+    n = stopped.data["rounds_run"]
+    assert n < 40 and stopped.data["stable_rounds"] == 2
+    assert len(events_of(adaptive, "ROUND_COMPLETE")) == n
+
+    fixed = asyncio.run(run_demo(seed=seed, rounds=n))
+    strip = lambda r: [(e.type, e.round, e.data) for e in r.events if e.type != "NEGOTIATION_STOPPED"]
+    assert strip(adaptive) == strip(fixed)
+    assert adaptive.winner_id == fixed.winner_id
+
+@pytest.mark.parametrize("rounds, reason, ran", [(10, "max_rounds", 3), (3, "rounds_exhausted", 3), (0, "rounds_exhausted", 0)])
+def test_adaptive_never_runs_past_its_caps(rounds, reason, ran):
+    report = asyncio.run(run_demo(seed=7, rounds=rounds, stop=StopRule(patience=100, max_rounds=3)))
+    (stopped,) = events_of(report, "NEGOTIATION_STOPPED")
+    assert (stopped.data["reason"], stopped.data["rounds_run"]) == (reason, ran)
+    assert stopped.data["rounds_requested"] == rounds
+
+def test_endpoint_round_limits(client, monkeypatch):
+    monkeypatch.setattr(main, "NEGOTIATION_MAX_ROUNDS", 5)
+    assert client.get("/demo/run-ui", params={"rounds": 6}).status_code == 422
+    assert client.get("/demo/run-ui/summary", params={"rounds": -1}).status_code == 422
+    assert client.get("/demo/run-ui", params={"rounds": 5}).status_code == 200
+
+    r = client.get("/demo/run-ui", params={"rounds": 30, "adaptive": "true"})
+    assert r.status_code == 200
+    (stopped,) = [e for e in r.json()["events"] if e["type"] == "NEGOTIATION_STOPPED"]
+    assert stopped["data"]["rounds_run"] <= 5 and stopped["data"]["max_rounds"] == 5
@@ -0,0 +1,128 @@
+# RoundRanking and run_demo's per-round ranking must match the scalar score_bid path
+# exactly: score_history, the ROUND_COMPLETE top 3 and the winner.
+import asyncio
+import random
+
+import pytest
+
+from app.agents.freelancer import quote_bid
+from app.core.fast_json import dumps
+from app.core.models import Bid
+from app.core.scoring import score_bid
+from app.sim.demo import DEFAULT_WEIGHTS, run_demo
+from app.sim.market import synthetic_pool, synthetic_task
+from app.sim.ranking import RoundRanking
+
+TERMS = ("price_term", "eta_term", "quality_term", "risk_term", "total")
+
+def scalar(bids, budget, weights):
+    max_eta = max(b.eta_days for b in bids)
+    return [score_bid(b, budget, max_eta, weights) for b in bids]
+
+def scalar_order(scores):
+    # What the scalar path did: list.sort(reverse=True) on totals, ties in book order.
+    order = list(range(len(scores)))
+    order.sort(key=lambda i: scores[i].total, reverse=True)
+    return order
+
+def assert_ranking(ranking, bids, budget, weights, k=3):
+    want = scalar(bids, budget, weights)
+    for i, w in enumerate(want):
+        got = ranking.breakdown(i)
+        for term in TERMS:
+            assert getattr(got, term) == getattr(w, term), (bids[i].freelancer_id, term)
+    order = scalar_order(want)
+    top = [(bids[i].freelancer_id, want[i].total) for i in order[:k]]
+    assert ranking.top(k) == top  # heap path, before order() is built
+    assert ranking.order() == order
+    assert ranking.top(k) == top
+
+def perturb(bids, rng, fraction):
+    out = list(bids)
+    for i in rng.sample(range(len(out)), max(1, int(len(out) * fraction))):
+        b = out[i]
+        field = rng.choice(["price_usd", "eta_days", "confidence", "risk_flags"])
+        if field == "price_usd":
+            b = b.model_copy(update={"price_usd": round(b.price_usd * rng.uniform(0.8, 1.1), 2)})
+        elif field == "eta_days":
+            b = b.model_copy(update={"eta_days": max(0, b.eta_days + rng.choice([-3, -1, 1, 9]))})
+        elif field == "confidence":
+            b = b.model_copy(update={"confidence": min(1.0, b.confidence + 0.05)})
+        else:
+            b = b.model_copy(update={"risk_flags": b.risk_flags + ["late_delivery"]})
+        out[i] = b
+    return out
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("weights", [DEFAULT_WEIGHTS, {"price": 1.0, "eta": 2.0, "quality": 0.5, "risk": 0.0}])
+def test_incremental_updates_match_scalar(seed, weights):
+    task = synthetic_task(seed, 0)
+    bids = [quote_bid(task, p) for p in synthetic_pool(seed, 0, 60)]
+    rng = random.Random(seed)
+    ranking = RoundRanking(task.budget_usd, weights)
+    ranking.update(bids)
+    assert_ranking(ranking, bids, task.budget_usd, weights)
+    for fraction in (0.0, 0.05, 0.3, 1.0, 0.1):
+        bids = perturb(bids, rng, fraction) if fraction else bids
+        ranking.update(bids)
+        assert_ranking(ranking, bids, task.budget_usd, weights)
+
+def test_max_eta_moving_down_rescales_everyone():
+    bids = [Bid(freelancer_id=f"f{i}", price_usd=100.0 + i, eta_days=3 + i, confidence=0.7, portfolio_score=0.6)
+            for i in range(5)]
+    ranking = RoundRanking(250.0, DEFAULT_WEIGHTS)
+    ranking.update(bids)
+    bids[-1] = bids[-1].model_copy(update={"eta_days": 1})
+    ranking.update(bids)
+    assert ranking.rescored == 6
+    assert_ranking(ranking, bids, 250.0, DEFAULT_WEIGHTS)
+
+def test_ties_keep_book_order():
+    same = dict(price_usd=120.0, eta_days=4, confidence=0.7, portfolio_score=0.6)
+    bids = [Bid(freelancer_id=f"f{i}", **same) for i in range(6)]
+    bids[3] = bids[3].model_copy(update={"price_usd": 90.0})
+    ranking = RoundRanking(250.0, DEFAULT_WEIGHTS)
+    ranking.update(bids)
+    assert [fid for fid, _ in ranking.top(4)] == ["f3", "f0", "f1", "f2"]
+    assert_ranking(ranking, bids, 250.0, DEFAULT_WEIGHTS, k=6)
+
+def books_by_round(report):
+    # The book as scored at the end of each round (round 0: as submitted), from the ledger.
+    book, books = {}, {}
+    for e in report.events:
+        if e.type == "BID_SUBMITTED":
+            book[e.data["freelancer_id"]] = Bid(**e.data)
+            continue
+        if book:
+            books.setdefault(0, list(book.values()))
+        if e.type == "COUNTEROFFER_RESPONSE":
+            book[e.data["after"]["freelancer_id"]] = Bid(**e.data["after"])
+        elif e.type == "ROUND_COMPLETE":
+            books[e.round] = list(book.values())
+    return books
+
+@pytest.mark.parametrize("seed", [1, 7, 42, 99])
+@pytest.mark.parametrize("rounds", [0, 1, 3, 5])
+def test_demo_matches_scalar_path(seed, rounds):
+    report = asyncio.run(run_demo(seed=seed, rounds=rounds))
+    budget, w = report.task.budget_usd, report.weights
+    books = books_by_round(report)
+    assert sorted(books) == list(range(rounds + 1))
+    complete = {e.round: e for e in report.events if e.type == "ROUND_COMPLETE"}
+    for r, bids in books.items():
+        scores = scalar(bids, budget, w)
+        order = scalar_order(scores)
+        rows = [{
+            "round": r, "freelancerId": bids[i].freelancer_id, "total": scores[i].total,
+            "price": scores[i].price_term, "eta": scores[i].eta_term,
+            "quality": scores[i].quality_term, "risk": scores[i].risk_term,
+        } for i in order]
+        got = [row for row in report.score_history if row["round"] == r]
+        assert dumps(got) == dumps(rows)
+        if r:
+            top3 = [[bids[i].freelancer_id, scores[i].total] for i in order[:3]]
+            assert dumps(complete[r].data["top3"]) == dumps(top3)
+    final = books[rounds]
+    scores = scalar(final, budget, w)
+    assert report.winner_id == final[scalar_order(scores)[0]].freelancer_id
+    assert {b.freelancer_id: s for b, s in zip(final, scores)} == report.scores
@@ -0,0 +1,69 @@
+# FreelancerRegistry.shortlist must keep everyone who could reach the top k of the full
+# pool, including profiles written by another process after the first shortlist.
+import pytest
+
+from app.agents.freelancer import FreelancerProfile, quote_bid
+from app.agents.registry import FreelancerRegistry, open_registry
+from app.core.scoring import score_bids
+from app.sim.demo import DEFAULT_WEIGHTS
+from app.sim.market import synthetic_pool, synthetic_task
+
+def full_pool_cut(registry, task, weights, k, exclude=()):
+    # Ids whose exact score is >= the k-th best over the whole eligible pool.
+    pool = [p for p in registry.all() if not set(p.risk_flags) & set(exclude)]
+    bids = [quote_bid(task, p) for p in pool]
+    totals = score_bids(bids, task.budget_usd, weights).total.tolist()
+    kth = sorted(totals, reverse=True)[min(k, len(totals)) - 1]
+    return {p.freelancer_id for p, t in zip(pool, totals) if t >= kth}, max(b.eta_days for b in bids)
+
+@pytest.mark.parametrize("k", [1, 3, 10])
+@pytest.mark.parametrize("task_idx", [0, 1, 2])
+def test_shortlist_keeps_the_full_pool_top_k(k, task_idx):
+    reg = FreelancerRegistry()
+    reg.upsert(synthetic_pool(0, 0, 2000))
+    task = synthetic_task(0, task_idx)
+    short = reg.shortlist(task, DEFAULT_WEIGHTS, k)
+    want, max_eta = full_pool_cut(reg, task, DEFAULT_WEIGHTS, k)
+    assert {p.freelancer_id for p in short.freelancers} == want
+    assert short.max_eta_days == max_eta
+    assert short.pool_size == 2000
+    assert short.scanned < 2000
+
+def test_shortlist_honours_exclude_flags():
+    reg = open_registry(":memory:", seed=synthetic_pool(1, 0, 500))
+    task = synthetic_task(1, 0)
+    exclude = ["copy_paste_history"]
+    short = reg.shortlist(task, DEFAULT_WEIGHTS, 5, exclude_flags=exclude)
+    assert {p.freelancer_id for p in short.freelancers} == full_pool_cut(reg, task, DEFAULT_WEIGHTS, 5, exclude)[0]
+    assert not any("copy_paste_history" in p.risk_flags for p in short.freelancers)
+
+def star(fid):
+    return FreelancerProfile(fid, 1.0, 1, 10.0, [])
+
+def test_upsert_invalidates_cached_groups():
+    reg = open_registry(":memory:")
+    task = synthetic_task(0, 0)
+    v = reg.version
+    reg.shortlist(task, DEFAULT_WEIGHTS, 1)
+    reg.upsert([star("star")])
+    assert reg.version > v
+    assert [p.freelancer_id for p in reg.shortlist(task, DEFAULT_WEIGHTS, 1).freelancers] == ["star"]
+
+def test_writes_from_another_connection_are_seen(tmp_path):
+    # e.g. `python -m app.agents.registry --synthetic N` while the API is running.
+    path = str(tmp_path / "freelancers.sqlite")
+    api = open_registry(path)
+    task = synthetic_task(0, 0)
+    before = api.shortlist(task, DEFAULT_WEIGHTS, 1)
+    v = api.version
+    assert v == api.version  # stable while nothing changes
+
+    cli = FreelancerRegistry(path)
+    cli.upsert([star("star")])
+    cli.close()
+
+    assert api.version > v
+    after = api.shortlist(task, DEFAULT_WEIGHTS, 1)
+    assert [p.freelancer_id for p in after.freelancers] == ["star"]
+    assert after.pool_size == before.pool_size + 1
+    api.close()
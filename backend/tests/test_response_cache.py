@@ -0,0 +1,77 @@
+# The result cache: single-flight, TTL, and ETags that survive a recompute.
+import asyncio
+import time
+
+from app import main
+from app.core.response_cache import ResponseCache, etag_for
+
+TASK = {"title": "Cache test", "acceptance_criteria": ["POST /tasks creates a task"], "budget_usd": 250}
+
+def test_identical_concurrent_requests_share_one_run():
+    cache = ResponseCache(ttl_s=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"n": len(calls)}, True
+
+    async def go():
+        return await asyncio.gather(*(cache.get("k", compute) for _ in range(5)))
+
+    got = asyncio.run(go())
+    assert len(calls) == 1
+    assert sorted(how for _, how in got) == ["miss"] + ["shared"] * 4
+    assert len({entry.etag for entry, _ in got}) == 1
+    assert asyncio.run(cache.get("k", compute))[1] == "hit"
+
+def test_uncacheable_results_are_shared_but_not_stored():
+    cache = ResponseCache(ttl_s=60)
+
+    async def compute():
+        return {"degraded": True}, False
+
+    assert asyncio.run(cache.get("k", compute))[1] == "miss"
+    assert asyncio.run(cache.get("k", compute))[1] == "miss"
+    assert cache.stats()["entries"] == 0
+
+def test_entries_expire():
+    cache = ResponseCache(ttl_s=0.01)
+
+    async def compute():
+        return {"x": 1}, True
+
+    asyncio.run(cache.get("k", compute))
+    time.sleep(0.02)
+    assert cache.peek("k") is None
+
+def test_etag_ignores_ids_and_timestamps_but_not_content():
+    a = b'{"task":{"id":"a","title":"t"},"runId":"r1","events":[{"run_id":"r1","seq":1,"ts":"x"}]}'
+    b = b'{"task":{"id":"b","title":"t"},"runId":"r2","events":[{"run_id":"r2","seq":1,"ts":"y"}]}'
+    c = b'{"task":{"id":"b","title":"u"},"runId":"r2","events":[{"run_id":"r2","seq":1,"ts":"y"}]}'
+    assert etag_for(a, "k") == etag_for(b, "k")
+    assert etag_for(a, "k") != etag_for(c, "k")
+    assert etag_for(a, "k") != etag_for(a, "other")
+
+def revalidate_across_expiry(client, monkeypatch, method, url, **kw):
+    first = client.request(method, url, **kw)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.request(method, url, headers={"If-None-Match": etag}, **kw).status_code == 304
+    monkeypatch.setattr(main, "_results", ResponseCache(ttl_s=60))  # the entry expired
+    again = client.request(method, url, headers={"If-None-Match": etag}, **kw)
+    assert (again.status_code, again.headers["x-cache"], again.headers["etag"]) == (304, "miss", etag)
+
+def test_demo_run_ui_revalidates_across_expiry(client, monkeypatch):
+    revalidate_across_expiry(client, monkeypatch, "GET", "/demo/run-ui", params={"seed": 7, "rounds": 2})
+
+def test_demo_summary_revalidates_across_expiry(client, monkeypatch):
+    revalidate_across_expiry(client, monkeypatch, "GET", "/demo/run-ui/summary", params={"seed": 7})
+
+def test_run_ui_revalidates_across_expiry(client, monkeypatch):
+    revalidate_across_expiry(client, monkeypatch, "POST", "/run-ui", json=TASK)
+
+def test_different_requests_get_different_etags(client):
+    a = client.get("/demo/run-ui", params={"seed": 1}).headers["etag"]
+    b = client.get("/demo/run-ui", params={"seed": 2}).headers["etag"]
+    assert a != b
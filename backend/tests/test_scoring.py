@@ -0,0 +1,82 @@
+# score_bids must agree exactly (not approximately) with the scalar score_bid it replaced.
+import pytest
+
+from app.agents.freelancer import quote_bid
+from app.core.models import Bid
+from app.core.scoring import score_bid, score_bids
+from app.sim.demo import DEFAULT_WEIGHTS
+from app.sim.market import synthetic_pool, synthetic_task
+
+TERMS = ("price_term", "eta_term", "quality_term", "risk_term", "total")
+
+def scalar(bids, budget, weights, max_eta_days=None):
+    if max_eta_days is None:
+        max_eta_days = max(b.eta_days for b in bids)
+    return [score_bid(b, budget, max_eta_days, weights) for b in bids]
+
+def assert_same(bids, budget, weights, max_eta_days=None):
+    batch = score_bids(bids, budget, weights, max_eta_days=max_eta_days)
+    expected = scalar(bids, budget, weights, max_eta_days)
+    for i, want in enumerate(expected):
+        got = batch.breakdown(i)
+        for term in TERMS:
+            assert getattr(got, term) == getattr(want, term), (bids[i].freelancer_id, term)
+    # Ranking: descending total, ties in input order, as list.sort(reverse=True) on totals.
+    order = sorted(range(len(bids)), key=lambda i: expected[i].total, reverse=True)
+    assert batch.ranking().tolist() == order
+
+def bid(fid, price=100.0, eta=5, confidence=0.8, portfolio=0.7, flags=()):
+    return Bid(freelancer_id=fid, price_usd=price, eta_days=eta, confidence=confidence,
+               portfolio_score=portfolio, risk_flags=list(flags))
+
+EDGE_BIDS = [
+    bid("cheap", price=1.0, eta=1),
+    bid("over_budget", price=10_000.0, eta=40),
+    bid("flagged", flags=["new account", "no tests", "late", "vague"]),
+    bid("zero_conf", confidence=0.0, portfolio=0.0),
+    bid("perfect", confidence=1.0, portfolio=1.0),
+    bid("tie_a", price=120.0, eta=3),
+    bid("tie_b", price=120.0, eta=3),
+]
+
+WEIGHTS = [
+    DEFAULT_WEIGHTS,
+    {"price": 1.0, "eta": 1.0, "quality": 1.0, "risk": 1.0},
+    {"price": 0.0, "eta": 0.0, "quality": 0.0, "risk": 0.0},
+    {"price": -0.3, "eta": 2.5, "quality": 0.1, "risk": 0.7},
+]
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+@pytest.mark.parametrize("budget", [0.0, 250.0, 1e6])
+def test_edge_bids(weights, budget):
+    assert_same(EDGE_BIDS, budget, weights)
+
+@pytest.mark.parametrize("n", [1, 5, 200])
+def test_synthetic_pool(n):
+    task = synthetic_task(0, 3)
+    bids = [quote_bid(task, p) for p in synthetic_pool(0, 3, n)]
+    for weights in WEIGHTS:
+        assert_same(bids, task.budget_usd, weights)
+
+def test_single_bid():
+    assert_same([bid("only")], 250.0, DEFAULT_WEIGHTS)
+
+def test_empty():
+    batch = score_bids([], 250.0, DEFAULT_WEIGHTS)
+    for term in TERMS:
+        assert getattr(batch, term).shape == (0,)
+    assert batch.ranking().tolist() == []
+
+def test_zero_eta_spread():
+    # Every ETA is 0, so max_eta_days is 0 and both paths normalise by max(0, 1).
+    bids = [bid("a", eta=0), bid("b", eta=0, price=90.0), bid("c", eta=0, flags=["x"])]
+    assert_same(bids, 250.0, DEFAULT_WEIGHTS)
+
+def test_equal_eta_spread():
+    bids = [bid(f"f{i}", eta=7, price=100.0 + i) for i in range(5)]
+    assert_same(bids, 250.0, DEFAULT_WEIGHTS)
+
+@pytest.mark.parametrize("max_eta_days", [0, 1, 3, 40, 365])
+def test_custom_max_eta_days(max_eta_days):
+    # Normalising against a larger (or smaller) pool than the bids, as pick_winner does for a shortlist.
+    assert_same(EDGE_BIDS, 250.0, DEFAULT_WEIGHTS, max_eta_days=max_eta_days)
@@ -0,0 +1,146 @@
+# What-if sweeps rely on totals being linear in the weights: terms @ w must reproduce
+# score_bids, block-wise sweeps must equal one big multiply, and break-even points must be
+# exactly where the winner changes.
+import numpy as np
+import pytest
+
+from app.agents.freelancer import quote_bid
+from app.core.scoring import WEIGHT_KEYS, score_bids
+from app.core.sensitivity import (
+    TermCache, analyze, break_even, build_terms, grid_weights, sample_weights, stability_margin, sweep,
+    terms_key, weight_vector, weight_vectors,
+)
+from app.sim.demo import DEFAULT_WEIGHTS
+from app.sim.market import synthetic_pool, synthetic_task
+
+def bid_set(seed, n=12):
+    task = synthetic_task(seed, 0)
+    return [quote_bid(task, p) for p in synthetic_pool(seed, 0, n)], task.budget_usd
+
+def exact_winner(t, w):
+    return int(np.argmax(score_bids(t.arrays, t.budget_usd, dict(zip(WEIGHT_KEYS, w)), max_eta_days=t.max_eta_days).total))
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_terms_reproduce_score_bids(seed):
+    bids, budget = bid_set(seed)
+    for max_eta in (None, 20):
+        t = build_terms(bids, budget, max_eta)
+        for w in sample_weights(DEFAULT_WEIGHTS, 20, seed=seed):
+            want = score_bids(bids, budget, dict(zip(WEIGHT_KEYS, w)), max_eta_days=max_eta).total
+            np.testing.assert_allclose(t.terms @ w, want, rtol=0, atol=1e-12)
+
+@pytest.mark.parametrize("max_cells", [1, 7, 12, 100, 1 << 22])
+def test_blocked_sweep_equals_one_multiply(max_cells):
+    bids, budget = bid_set(4)
+    t = build_terms(bids, budget)
+    b = t.baseline(DEFAULT_WEIGHTS)
+    w = weight_vectors(DEFAULT_WEIGHTS, grid={"price": [0.2, 0.9, 2.0], "risk": [0, 1.1]}, samples=300, seed=3)
+    totals = w @ t.terms.T
+    s = sweep(t, b, w, max_cells=max_cells)
+    assert s.winners.tolist() == np.argmax(totals, axis=1).tolist()
+    assert s.winner_rank.tolist() == (1 + (totals > totals[:, [b.winner]]).sum(axis=1)).tolist()
+
+def test_sweep_winners_match_exact_scoring():
+    bids, budget = bid_set(5)
+    t = build_terms(bids, budget)
+    w = sample_weights(DEFAULT_WEIGHTS, 200, spread=0.9, seed=1)
+    s = sweep(t, t.baseline(DEFAULT_WEIGHTS), w)
+    assert s.winners.tolist() == [exact_winner(t, v) for v in w]
+    assert len(set(s.winners.tolist())) > 1  # the sweep actually crosses regions
+
+@pytest.mark.parametrize("seed", [0, 3, 6])
+def test_break_even_is_where_the_winner_changes(seed):
+    bids, budget = bid_set(seed)
+    t = build_terms(bids, budget)
+    b = t.baseline(DEFAULT_WEIGHTS)
+    crossings = 0
+    for k, key in enumerate(WEIGHT_KEYS):
+        for side, hit in break_even(t, b)[key].items():
+            if hit is None:
+                continue
+            crossings += 1
+            step = 1e-6 * max(1.0, abs(hit["value"]))
+            inside, outside = b.weights.copy(), b.weights.copy()
+            inside[k] = hit["value"] + (step if side == "down" else -step)
+            outside[k] = hit["value"] - (step if side == "down" else -step)
+            assert exact_winner(t, inside) == b.winner
+            assert t.ids[exact_winner(t, outside)] == hit["challenger"]
+    assert crossings
+
+def test_stability_margin_is_the_nearest_tie():
+    bids, budget = bid_set(2)
+    t = build_terms(bids, budget)
+    b = t.baseline(DEFAULT_WEIGHTS)
+    m = stability_margin(t, b)
+    j = t.ids.index(m["challenger"])
+    d = t.terms[b.winner] - t.terms[j]
+    towards = -d / np.linalg.norm(d)
+    assert exact_winner(t, b.weights + 0.999 * m["margin"] * towards) == b.winner
+    assert exact_winner(t, b.weights + 1.001 * m["margin"] * towards) != b.winner
+    w = sample_weights(DEFAULT_WEIGHTS, 2000, spread=2.0, seed=0)
+    near = np.linalg.norm(w - b.weights, axis=1) < m["margin"] * 0.999
+    assert (sweep(t, b, w[near]).winners == b.winner).all()  # nothing closer flips it
+
+def test_single_bid_has_no_margin():
+    bids, budget = bid_set(0, n=1)
+    t = build_terms(bids, budget)
+    assert stability_margin(t, t.baseline(DEFAULT_WEIGHTS)) == {"margin": None, "challenger": None}
+
+def test_weight_vectors():
+    g = grid_weights(DEFAULT_WEIGHTS, {"price": [1, 2], "eta": [3, 4, 5]})
+    assert g.shape == (6, 4)
+    assert (g[:, WEIGHT_KEYS.index("quality")] == DEFAULT_WEIGHTS["quality"]).all()
+    s = sample_weights(DEFAULT_WEIGHTS, 50, spread=2.0, seed=9)
+    assert (s >= 0).all() and np.array_equal(s, sample_weights(DEFAULT_WEIGHTS, 50, spread=2.0, seed=9))
+    assert weight_vectors(DEFAULT_WEIGHTS).tolist() == [weight_vector(DEFAULT_WEIGHTS).tolist()]
+    assert len(weight_vectors(DEFAULT_WEIGHTS, grid={"price": [1, 2]}, samples=5)) == 7
+
+def test_term_cache_is_keyed_on_the_bid_terms():
+    bids, budget = bid_set(1)
+    cache = TermCache(max_entries=1)
+    t = cache.build(bids, budget)
+    assert cache.build(bids, budget) is t
+    assert terms_key(bids, budget, None) != terms_key(bids, budget + 1, None)
+    cache.build(bids, budget + 1)
+    assert cache.get(t.key) is None  # evicted
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2}
+
+def test_analyze_summary():
+    bids, budget = bid_set(3)
+    t = build_terms(bids, budget)
+    w = sample_weights(DEFAULT_WEIGHTS, 500, seed=2)
+    out = analyze(t, DEFAULT_WEIGHTS, w, include_vectors=True)
+    assert out["vectors"] == 500
+    assert sum(r["wins"] for r in out["regions"]) == 500
+    winner = out["baseline"]["winnerId"]
+    assert out["flipShare"] == pytest.approx(np.mean([t.ids[i] != winner for i in out["winners"]]))
+    assert out["winnerRank"]["best"] == 1 or out["flipShare"] == 1.0
+
+def whatif_body(**kw):
+    bids, budget = bid_set(7, n=6)
+    return {"bids": [b.model_dump() for b in bids], "budget_usd": budget, **kw}
+
+def test_whatif_endpoint(client):
+    r = client.post("/whatif", json=whatif_body(samples=200))
+    assert r.status_code == 200
+    first = r.json()
+    assert first["vectors"] == 200
+    again = client.post("/whatif", json={"terms_key": first["termsKey"], "samples": 200})
+    assert again.json() == first
+    assert client.get("/whatif/cache").json()["hits"] >= 1
+
+@pytest.mark.parametrize("body, status", [
+    ({"terms_key": "nope"}, 404),
+    ({}, 422),
+    ({"bids": whatif_body()["bids"]}, 422),
+    (whatif_body(weights={"price": 1}), 422),
+    (whatif_body(grid={"speed": [1, 2]}), 422),
+])
+def test_whatif_rejects_bad_requests(client, body, status):
+    assert client.post("/whatif", json=body).status_code == status
+
+def test_whatif_caps_the_vector_count(client, monkeypatch):
+    from app import main
+    monkeypatch.setattr(main, "WHATIF_MAX_VECTORS", 10)
+    assert client.post("/whatif", json=whatif_body(samples=8, grid={"price": [1, 2, 3]})).status_code == 422
+    assert client.post("/whatif", json=whatif_body(samples=8, grid={"price": [1, 2]})).status_code == 200
@@ -0,0 +1,89 @@
+# MinHash/LSH near-duplicate lookup: estimates track true Jaccard similarity, and a
+# submission is only compared with those indexed before it was first seen.
+import asyncio
+import sqlite3
+
+import numpy as np
+import pytest
+
+from app.agents.referee import Referee
+from app.core.models import Deliverable
+from app.core.similarity import SimilarityIndex, risk_level, shingle_hashes, signature, tokenize
+
+def module(n, start=0, comment=""):
+    return "\n".join(f"def f{i}(x):{comment}\n    return x * {i} + {i * 7}" for i in range(start, start + n))
+
+ORIGINAL = {"app.py": module(40)}
+COPY = {"app.py": module(40, comment="  # rewritten comment")}
+PARTIAL = {"app.py": module(30) + "\n" + module(10, start=500)}
+OTHER = {"other.py": "\n".join(f"class C{i}:\n    value = '{i}'" for i in range(60))}
+
+def jaccard(a, b):
+    sa, sb = set(shingle_hashes(tokenize(a)).tolist()), set(shingle_hashes(tokenize(b)).tolist())
+    return len(sa & sb) / len(sa | sb)
+
+def test_comments_do_not_change_the_signature():
+    assert tokenize(ORIGINAL) == tokenize(COPY)
+    assert np.array_equal(signature(ORIGINAL), signature(COPY))
+
+@pytest.mark.parametrize("other", [PARTIAL, OTHER])
+def test_estimate_tracks_jaccard(other):
+    est = float((signature(ORIGINAL) == signature(other)).mean())
+    assert est == pytest.approx(jaccard(ORIGINAL, other), abs=0.15)
+
+def test_risk_levels():
+    assert [risk_level(s) for s in (None, 0.2, 0.5, 0.79, 0.8, 1.0)] == ["low", "low", "medium", "medium", "high", "high"]
+
+def test_original_is_never_flagged_against_a_later_copy():
+    index = SimilarityIndex()
+    assert index.check_and_add("h1", "alice", ORIGINAL) is None
+    copy = index.check_and_add("h1", "bob", COPY)
+    assert copy.freelancer_id == "alice" and copy.doc_key == "alice:h1" and copy.similarity == 1.0
+    assert index.check_and_add("h1", "alice", ORIGINAL) is None  # re-check: still the original
+    assert index.check_and_add("h1", "bob", COPY) == copy  # re-check: same answer
+    assert len(index) == 2
+
+def test_own_submissions_are_not_matches():
+    index = SimilarityIndex()
+    index.check_and_add("v1", "alice", ORIGINAL)
+    assert index.check_and_add("v2", "alice", PARTIAL) is None
+    assert index.check_and_add("v3", "carol", PARTIAL).freelancer_id == "alice"
+
+def test_query_before_and_limits():
+    index = SimilarityIndex()
+    sigs = np.stack([signature(d) for d in (ORIGINAL, PARTIAL, OTHER)])
+    assert index.add_many(["a", "b", "c"], ["x", "y", "z"], sigs) == 3
+    assert index.add_many(["a", "d"], ["x", "w"], sigs[[0, 0]]) == 1  # "a" already indexed
+    hits = index.query(sigs[0])
+    assert [m.doc_key for m in hits[:3]] == ["a", "d", "b"]
+    assert [m.doc_key for m in index.query(sigs[0], before=2)] == ["a"]
+    assert index.query(sigs[0], before=1) == []
+    assert [m.doc_key for m in index.query(sigs[0], exclude_key="a", min_similarity=0.99)] == ["d"]
+    assert index.stats()["documents"] == 4
+
+def test_index_persists_and_checks_its_parameters(tmp_path):
+    path = str(tmp_path / "sim.sqlite")
+    index = SimilarityIndex(path)
+    index.check_and_add("h1", "alice", ORIGINAL)
+    index.close()
+    index = SimilarityIndex(path)
+    assert index.check_and_add("h2", "bob", COPY).freelancer_id == "alice"
+    index.close()
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE sim_meta SET value = 8 WHERE name = 'bands'")
+    with pytest.raises(ValueError):
+        SimilarityIndex(path)
+
+def test_referee_reports_the_earlier_submission():
+    referee = Referee(workers=2, index=SimilarityIndex())
+    criteria = ["Include basic unit tests"]
+
+    def check(fid, files):
+        return asyncio.run(referee.evaluate(Deliverable(freelancer_id=fid, files=files), criteria))
+
+    first = check("alice", ORIGINAL)
+    assert first["plagiarism_risk"] == "low" and first["similarity"]["match_freelancer_id"] is None
+    copied = check("bob", COPY)
+    assert copied["plagiarism_risk"] == "high"
+    assert copied["similarity"]["match_freelancer_id"] == "alice"
+    assert check("alice", ORIGINAL)["plagiarism_risk"] == "low"  # a cached verdict, still not flagged
@@ -0,0 +1,83 @@
+# Summary responses carry the first page of events and score history; the cursors must
+# page through exactly what /demo/run-ui returns in one piece, including after the summary
+# came from the result cache and the run had already left RecentReports.
+import pytest
+
+from app import main
+from app.core.ledger_store import MemoryLedgerStore
+from app.core.presenter import history_page
+from app.core.response_cache import RecentReports
+
+def rows(rounds, per):
+    return [{"round": r, "i": i} for r in range(rounds) for i in range(per[r] if isinstance(per, list) else per)]
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 5, 8, 100])
+def test_history_pages_are_whole_rounds(limit):
+    history = rows(5, [3, 1, 4, 2, 3])
+    got, after = [], -1
+    while after is not None:
+        page, after = history_page(history, after, limit)
+        assert page
+        assert len(page) <= limit or len({r["round"] for r in page}) == 1  # an oversized round comes alone
+        if after is not None:
+            assert page[-1]["round"] == after
+        got += page
+    assert got == history
+
+def test_history_page_edges():
+    history = rows(3, 2)
+    assert history_page(history, 2, 10) == ([], None)
+    assert history_page(history, -1, 0) == ([], -1)
+    assert history_page([], -1, 10) == ([], None)
+
+def summary_pages(client, body, run_id, events_limit, history_limit):
+    events, cursor = list(body["events"]), body["eventsNext"]
+    while cursor is not None:
+        page = client.get(f"/runs/{run_id}/ui/events", params={"after_seq": cursor, "limit": events_limit}).json()
+        events += page["events"]
+        cursor = page["next"]
+    history, cursor = list(body["scoreHistory"]), body["scoreHistoryNext"]
+    while cursor is not None:
+        page = client.get(f"/runs/{run_id}/ui/score-history", params={"after_round": cursor, "limit": history_limit}).json()
+        history += page["scoreHistory"]
+        cursor = page["next"]
+    return events, history
+
+@pytest.mark.parametrize("limits", [(1, 1), (7, 4), (1000, 1000)])
+def test_summary_pages_match_the_full_response(client, limits):
+    params = {"seed": 5, "rounds": 6, "events_limit": limits[0], "history_limit": limits[1]}
+    body = client.get("/demo/run-ui/summary", params=params).json()
+    full = client.get("/demo/run-ui", params={"seed": 5, "rounds": 6}).json()
+    events, history = summary_pages(client, body, body["runId"], *limits)
+    assert len(events) == body["eventsTotal"]
+    strip = lambda evs: [{k: v for k, v in e.items() if k not in ("run_id", "ts")} for e in evs]
+    assert strip(events) == strip(full["events"])
+    assert history == full["scoreHistory"]
+    for key in ("winner", "bids", "weights"):
+        assert body[key] == full[key]
+
+def test_cached_summary_stays_pageable_after_eviction(client, monkeypatch):
+    monkeypatch.setattr(main, "_reports", RecentReports(1))
+    params = {"seed": 8, "rounds": 3, "events_limit": 2, "history_limit": 1}
+    first = client.get("/demo/run-ui/summary", params=params)
+    client.get("/demo/run-ui/summary", params={**params, "seed": 9})  # evicts seed 8's report
+    assert client.get(f"/runs/{first.json()['runId']}/ui/events").status_code == 404
+
+    again = client.get("/demo/run-ui/summary", params=params)
+    assert again.headers["X-Cache"] == "hit" and again.json()["runId"] == first.json()["runId"]
+    events, history = summary_pages(client, again.json(), again.json()["runId"], 2, 1)
+    assert len(events) == again.json()["eventsTotal"]
+    assert history and history[-1]["round"] == 3
+
+def test_unknown_run(client):
+    assert client.get("/runs/nope/ui/events").status_code == 404
+    assert client.get("/runs/nope/ui/score-history").status_code == 404
+
+def test_evicted_events_come_from_the_ledger(client, monkeypatch):
+    monkeypatch.setattr(main, "_store", MemoryLedgerStore())
+    monkeypatch.setattr(main, "_reports", RecentReports(1))
+    body = client.get("/demo/run-ui/summary", params={"seed": 4, "events_limit": 3}).json()
+    client.get("/demo/run-ui/summary", params={"seed": 6})
+    page = client.get(f"/runs/{body['runId']}/ui/events", params={"after_seq": body["eventsNext"], "limit": 1000}).json()
+    assert len(body["events"]) + len(page["events"]) == body["eventsTotal"] and page["next"] is None
+    assert client.get(f"/runs/{body['runId']}/ui/score-history").status_code == 404  # memory only
@@ -50,8 +50,7 @@ export type UiReport = {
     quality: number;
     risk: number;
   }>;
-
-
+  degradedBids?: Record<string, string>;
 };
 
 export type RunRequest = {